@@ -1,4 +1,19 @@
-from gui.main_window import run_gui
+import os
+import sys
 
-if __name__ == "__main__":
+# Allow `python -m sysintel` from the parent directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from monitor.headless import build_arg_parser
+
+def main():
+    args = build_arg_parser().parse_args()
+    if args.headless:
+        from monitor.headless import run_headless
+        return run_headless(args)
+    # Only the GUI needs tkinter
+    from gui.main_window import run_gui
     run_gui()
+
+if __name__ == "__main__":
+    sys.exit(main())
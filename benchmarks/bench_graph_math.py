@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Compare the per-pixel Python graph math with the vectorized gui.graph_math.
+
+Usage: python benchmarks/bench_graph_math.py [width] [points]
+"""
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui.graph_math import smooth, history_layout, pixel_trace, history_trace
+
+SECONDS = 60
+HEIGHT = 300
+
+def legacy_moving_average(data, window=3):
+    n = len(data)
+    if n < 2:
+        return data
+    result = []
+    for i in range(n):
+        vals = [data[j] for j in range(max(0, i-window//2), min(n, i+window//2+1)) if data[j] is not None]
+        result.append(sum(vals)/len(vals) if vals else 0)
+    return result
+
+def legacy_round_corners(data, window=3):
+    n = len(data)
+    if n < 3:
+        return data
+    result = list(data)
+    for i in range(1, n-1):
+        prev, curr, next_ = data[i-1], data[i], data[i+1]
+        if abs(curr - prev) > abs(prev - next_) * 1.5 and abs(curr - next_) > abs(prev - next_) * 1.5:
+            result[i] = (prev + next_) / 2
+    return result
+
+def legacy_trace(data, smoothing, w, h):
+    """The loop ScrollingGraph.redraw used to run"""
+    n = len(data)
+    time_per_point = SECONDS / (n - 1)
+    filled_seconds = time_per_point * (n - 1)
+    left_edge = w - w * (filled_seconds / SECONDS)
+    if smoothing == 'average':
+        smooth_data = legacy_moving_average(data)
+    elif smoothing == 'round':
+        smooth_data = legacy_round_corners(data)
+    else:
+        smooth_data = data
+    points = []
+    for px in range(int(left_edge), w):
+        t = SECONDS * (w - px) / w
+        idx_float = (filled_seconds - t) / time_per_point
+        idx0 = int(math.floor(idx_float))
+        idx1 = min(idx0 + 1, n - 1)
+        if idx0 < 0:
+            v = smooth_data[0]
+        else:
+            v0, v1 = smooth_data[idx0], smooth_data[idx1]
+            v = v0 + (v1 - v0) * (idx_float - idx0)
+        points.append((px, h - (v / 100) * h))
+    return points
+
+def vector_trace(data, smoothing, w, h):
+    n = len(data)
+    time_per_point, filled_seconds, left_edge = history_layout(n, n, SECONDS, w)
+    xs, ys = pixel_trace(smooth(data, smoothing), SECONDS, time_per_point, filled_seconds, left_edge, w, h, 0, 100)
+    return list(zip(xs.tolist(), ys.tolist()))
+
+def bench(func, *args, repeat=50):
+    func(*args)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 2560
+    points = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    random.seed(0)
+    data = [random.uniform(0, 100) for _ in range(points)]
+    for smoothing in ('none', 'average', 'round'):
+        assert legacy_trace(data, smoothing, width, HEIGHT) == vector_trace(data, smoothing, width, HEIGHT), smoothing
+        legacy_ms = bench(legacy_trace, data, smoothing, width, HEIGHT)
+        vector_ms = bench(vector_trace, data, smoothing, width, HEIGHT)
+        print(f"{smoothing:8s} {width}px/{points} pts: legacy {legacy_ms:6.2f} ms, vectorized {vector_ms:6.2f} ms ({legacy_ms / vector_ms:.1f}x)")
+    # Long histories are decimated to a min/max envelope: the drawn point
+    # count tracks the width, and a single-sample spike must survive
+    for long_points in (36000, 360000):
+        series = [random.uniform(0, 50) for _ in range(long_points)]
+        series[long_points // 3] = 100
+        layout = history_layout(long_points, long_points, SECONDS, width)
+        for smoothing in ('none', 'average', 'round'):
+            xs, ys = history_trace(series, SECONDS, *layout, width, HEIGHT, 0, 100, smoothing)
+            assert len(xs) <= 2 * width and ys.min() == 0, smoothing
+        decimate_ms = bench(history_trace, series, SECONDS, *layout, width, HEIGHT, 0, 100, 'round', repeat=10)
+        print(f"envelope {width}px/{long_points} pts: {len(xs)} points drawn, {decimate_ms:6.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Per-frame cost of the per-core heatmap against one line trace per core.
+
+The baseline only runs the graph math for one ScrollingGraph-style trace
+per core (no Tk), so it understates what drawing N line graphs would cost.
+
+Usage: python benchmarks/bench_heatmap.py [width] [height] [points]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from gui.graph_math import color_lut, heatmap_rgb, history_layout, history_trace, flat_coords
+from gui.heatmap import DEFAULT_STOPS
+
+SECONDS = 60
+TRACE_HEIGHT = 60
+
+def line_traces(data, max_points, w):
+    """One trace per core, as stacked ScrollingGraphs would compute them"""
+    layout = history_layout(len(data), max_points, SECONDS, w)
+    return [flat_coords(*history_trace(column, SECONDS, *layout, w, TRACE_HEIGHT, 0, 100)) for column in data.T]
+
+def heatmap_frame(data, max_points, w, h, lut):
+    """Image math plus the PPM bytes handed to Tk"""
+    return b'P6 %d %d 255\n' % (w, h) + heatmap_rgb(data, max_points, w, h, lut).tobytes()
+
+def bench(func, *args, repeat=20):
+    func(*args)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 1200
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    points = int(sys.argv[3]) if len(sys.argv) > 3 else 600
+    lut = color_lut(DEFAULT_STOPS)
+    rng = np.random.default_rng(0)
+    for cores in (8, 64, 256, 512):
+        data = rng.uniform(0, 40, (points, cores)).astype(np.float32)
+        # A one-sample spike on one core must survive binning in both axes
+        data[points // 3, cores // 2] = 100
+        image = heatmap_rgb(data, points, width, height, lut)
+        assert image.shape == (height, width, 3)
+        assert (image == lut[255]).all(axis=2).any(), cores
+        # Half-filled history: the missing slots on the left are background
+        half = heatmap_rgb(data[points // 2:], points, width, height, lut)
+        assert (half[:, :width // 2 - 1] == lut[256]).all() and not (half[:, -1] == lut[256]).all()
+        lines_ms = bench(line_traces, data, points, width, repeat=3)
+        heatmap_ms = bench(heatmap_frame, data, points, width, height, lut)
+        print(f"{cores:4d} cores {width}x{height}px/{points} pts: line traces {lines_ms:8.2f} ms, heatmap {heatmap_ms:6.2f} ms")
+
+if __name__ == "__main__":
+    main()
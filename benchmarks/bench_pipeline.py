@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Tick latency of the serial and the deadline-bounded collector schedulers.
+
+One collector is made to hang (like disk_usage on a dead NFS mount) and
+another to be slow; the serial scheduler waits for both, the async one
+returns within the deadline with the hung collector marked stale.
+
+Usage: python benchmarks/bench_pipeline.py [hang_seconds]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor.system_stats import COLLECTORS, CollectorScheduler, AsyncCollectorScheduler
+
+DEADLINE = 0.2
+
+def slow(func, seconds):
+    def collector():
+        time.sleep(seconds)
+        return func()
+    return collector
+
+def collectors(hang):
+    table = dict(COLLECTORS)
+    table["disk"] = (slow(COLLECTORS["disk"][0], hang), 0)
+    table["gpu"] = (slow(COLLECTORS["gpu"][0], 0.1), 0)
+    return table
+
+def tick(scheduler):
+    start = time.perf_counter()
+    snapshot = scheduler.snapshot()
+    return (time.perf_counter() - start) * 1000, snapshot
+
+def main():
+    hang = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    serial_ms, _ = tick(CollectorScheduler(collectors(hang)))
+    print(f"serial:   {serial_ms:7.1f} ms per tick")
+    pipeline = AsyncCollectorScheduler(collectors(hang), deadline=DEADLINE)
+    for i in range(3):
+        ms, snapshot = tick(pipeline)
+        print(f"pipeline: {ms:7.1f} ms per tick, stale {snapshot['stale']}")
+        assert ms < DEADLINE * 1000 + 100 and snapshot["stale"] == ["disk"]
+        # Placeholders keep the snapshot's shape while the collector is stuck
+        assert set(snapshot["disk"]) == {"partitions", "types"}
+    time.sleep(hang)
+    ms, snapshot = tick(pipeline)
+    print(f"pipeline: {ms:7.1f} ms after the hung call returned, stale {snapshot['stale']}")
+    assert snapshot["stale"] == [] and snapshot["disk"]["partitions"]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Per-tick cost of a naive process_iter() scan and of monitor.processes.ProcessTable.
+
+Optionally spawns idle child processes to approximate a busy host.
+
+Usage: python benchmarks/bench_processes.py [ticks] [spawn]
+"""
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+from monitor.processes import ProcessTable, PID, CPU
+
+ATTRS = ['pid', 'name', 'username', 'cpu_percent', 'memory_info', 'io_counters']
+
+def naive_tick():
+    return [p.info for p in psutil.process_iter(ATTRS)]
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    spawn = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    children = [subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(600)']) for _ in range(spawn)]
+    try:
+        table = ProcessTable()
+        table.refresh()  # First tick reads every name and user
+        naive_tick()
+        naive_ms = []
+        table_ms = []
+        for _ in range(ticks):
+            start = time.perf_counter()
+            naive_tick()
+            naive_ms.append((time.perf_counter() - start) * 1000)
+            result = table.refresh()
+            table_ms.append(result['cost'] * 1000)
+            time.sleep(0.05)
+        pids = {row[PID] for row in result['rows']}
+        assert os.getpid() in pids and all(child.pid in pids for child in children)
+        top_cpu = [row[CPU] for row in result['top']['cpu']]
+        assert top_cpu == sorted((row[CPU] for row in result['rows']), reverse=True)[:len(top_cpu)]
+        print(f"{result['count']} processes, {result['refreshed']} refreshed on the last tick")
+        print(f"process_iter: {sum(naive_ms) / ticks:7.2f} ms per tick")
+        print(f"ProcessTable: {sum(table_ms) / ticks:7.2f} ms per tick")
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+
+if __name__ == "__main__":
+    main()
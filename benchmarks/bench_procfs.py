@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Compare per-tick cost of the psutil collectors and the /proc fast path.
+
+Usage: python benchmarks/bench_procfs.py [ticks]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+from monitor.procfs import ProcfsCollector
+from monitor.system_stats import get_memory_detailed_info, get_disk_io_stats, get_network_io_info
+
+def psutil_tick():
+    psutil.cpu_percent()
+    get_memory_detailed_info()
+    get_disk_io_stats()
+    get_network_io_info()
+
+def bench(func, ticks):
+    func()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        func()
+    return (time.perf_counter() - start) / ticks * 1e6
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    fast = ProcfsCollector()
+
+    def procfs_tick():
+        fast.cpu_percent()
+        fast.memory()
+        fast.disk_io()
+        fast.network_io()
+
+    # Schema check: the fast path must be a drop-in replacement
+    for name, slow, quick in (("memory", get_memory_detailed_info(), fast.memory()),
+                              ("disk_io", get_disk_io_stats(), fast.disk_io()),
+                              ("network_io", get_network_io_info(), fast.network_io())):
+        assert slow.keys() == quick.keys(), name
+        if name == "disk_io":
+            assert [d["name"] for d in slow["disks"]] == [d["name"] for d in quick["disks"]]
+            assert all(a.keys() == b.keys() for a, b in zip(slow["disks"], quick["disks"]))
+
+    psutil_us = bench(psutil_tick, ticks)
+    procfs_us = bench(procfs_tick, ticks)
+    print(f"psutil: {psutil_us:8.1f} us/tick")
+    print(f"procfs: {procfs_us:8.1f} us/tick")
+    print(f"saving: {psutil_us - procfs_us:8.1f} us/tick ({psutil_us / procfs_us:.1f}x)")
+    fast.close()
+
+if __name__ == "__main__":
+    main()
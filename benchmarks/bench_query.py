@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark time-range queries on a large synthetic CSV log.
+
+Usage: python benchmarks/bench_query.py [size_gb] [path]
+
+Generates (or reuses) a synthetic log of roughly ``size_gb`` gigabytes at
+one row per 100 ms, then compares a full decode of the file against
+indexed range queries of different widths. Pick a size larger than RAM to
+keep the file out of the page cache; when run as root on Linux the cache
+is also dropped before the full scan and before the cold queries.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor.log_writer import LOG_FIELDS, base36encode
+from monitor.log_query import query, SparseIndex
+
+START_TS = 1700000000
+
+def generate(path, size_bytes):
+    """Write rows at 10 per second until the file reaches size_bytes"""
+    rng = random.Random(42)
+    ts = START_TS
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(LOG_FIELDS) + '\r\n')
+        written = 0
+        while written < size_bytes:
+            lines = []
+            for i in range(100000):
+                # Ten rows share each one-second timestamp at 100 ms sampling
+                lines.append(f"{base36encode(ts + i // 10)},{rng.randint(0, 100)},47,12,55,48,1650,3\r\n")
+            ts += 10000
+            chunk = ''.join(lines)
+            f.write(chunk)
+            written += len(chunk)
+    return ts
+
+def full_scan(path):
+    count = 0
+    with open(path, 'rb') as f:
+        f.readline()
+        for line in f:
+            fields = line.split(b',')
+            int(fields[0], 36)
+            int(fields[1])
+            count += 1
+    return count
+
+def drop_caches():
+    """Evict the page cache so reads hit the disk (Linux, root only)"""
+    try:
+        os.sync()
+        with open('/proc/sys/vm/drop_caches', 'w') as f:
+            f.write('3\n')
+        return True
+    except OSError:
+        return False
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<40} {time.perf_counter() - start:8.3f} s  ({result})")
+    return result
+
+def main():
+    size_gb = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.gettempdir(), f'sysintel_bench_{size_gb:g}gb.csv')
+    if not os.path.exists(path):
+        timed(f"generate {size_gb:g} GB", lambda: generate(path, size_gb * 1024 ** 3))
+        if os.path.exists(path + '.tsidx'):
+            os.remove(path + '.tsidx')
+    print(f"log: {path} ({os.path.getsize(path) / 1024 ** 2:.0f} MB)")
+    end_ts = SparseIndex(path)
+    timed("build sparse index (cold)", lambda: (end_ts.refresh(), len(end_ts.offsets))[1])
+    timed("refresh sparse index (warm)", lambda: (SparseIndex(path).refresh(), 'ok')[1])
+    last_ts = end_ts.timestamps[-1]
+    middle = (START_TS + last_ts) // 2
+    cold = drop_caches()
+    timed("full scan + base36 decode" + (" (cold)" if cold else ""), lambda: full_scan(path))
+    for label, span in (("1 minute", 60), ("1 hour", 3600), ("1 day", 86400)):
+        rows = lambda: sum(len(batch) for batch in query(['cpu', 'mem'], middle, middle + span, path=path))
+        if drop_caches():
+            timed(f"query {label} (raw rows, cold)", rows)
+        timed(f"query {label} (raw rows)", rows)
+    buckets = lambda: sum(len(batch) for batch in query(['cpu'], middle, middle + 86400, step=60, path=path))
+    timed("query 1 day, step=60 (min/max/mean)", buckets)
+    arrays = lambda: sum(len(batch) for batch in query(['cpu', 'gpu'], middle, middle + 3600, path=path, as_numpy=True))
+    timed("query 1 hour as NumPy batches", arrays)
+
+if __name__ == "__main__":
+    main()
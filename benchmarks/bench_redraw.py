@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Compare retained-mode ScrollingGraph redraws with the old delete('all') redraw.
+
+Reports wall time per redraw (including Tk's idle-time repaint) and how many
+canvas items each redraw creates. Needs a display (use xvfb-run on a
+headless box).
+
+Usage: python benchmarks/bench_redraw.py [redraws] [width]
+"""
+import os
+import random
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui.graph_math import smooth, history_layout, pixel_trace
+from gui.scrolling_graph import ScrollingGraph
+from utils import RingBuffer
+
+HEIGHT = 300
+SECONDS = 60
+
+class LegacyScrollingGraph(ScrollingGraph):
+    """The immediate-mode redraw: clear the canvas and recreate every item"""
+
+    def redraw(self):
+        self.delete('all')
+        w = self.winfo_width()
+        h = self.winfo_height()
+        data = self.data_source.view()
+        n = len(data)
+        time_per_point, filled_seconds, left_edge = history_layout(n, self.data_source.maxlen, self.seconds, w)
+        for i in range(11):
+            x = w - (i * self.seconds / 10 / self.seconds) * w
+            if x >= left_edge:
+                self.create_line(x, 0, x, h, fill=self.grid, width=1, stipple='gray25')
+        for i in range(5):
+            y = h * i // 4
+            self.create_line(left_edge, y, w, y, fill=self.grid, width=1, stipple='gray25')
+        self.create_text(10, 10, anchor='nw', text=self.label, fill=self.label_color, font=('Segoe UI', 12, 'bold'))
+        xs, ys = pixel_trace(smooth(data, self.smoothing), self.seconds, time_per_point, filled_seconds, left_edge, w, h, self.y_min, self.y_max)
+        points = list(zip(xs.tolist(), ys.tolist()))
+        self.create_polygon([(points[0][0], h)] + points + [(points[-1][0], h)], fill=self.color, outline='', stipple='gray50')
+        for i in range(1, len(points)):
+            self.create_line(points[i-1][0], points[i-1][1], points[i][0], points[i][1], fill=self.color, width=2)
+        for i in range(5):
+            y_val = self.y_max - (self.y_max - self.y_min) * i / 4
+            self.create_text(left_edge + 5, h * i // 4, anchor='nw', text=f'{y_val:.0f}', fill=self.label_color, font=('Consolas', 9))
+        for i in range(6):
+            t = self.seconds * i // 5
+            x = w - (t / self.seconds) * w
+            if x >= left_edge:
+                label = f'{self.seconds-t:.0f}s' if t > 0 else 'now'
+                self.create_text(x, h-2, anchor='sw', text=label, fill=self.label_color, font=('Consolas', 9))
+
+def next_item_id(canvas):
+    # Canvas item ids only ever increase, so a probe item measures churn
+    item = canvas.create_line(0, 0, 0, 0)
+    canvas.delete(item)
+    return item
+
+def bench(root, cls, history, redraws, width):
+    graph = cls(root, history, '#00bfff', 0, 100, seconds=SECONDS, label='CPU Usage (%)', width=width, height=HEIGHT)
+    graph.pack()
+    root.update()
+    graph.redraw()
+    root.update()
+    first_id = next_item_id(graph)
+    start = time.perf_counter()
+    for _ in range(redraws):
+        history.append(random.uniform(0, 100), time.time())
+        graph.redraw()
+        root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    created = next_item_id(graph) - first_id - 1
+    graph.destroy()
+    return elapsed / redraws * 1000, created / redraws
+
+def main():
+    redraws = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 2560
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available: {e}")
+        return
+    history = RingBuffer(600)
+    for _ in range(600):
+        history.append(random.uniform(0, 100))
+    for name, cls in (("delete('all')", LegacyScrollingGraph), ("retained", ScrollingGraph)):
+        ms, created = bench(root, cls, history, redraws, width)
+        print(f"{name:14s} {width}px: {ms:7.2f} ms/redraw, {created:7.1f} items created/redraw")
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
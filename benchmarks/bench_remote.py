@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Many agents streaming to one aggregator on localhost.
+
+Starts an Aggregator on a background thread and N agents on this thread's
+event loop, each sending a real snapshot once per second, then checks that
+every sample arrived and reports the CPU time the whole process used.
+
+Usage: python benchmarks/bench_remote.py [agents] [seconds]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor.remote import Agent, Aggregator
+from monitor.system_stats import get_system_snapshot
+
+async def stream(agents, seconds, snapshot):
+    tasks = [asyncio.create_task(agent.run()) for agent in agents]
+    await asyncio.sleep(0.5)  # Let every agent connect
+    for tick in range(seconds):
+        start = time.monotonic()
+        for agent in agents:
+            agent.submit(time.time(), snapshot)
+        await asyncio.sleep(1.0 - (time.monotonic() - start))
+    await asyncio.sleep(0.5)  # Let the last tick drain
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    seconds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    aggregator = Aggregator(port=0)
+    aggregator.start()
+    host, port = aggregator.address
+    agents = [Agent(host, port, name=f"host{i:03d}") for i in range(count)]
+    snapshot = get_system_snapshot()
+    cpu_start, wall_start = time.process_time(), time.monotonic()
+    asyncio.run(stream(agents, seconds, snapshot))
+    cpu, wall = time.process_time() - cpu_start, time.monotonic() - wall_start
+    aggregator.stop()
+    hosts = aggregator.host_list()
+    received = sum(h.samples for h in hosts)
+    assert len(hosts) == count and received == count * seconds, (len(hosts), received)
+    assert all(len(h.history['cpu_usage']) == seconds for h in hosts)
+    print(f"{count} agents x {seconds}s at 1 Hz: {received} samples received, "
+          f"process CPU {cpu / wall * 100:.0f}% of one core (agents and aggregator together)")
+
+if __name__ == "__main__":
+    main()
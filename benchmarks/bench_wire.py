@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Bytes per sample and encode/decode cost of monitor.wire against JSON.
+
+Round-trips real snapshots plus edge cases (type changes, counters going
+backwards, schema changes, unicode, huge ints) and asserts every decoded
+snapshot equals the original.
+
+Usage: python benchmarks/bench_wire.py [samples]
+"""
+import copy
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor.system_stats import get_system_snapshot
+from monitor.wire import SnapshotEncoder, SnapshotDecoder, KEYFRAME
+
+def collect(count):
+    samples = []
+    for _ in range(count):
+        samples.append((time.time(), get_system_snapshot()))
+        time.sleep(0.02)
+    return samples
+
+def edge_cases(snapshot):
+    cases = []
+    snap = copy.deepcopy(snapshot)
+    snap['cpu']['usage'] = 0          # float -> int
+    cases.append(copy.deepcopy(snap))
+    snap['cpu']['usage'] = True       # int -> bool
+    snap['disk_io']['total_read_bytes'] -= 10**6  # Counter reset goes backwards
+    snap['network']['total_sent'] = 2**70
+    cases.append(copy.deepcopy(snap))
+    snap['system']['hostname'] = 'hôte-☃'
+    snap['gpu']['name'] = None
+    snap['fans']['system'] = [1200, 1300.5]       # Schema change: forces a keyframe
+    cases.append(copy.deepcopy(snap))
+    snap['fans']['system'] = []
+    snap['network']['wifi'] = {}
+    snap['disk']['partitions'] = snap['disk']['partitions'][:1]
+    snap['extra'] = [[1, [2, {}]], {'nested': [[]]}]
+    cases.append(copy.deepcopy(snap))
+    return [(1e9 + i, case) for i, case in enumerate(cases)]
+
+def bench(func, items, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            func(item)
+    return (time.perf_counter() - start) / (repeat * len(items)) * 1e6
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    samples = collect(count)
+    samples += edge_cases(samples[-1][1])
+    # Round trip, with a short keyframe interval so both frame kinds are exercised
+    encoder, decoder = SnapshotEncoder(keyframe_interval=16), SnapshotDecoder()
+    for ts, snapshot in samples:
+        assert decoder.decode(encoder.encode(ts, snapshot)) == (ts, snapshot)
+    try:
+        SnapshotDecoder().decode(encoder.encode(*samples[-1]))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a delta without its keyframe must be rejected")
+
+    samples = samples[:count]
+    encoder = SnapshotEncoder()
+    frames = [encoder.encode(ts, snapshot) for ts, snapshot in samples]
+    json_frames = [json.dumps({'ts': ts, 'snapshot': snapshot}, separators=(',', ':')).encode() for ts, snapshot in samples]
+    keyframes = [len(f) for f in frames if f[0] == KEYFRAME]
+    deltas = [len(f) for f in frames if f[0] != KEYFRAME]
+    print(f"JSON:  {sum(map(len, json_frames)) / count:7.0f} bytes/sample")
+    print(f"wire:  {sum(map(len, frames)) / count:7.0f} bytes/sample "
+          f"(keyframe {sum(keyframes) / len(keyframes):.0f}, delta {sum(deltas) / max(1, len(deltas)):.0f})")
+
+    def encode_all(_):
+        encoder.reset()
+        for ts, snapshot in samples:
+            encoder.encode(ts, snapshot)
+
+    def decode_all(_):
+        decoder.reset()
+        for frame in frames:
+            decoder.decode(frame)
+
+    json_encode = bench(lambda s: json.dumps({'ts': s[0], 'snapshot': s[1]}, separators=(',', ':')).encode(), samples)
+    json_decode = bench(json.loads, json_frames)
+    wire_encode = bench(encode_all, [None]) / count
+    wire_decode = bench(decode_all, [None]) / count
+    print(f"JSON:  encode {json_encode:6.1f} µs, decode {json_decode:6.1f} µs")
+    print(f"wire:  encode {wire_encode:6.1f} µs, decode {wire_decode:6.1f} µs")
+
+if __name__ == "__main__":
+    main()
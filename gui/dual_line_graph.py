@@ -1,10 +1,18 @@
 import tkinter as tk
-import math
+import numpy as np
+
+from gui.graph_math import history_layout, history_trace, flat_coords
 
 class DualLineGraph(tk.Canvas):
+    """Several history lines on one scrolling graph, drawn in retained mode.
+
+    Like ScrollingGraph, items are created once per size and only moved on
+    redraw; the first series also gets a filled area.
+    """
+
     def __init__(self, parent, data_sources, colors, y_min, y_max, seconds=10, bg='#222', grid='#444', label='', label_color='#fff', smoothing='average', legends=None, **kwargs):
         super().__init__(parent, bg=bg, highlightthickness=0, **kwargs)
-        self.data_sources = data_sources  # List of deques
+        self.data_sources = data_sources  # List of RingBuffers
         self.colors = colors  # List of colors
         self.y_min = y_min
         self.y_max = y_max
@@ -15,93 +23,57 @@ class DualLineGraph(tk.Canvas):
         self.label_color = label_color
         self.smoothing = smoothing
         self.legends = legends or []
+        self._layout = None  # (w, h, y_min, y_max, seconds) the items were built for
+        self._axes_at = None  # left edge the grid/axes are placed at
+        self._hidden = set()
         self.bind('<Configure>', lambda e: self.redraw())
 
-    def redraw(self):
+    def set_range(self, y_min, y_max, label=None):
+        """Change the value range (and optionally the title) without recreating the widget"""
+        self.y_min = y_min
+        self.y_max = y_max
+        if label is not None:
+            self.label = label
+        self._layout = None  # Rebuild the items on the next redraw
+
+    def _build(self, w, h):
+        """(Re)create every item for the current size and range"""
         self.delete('all')
-        w = self.winfo_width()
-        h = self.winfo_height()
-        if w < 10 or h < 10:
-            return
-        # Draw grid
-        max_points = max([ds.maxlen if hasattr(ds, 'maxlen') and ds.maxlen else len(ds) for ds in self.data_sources])
-        time_per_point = self.seconds / (max_points - 1) if max_points > 1 else self.seconds
-        n = max([len(ds) for ds in self.data_sources])
-        filled_seconds = time_per_point * (n - 1)
-        filled_width = w * (filled_seconds / self.seconds) if self.seconds > 0 else w
-        left_edge = w - filled_width
+        self._layout = (w, h, self.y_min, self.y_max, self.seconds)
+        self._axes_at = None
+        self._hidden = set()
         grid_spacing = self.seconds / 10
+        self._vgrid = []
         for i in range(11):
-            t = i * grid_spacing
-            x = w - (t / self.seconds) * w
-            if x < left_edge:
-                continue
-            self.create_line(x, 0, x, h, fill=self.grid, width=1, stipple='gray25')
+            x = w - (i * grid_spacing / self.seconds) * w
+            self._vgrid.append((x, self.create_line(x, 0, x, h, fill=self.grid, width=1, stipple='gray25')))
+        self._hgrid = []
         for i in range(5):
             y = h * i // 4
-            self.create_line(left_edge, y, w, y, fill=self.grid, width=1, stipple='gray25')
-        # Draw label
+            self._hgrid.append((y, self.create_line(0, y, w, y, fill=self.grid, width=1, stipple='gray25')))
         if self.label:
             self.create_text(10, 10, anchor='nw', text=self.label, fill=self.label_color, font=('Segoe UI', 12, 'bold'))
-        # Draw both lines
-        for idx, ds in enumerate(self.data_sources):
-            data = list(ds)
-            color = self.colors[idx]
-            n = len(data)
-            valid_data = [v for v in data if v is not None and v != 0]
-            if n < 2 or not valid_data:
-                if n == 1 and valid_data:
-                    # Draw a single point as a vertical line or dot at the right edge
-                    v = data[-1]
-                    x = w - 1
-                    y = h - ((v - self.y_min) / (self.y_max - self.y_min)) * h
-                    self.create_line(x, y-5, x, y+5, fill=color, width=2)
-                continue
-            if self.smoothing == 'average':
-                smooth_data = self._moving_average(data, window=3)
-            elif self.smoothing == 'round':
-                smooth_data = self._round_corners(data, window=3)
-            else:
-                smooth_data = data
-            interp_points = []
-            if w > 2:
-                for px in range(int(left_edge), w):
-                    t = self.seconds * (w - px) / w
-                    idx_float = (filled_seconds - t) / time_per_point if time_per_point > 0 else 0
-                    idx0 = int(math.floor(idx_float))
-                    idx1 = min(idx0 + 1, n - 1)
-                    if idx0 < 0:
-                        v = smooth_data[0]
-                    elif idx1 >= n:
-                        v = smooth_data[-1]
-                    else:
-                        v0, v1 = smooth_data[idx0], smooth_data[idx1]
-                        frac = idx_float - idx0
-                        v = v0 + (v1 - v0) * frac
-                    y = h - ((v - self.y_min) / (self.y_max - self.y_min)) * h
-                    interp_points.append((px, y))
-            # Draw filled area under the line (optional, only for first line)
-            if interp_points and idx == 0:
-                area = [(interp_points[0][0], h)] + interp_points + [(interp_points[-1][0], h)]
-                self.create_polygon(area, fill=color, outline='', stipple='gray50')
-            # Draw the line on top
-            if interp_points:
-                for i in range(1, len(interp_points)):
-                    self.create_line(interp_points[i-1][0], interp_points[i-1][1], interp_points[i][0], interp_points[i][1], fill=color, width=2)
-        # Draw y-axis labels
+        # Per series: (filled area or None, trace, single-point marker)
+        self._series = []
+        for idx, color in enumerate(self.colors[:len(self.data_sources)]):
+            area = self.create_polygon(0, h, 0, h, 0, h, fill=color, outline='', stipple='gray50') if idx == 0 else None
+            trace = self.create_line(0, h, 0, h, fill=color, width=2)
+            marker = self.create_line(0, 0, 0, 0, fill=color, width=2)
+            for item in (area, trace, marker):
+                if item is not None:
+                    self._show(item, False)
+            self._series.append((area, trace, marker))
+        self._ylabels = []
         for i in range(5):
             y_val = self.y_max - (self.y_max - self.y_min) * i / 4
             y = h * i // 4
-            self.create_text(left_edge + 5, y, anchor='nw', text=f'{y_val:.0f}', fill=self.label_color, font=('Consolas', 9))
-        # Draw x-axis labels
+            self._ylabels.append((y, self.create_text(5, y, anchor='nw', text=f'{y_val:.0f}', fill=self.label_color, font=('Consolas', 9))))
+        self._xlabels = []
         for i in range(6):
             t = self.seconds * i // 5
             x = w - (t / self.seconds) * w
-            if x < left_edge:
-                continue
             label = f'{self.seconds-t:.0f}s' if t > 0 else 'now'
-            self.create_text(x, h-2, anchor='sw', text=label, fill=self.label_color, font=('Consolas', 9))
-        # Draw legend
+            self._xlabels.append((x, self.create_text(x, h-2, anchor='sw', text=label, fill=self.label_color, font=('Consolas', 9))))
         if self.legends:
             legend_x = w - 120
             legend_y = 10
@@ -109,27 +81,61 @@ class DualLineGraph(tk.Canvas):
                 self.create_rectangle(legend_x, legend_y + i*22, legend_x+18, legend_y+16 + i*22, fill=color, outline='')
                 self.create_text(legend_x+25, legend_y+8 + i*22, anchor='w', text=text, fill=self.label_color, font=('Segoe UI', 10, 'bold'))
 
-    def _moving_average(self, data, window=3):
-        n = len(data)
-        if n < 2:
-            return data
-        result = []
-        for i in range(n):
-            vals = [data[j] for j in range(max(0, i-window//2), min(n, i+window//2+1)) if data[j] is not None]
-            if vals:
-                result.append(sum(vals)/len(vals))
-            else:
-                result.append(0)
-        return result
+    def _show(self, item, visible):
+        """Show or hide an item, skipping the Tk call if nothing changes"""
+        if visible == (item not in self._hidden):
+            return
+        if visible:
+            self._hidden.discard(item)
+        else:
+            self._hidden.add(item)
+        self.itemconfig(item, state='normal' if visible else 'hidden')
 
-    def _round_corners(self, data, window=3):
-        n = len(data)
-        if n < 3:
-            return data
-        result = list(data)
-        for i in range(1, n-1):
-            prev, curr, next_ = data[i-1], data[i], data[i+1]
-            if prev is not None and curr is not None and next_ is not None:
-                if abs(curr - prev) > abs(prev - next_) * 1.5 and abs(curr - next_) > abs(prev - next_) * 1.5:
-                    result[i] = (prev + next_) / 2
-        return result 
\ No newline at end of file
+    def _place_axes(self, left_edge, w):
+        """Clip the grid and axis labels to the filled part of the graph"""
+        if self._axes_at == left_edge:
+            return
+        self._axes_at = left_edge
+        for x, item in self._vgrid:
+            self._show(item, x >= left_edge)
+        for y, item in self._hgrid:
+            self.coords(item, left_edge, y, w, y)
+        for y, item in self._ylabels:
+            self.coords(item, left_edge + 5, y)
+        for x, item in self._xlabels:
+            self._show(item, x >= left_edge)
+
+    def redraw(self):
+        w = self.winfo_width()
+        h = self.winfo_height()
+        if w < 10 or h < 10:
+            return
+        if self._layout != (w, h, self.y_min, self.y_max, self.seconds):
+            self._build(w, h)
+        max_points = max([ds.maxlen if hasattr(ds, 'maxlen') and ds.maxlen else len(ds) for ds in self.data_sources])
+        n = max([len(ds) for ds in self.data_sources])
+        time_per_point, filled_seconds, left_edge = history_layout(n, max_points, self.seconds, w)
+        self._place_axes(left_edge, w)
+        for ds, (area, trace, marker) in zip(self.data_sources, self._series):
+            data = ds.view()
+            n = len(data)
+            has_data = np.count_nonzero(data) > 0
+            xs = ()
+            if n >= 2 and has_data and w > 2:
+                xs, ys = history_trace(data, self.seconds, time_per_point, filled_seconds, left_edge, w, h, self.y_min, self.y_max, self.smoothing)
+            if n == 1 and has_data:
+                # Draw a single point as a vertical line or dot at the right edge
+                x = w - 1
+                y = h - ((float(data[-1]) - self.y_min) / (self.y_max - self.y_min)) * h
+                self.coords(marker, x, y-5, x, y+5)
+                self._show(marker, True)
+            else:
+                self._show(marker, False)
+            points = flat_coords(xs, ys) if len(xs) else []
+            if area is not None:
+                if points:
+                    self.coords(area, [points[0], h] + points + [points[-2], h])
+                self._show(area, bool(points))
+            if len(points) >= 4:
+                self.coords(trace, points)
+            self._show(trace, len(points) >= 4)
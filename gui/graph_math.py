@@ -0,0 +1,158 @@
+"""Array math shared by the graph widgets.
+
+Everything here works on whole NumPy arrays instead of per-pixel Python
+loops. Results match the original list-based implementations: the same
+float operations run in the same order, just vectorized.
+"""
+import numpy as np
+
+def moving_average(data, window=3):
+    """Centered moving average; the window shrinks at the edges"""
+    data = np.asarray(data, dtype=np.float64)
+    n = len(data)
+    if n < 2:
+        return data
+    half = window // 2
+    total = np.zeros(n)
+    count = np.zeros(n)
+    # Accumulate neighbours left to right so sums round exactly like sum()
+    for offset in range(-half, half + 1):
+        lo = max(0, -offset)
+        hi = min(n, n - offset)
+        total[lo:hi] += data[lo + offset:hi + offset]
+        count[lo:hi] += 1
+    return total / count
+
+def round_corners(data, window=3):
+    """Replace sharp single-sample peaks/valleys with the mean of their neighbours"""
+    data = np.asarray(data, dtype=np.float64)
+    if len(data) < 3:
+        return data
+    prev, curr, next_ = data[:-2], data[1:-1], data[2:]
+    spread = np.abs(prev - next_) * 1.5
+    sharp = (np.abs(curr - prev) > spread) & (np.abs(curr - next_) > spread)
+    result = data.copy()
+    result[1:-1][sharp] = ((prev + next_) / 2)[sharp]
+    return result
+
+def smooth(data, style, window=3):
+    """Apply a smoothing style: 'average', 'round' or 'none'"""
+    if style == 'average':
+        return moving_average(data, window)
+    if style == 'round':
+        return round_corners(data, window)
+    return np.asarray(data, dtype=np.float64)
+
+def history_layout(n, max_points, seconds, w):
+    """Return (time_per_point, filled_seconds, left_edge) for n of max_points samples"""
+    time_per_point = seconds / (max_points - 1) if max_points > 1 else seconds
+    filled_seconds = time_per_point * (n - 1)
+    filled_width = w * (filled_seconds / seconds) if seconds > 0 else w
+    return time_per_point, filled_seconds, w - filled_width
+
+def pixel_trace(data, seconds, time_per_point, filled_seconds, left_edge, w, h, y_min, y_max):
+    """Interpolate samples to one point per pixel column from left_edge to w.
+
+    Returns (xs, ys) arrays in canvas coordinates.
+    """
+    xs = np.arange(int(left_edge), w)
+    t = seconds * (w - xs) / w
+    if time_per_point > 0:
+        positions = (filled_seconds - t) / time_per_point
+    else:
+        positions = np.zeros(len(xs))
+    values = np.interp(positions, np.arange(len(data)), data)
+    ys = h - ((values - y_min) / (y_max - y_min)) * h
+    return xs, ys
+
+def minmax_envelope(data, seconds, time_per_point, filled_seconds, w, h, y_min, y_max):
+    """Decimate samples to their min and max per pixel column.
+
+    Each column contributes its lowest and highest sample in time order, so
+    spikes survive and the trace has at most two points per column however
+    long the history is. Returns (xs, ys) arrays in canvas coordinates.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    n = len(data)
+    # Column of every sample: the inverse of pixel_trace's mapping
+    columns = np.floor(w - (filled_seconds - np.arange(n) * time_per_point) * w / seconds).astype(np.int64)
+    np.clip(columns, 0, w - 1, out=columns)
+    new_column = np.r_[True, columns[1:] != columns[:-1]]
+    starts = np.flatnonzero(new_column)
+    bucket = np.cumsum(new_column) - 1
+    lows = _first_match(data == np.minimum.reduceat(data, starts)[bucket], bucket)
+    highs = _first_match(data == np.maximum.reduceat(data, starts)[bucket], bucket)
+    first = np.minimum(lows, highs)
+    second = np.maximum(lows, highs)
+    indexes = np.empty(2 * len(starts), dtype=np.int64)
+    indexes[0::2] = first
+    indexes[1::2] = second
+    xs = columns[indexes]
+    ys = h - ((data[indexes] - y_min) / (y_max - y_min)) * h
+    return xs, ys
+
+def _first_match(matches, bucket):
+    """Index of the first True in each bucket (every bucket has one)"""
+    candidates = np.flatnonzero(matches)
+    owners = bucket[candidates]
+    return candidates[np.r_[True, owners[1:] != owners[:-1]]]
+
+def history_trace(data, seconds, time_per_point, filled_seconds, left_edge, w, h, y_min, y_max, smoothing='none'):
+    """Points to draw for a history series.
+
+    Up to two samples per pixel column are smoothed and interpolated to one
+    point per column (pixel_trace); denser histories are decimated to a
+    min/max envelope so the drawn point count depends on width, not history
+    length. The envelope is drawn unsmoothed: smoothing first would cost a
+    pass over the whole history and flatten the spikes it exists to keep.
+    """
+    if time_per_point > 0 and seconds > 0 and len(data) > 2 * (w - int(left_edge)):
+        return minmax_envelope(data, seconds, time_per_point, filled_seconds, w, h, y_min, y_max)
+    data = smooth(data, smoothing, window=3)
+    return pixel_trace(data, seconds, time_per_point, filled_seconds, left_edge, w, h, y_min, y_max)
+
+def flat_coords(xs, ys):
+    """Interleave x/y arrays into the flat [x0, y0, x1, y1, ...] list Tk's coords() takes"""
+    coords = np.empty(2 * len(xs))
+    coords[0::2] = xs
+    coords[1::2] = ys
+    return coords.tolist()
+
+def color_lut(stops, size=256):
+    """(size + 1) x 3 uint8 table: ``size`` levels interpolated through
+    ``stops`` [(position 0..1, '#rrggbb'), ...]; the extra last row is for
+    "no data" and starts out as the first stop's color"""
+    positions = [position for position, _ in stops]
+    rgb = [[int(color[i:i + 2], 16) for i in (1, 3, 5)] for _, color in stops]
+    levels = np.linspace(0, 1, size)
+    lut = np.empty((size + 1, 3), dtype=np.uint8)
+    for channel in range(3):
+        lut[:size, channel] = np.round(np.interp(levels, positions, [c[channel] for c in rgb]))
+    lut[size] = lut[0]
+    return lut
+
+def heatmap_rgb(data, max_points, w, h, lut, v_min=0, v_max=100):
+    """Render a time x rows history as an h x w x 3 image, newest on the right.
+
+    ``data`` (n x rows, oldest first) fills the rightmost n of ``max_points``
+    time slots; rows run top to bottom. Where several samples or rows
+    share a pixel the maximum wins, so short spikes on one core stay
+    visible. The work is one reduction over the data plus one table lookup
+    per pixel, so the cost depends on the image size, not the row count.
+    """
+    data = np.asarray(data)
+    n, rows = data.shape
+    levels = len(lut) - 1
+    slots = max(max_points, n)
+    # Rows first: a single pass over the raw samples, everything after
+    # works on at most h values per sample
+    binned = np.maximum.reduceat(data, np.arange(h) * rows // h, axis=1)
+    # -1 marks empty slots; any real sample outranks it in the max
+    quantized = np.full((slots, h), -1, dtype=np.int16)
+    scaled = (np.clip(binned[-slots:], v_min, v_max) - v_min) * ((levels - 1) / (v_max - v_min))
+    quantized[slots - n:] = np.round(scaled)
+    # Equal consecutive starts make reduceat repeat an entry, which
+    # upsamples when there are fewer samples or rows than pixels
+    pixels = np.maximum.reduceat(quantized, np.arange(w) * slots // w, axis=0).T
+    pixels[pixels < 0] = levels
+    return lut.take(pixels, axis=0)
@@ -0,0 +1,46 @@
+import tkinter as tk
+
+from gui.graph_math import color_lut, heatmap_rgb
+
+DEFAULT_STOPS = [(0.0, '#1b2733'), (0.5, '#007acc'), (0.75, '#ff9800'), (1.0, '#f44336')]
+
+class CoreHeatmap(tk.Canvas):
+    """Per-core usage history drawn as a single image.
+
+    One row of pixels per core band and one column per time slice; every
+    redraw renders the whole picture with NumPy and hands it to one
+    PhotoImage as a PPM, so the Tk cost is a single image write whether
+    the machine has 4 cores or 512.
+    """
+
+    def __init__(self, parent, data_source, bg='#222', label='', label_color='#fff', stops=DEFAULT_STOPS, **kwargs):
+        super().__init__(parent, bg=bg, highlightthickness=0, **kwargs)
+        self.data_source = data_source  # RingBuffer with shape (cores,)
+        self.label = label
+        self.label_color = label_color
+        self.lut = color_lut(stops)
+        self.lut[-1] = [int(bg[i:i + 2], 16) for i in (1, 3, 5)]  # No data yet
+        self._layout = None
+        self._photo = None
+        self.bind('<Configure>', lambda e: self.redraw())
+
+    def _build(self, w, h):
+        self.delete('all')
+        self._layout = (w, h)
+        self._photo = tk.PhotoImage(width=w, height=h)
+        self.create_image(0, 0, anchor='nw', image=self._photo)
+        if self.label:
+            self.create_text(10, 6, anchor='nw', text=self.label, fill=self.label_color, font=('Segoe UI', 10, 'bold'))
+
+    def redraw(self):
+        w = self.winfo_width()
+        h = self.winfo_height()
+        if w < 10 or h < 10:
+            return
+        if self._layout != (w, h):
+            self._build(w, h)
+        data = self.data_source.view()
+        if not len(data):
+            return
+        rgb = heatmap_rgb(data, self.data_source.maxlen, w, h, self.lut)
+        self._photo.configure(data=b'P6 %d %d 255\n' % (w, h) + rgb.tobytes(), format='PPM')
@@ -0,0 +1,62 @@
+_UNSET = object()
+
+def or_na(fmt):
+    """Wrap a formatter so non-positive values render as 'N/A'"""
+    return lambda value: fmt(value) if value > 0 else "N/A"
+
+class LabelBinding:
+    """Push values to Tk labels only when they change.
+
+    Each key caches the last raw value, rendered text and color. ``set()``
+    formats only when the raw value differs, calls ``config`` only when the
+    text or color actually changes, and picks the color from the numeric
+    ``level`` rather than parsing the rendered string. A key can be bound to
+    several labels (e.g. a tab's detail grid and the overview panel).
+    """
+
+    def __init__(self, colors, warning=60, danger=80):
+        self.colors = colors
+        self.warning = warning
+        self.danger = danger
+        self._labels = {}  # key -> [label, ...]
+        self._values = {}
+        self._texts = {}
+        self._fgs = {}
+
+    def bind(self, key, label):
+        self._labels.setdefault(key, []).append(label)
+        # Force the next set() to push text and color to the new label
+        self._values.pop(key, None)
+        self._texts.pop(key, None)
+        self._fgs.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._labels
+
+    def color_for(self, level):
+        """Color class for a numeric level; None means no thresholds apply"""
+        if level is None:
+            return self.colors['fg']
+        if level > self.danger:
+            return self.colors['danger']
+        if level > self.warning:
+            return self.colors['warning']
+        return self.colors['success']
+
+    def set(self, key, value, fmt=str, level=None):
+        """Show ``fmt(value)`` on the labels bound to ``key``"""
+        labels = self._labels.get(key)
+        if not labels:
+            return
+        if self._values.get(key, _UNSET) != value:
+            self._values[key] = value
+            text = fmt(value)
+            if self._texts.get(key) != text:
+                self._texts[key] = text
+                for label in labels:
+                    label.config(text=text)
+        fg = self.color_for(level)
+        if self._fgs.get(key) != fg:
+            self._fgs[key] = fg
+            for label in labels:
+                label.config(fg=fg)
@@ -1,19 +1,60 @@
 import tkinter as tk
 from tkinter import ttk
-from monitor import get_system_snapshot
-from utils import format_bytes, format_frequency, format_temperature, format_voltage, format_power, format_speed
+from monitor.sampler import Sampler
+from monitor.log_writer import create_log_writer, make_log_row, DEFAULT_LOG_BASE
+from monitor.metrics import MetricsTracker, HISTORY_METRICS
+from utils import format_bytes, format_frequency, format_temperature, format_voltage, format_power, format_speed, RingBuffer
 import platform
-from collections import deque
+import psutil
 import time
 import math
 from gui.scrolling_graph import ScrollingGraph
 import os
 import json
 from gui.dual_line_graph import DualLineGraph
-import sys
-import csv
+from gui.render_scheduler import RenderScheduler, DEFAULT_MAX_FPS
+from gui.label_binding import LabelBinding, or_na
 import base64
 
+# Upper bound (ms) on how long a new sample waits before it is rendered
+GUI_POLL_INTERVAL = 100
+# The process table refreshes on its own thread, only while its tab is shown
+PROCESS_REFRESH_MS = 1000
+
+def _process_uptime():
+    """Seconds since this process was created (includes interpreter startup)"""
+    return time.time() - psutil.Process().create_time()
+
+# Label formatters; LabelBinding only calls them when a value changes
+def _percent(value):
+    return f"{value:.1f}%"
+
+def _fan_list(fans):
+    return ", ".join([f"{fan:.0f}" for fan in fans]) if fans else "N/A"
+
+def _name_list(names):
+    return ", ".join(names) if names else "None"
+
+def _type_list(types):
+    return ", ".join(set(types)) if types else "None"
+
+_percent_or_na = or_na(_percent)
+_ghz = or_na(lambda mhz: f"{mhz/1000:.1f} GHz")
+_mhz = or_na(lambda mhz: f"{mhz:.0f} MHz")
+_mhz_int = or_na(lambda mhz: f"{mhz} MHz")
+_celsius = or_na(lambda temp: f"{temp:.1f}°C")
+_volts = or_na(lambda volts: f"{volts:.3f}V")
+_power = or_na(format_power)
+_bytes_or_na = or_na(format_bytes)
+_fan_percent = or_na(lambda percent: f"{percent:.0f}%")
+_rpm = or_na(lambda rpm: f"{rpm:.0f} RPM")
+_partitions = "{} partitions".format
+_disks = "{} disks".format
+_thousands = "{:,}".format
+
+def _rate(bytes_per_second):
+    return f"{format_bytes(bytes_per_second)}/s" if bytes_per_second else "0"
+
 class SysIntelGUI:
     def __init__(self, root):
         self.root = root
@@ -36,19 +77,82 @@ class SysIntelGUI:
         }
         
         self.root.configure(bg=self.colors['bg'])
-        self.labels = {}
+        self.labels = LabelBinding(self.colors)  # Value labels, updated only when their value changes
         self.graphs = {}
         self.history_seconds = 60  # Always show 60 seconds (Task Manager style)
         self.config_path = os.path.join(os.path.dirname(__file__), 'config.json')
         self.smoothing_style = 'round'  # Default smoothing style
         self.update_interval = 500  # Default 0.5 seconds
         self.temp_unit = 'C'  # Default temperature unit
+        self.proc_fast_path = False  # Opt-in: read hot Linux counters directly from /proc
+        self.log_fsync = 'none'  # Log durability: 'none' or 'periodic' fsync
+        self.log_format = 'csv'  # 'csv' (base36 text) or 'binary' (fixed-width records)
+        # Log segmenting: rotation is 'none', 'hourly' or 'daily'; retention limits are optional
+        self.log_rotation = 'none'
+        self.log_max_segment_mb = 64
+        self.log_compress = False
+        self.log_retention_days = None
+        self.log_retention_mb = None
         self.update_stats_after_id = None
-        self.prev_disk_io = None  # Track previous disk I/O for speed calculation
-        self.prev_disk_busy_time = None  # Track previous disk busy time for utilization calculation
+        self.latest_stats = None  # Newest snapshot, used to fill tabs built later
+        self.startup_times = {}  # Seconds from process start to first paint / first data
+        self.metrics_tracker = MetricsTracker()  # Derives disk rates etc. from successive snapshots
+        self.rollup_enabled = True  # Keep consolidated long-term history (fixed-size files)
+        self.max_fps = DEFAULT_MAX_FPS  # Graph redraws per second, independent of sampling
+        self.http_port = None  # Serve /metrics and /json on 127.0.0.1 when set
+        # Accept remote agents on this port and add a Hosts tab when set
+        self.aggregator_port = None
+        self.aggregator_host = '127.0.0.1'
         self.load_config()
         self._set_data_history_length()
+        # Collectors run on the sampler thread; the Tk loop only drains results
+        self.sampler = Sampler(self.update_interval)
+        # Log file stays open; rows are batched and flushed on a size/time threshold
+        self.log_writer = create_log_writer(DEFAULT_LOG_BASE, self.log_format, fsync=self.log_fsync, **self._log_segment_options())
+        self.rollup = None
+        self.http_server = None
+        self.aggregator = None
+        self.host_rows = {}  # host name -> values last shown in the Hosts table
+        self.selected_host = None
+        self.process_sampler = None
+        # Only visible graphs are redrawn, at most max_fps times per second
+        self.render_scheduler = RenderScheduler(self.root, self.graphs, self.max_fps)
         self.build_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Start sampling once the window is up so collectors don't delay the first paint
+        self.root.after_idle(self._after_first_paint)
+
+    def _after_first_paint(self):
+        self.root.update_idletasks()
+        self.startup_times['first_paint'] = _process_uptime()
+        if self.proc_fast_path:
+            from monitor.system_stats import enable_procfs_fast_path
+            if not enable_procfs_fast_path():
+                print("/proc fast path unavailable; using psutil collectors")
+        # Long-term history is consolidated on the sampler thread, off the Tk loop
+        if self.rollup_enabled:
+            try:
+                from monitor.rollup import RollupStore, RollupFeeder, DEFAULT_ROLLUP_DIR
+                self.rollup = RollupStore(DEFAULT_ROLLUP_DIR, raw_step=self.update_interval / 1000.0)
+                self.sampler.add_listener(RollupFeeder(self.rollup))
+            except Exception as e:
+                print(f"Error opening rollup store: {e}")
+        if self.aggregator_port is not None:
+            try:
+                from monitor.remote import Aggregator
+                self.aggregator = Aggregator(self.aggregator_host, self.aggregator_port)
+                self.aggregator.start()
+            except Exception as e:
+                self.aggregator = None
+                print(f"Error starting aggregator: {e}")
+        # Scrapes are answered from the latest sample; they never collect
+        if self.http_port is not None:
+            try:
+                from monitor.http_server import start_http_server
+                self.http_server = start_http_server(self.sampler, port=self.http_port)
+            except Exception as e:
+                print(f"Error starting metrics server: {e}")
+        self.sampler.start()
         self.update_stats()
 
     def load_config(self):
@@ -62,6 +166,25 @@ class SysIntelGUI:
                     self.smoothing_style = config['smoothing_style']
                 if 'temp_unit' in config:
                     self.temp_unit = config['temp_unit']
+                if 'proc_fast_path' in config:
+                    self.proc_fast_path = bool(config['proc_fast_path'])
+                if 'log_fsync' in config:
+                    self.log_fsync = config['log_fsync']
+                if 'log_format' in config:
+                    self.log_format = config['log_format']
+                if 'rollup_enabled' in config:
+                    self.rollup_enabled = bool(config['rollup_enabled'])
+                if 'max_fps' in config:
+                    self.max_fps = float(config['max_fps'])
+                if config.get('http_port') is not None:
+                    self.http_port = int(config['http_port'])
+                if config.get('aggregator_port') is not None:
+                    self.aggregator_port = int(config['aggregator_port'])
+                if 'aggregator_host' in config:
+                    self.aggregator_host = config['aggregator_host']
+                for key in ('log_rotation', 'log_max_segment_mb', 'log_compress', 'log_retention_days', 'log_retention_mb'):
+                    if key in config:
+                        setattr(self, key, config[key])
         except Exception as e:
             print(f"Error loading config: {e}")
 
@@ -70,27 +193,49 @@ class SysIntelGUI:
             config = {
                 'update_interval': self.update_interval,
                 'smoothing_style': self.smoothing_style,
-                'temp_unit': self.temp_unit
+                'temp_unit': self.temp_unit,
+                'proc_fast_path': self.proc_fast_path,
+                'log_fsync': self.log_fsync,
+                'log_format': self.log_format,
+                'log_rotation': self.log_rotation,
+                'log_max_segment_mb': self.log_max_segment_mb,
+                'log_compress': self.log_compress,
+                'log_retention_days': self.log_retention_days,
+                'log_retention_mb': self.log_retention_mb,
+                'rollup_enabled': self.rollup_enabled,
+                'max_fps': self.max_fps,
+                'http_port': self.http_port,
+                'aggregator_port': self.aggregator_port,
+                'aggregator_host': self.aggregator_host
             }
             with open(self.config_path, 'w') as f:
                 json.dump(config, f)
         except Exception as e:
             print(f"Error saving config: {e}")
 
-    def _set_data_history_length(self):
-        points = max(2, int(math.ceil(self.history_seconds * 1000 / self.update_interval)))
-        self.data_history = {
-            'cpu_usage': deque(maxlen=points),
-            'memory_usage': deque(maxlen=points),
-            'gpu_usage': deque(maxlen=points),
-            'gpu_temp': deque(maxlen=points),
-            'cpu_temp': deque(maxlen=points),
-            'fan_speeds': deque(maxlen=points),
-            'disk_read_speed': deque(maxlen=points),
-            'disk_write_speed': deque(maxlen=points),
-            'disk_io_utilization': deque(maxlen=points)
+    def _log_segment_options(self):
+        """SegmentedLogWriter options from config (empty when rotation is off)"""
+        if self.log_rotation == 'none':
+            return {}
+        return {
+            'rotation': self.log_rotation,
+            'max_segment_bytes': int(self.log_max_segment_mb * 1024 * 1024),
+            'compress': bool(self.log_compress),
+            'max_age_days': self.log_retention_days,
+            'max_total_bytes': int(self.log_retention_mb * 1024 * 1024) if self.log_retention_mb else None
         }
 
+    def _history_points(self):
+        return max(2, int(math.ceil(self.history_seconds * 1000 / self.update_interval)))
+
+    def _set_data_history_length(self):
+        points = self._history_points()
+        # float32 rings: ~4 bytes per point, graphs read them without copying
+        self.data_history = {key: RingBuffer(points) for key in HISTORY_METRICS}
+        # One row of per-core usage per sample, for the heatmap
+        self.core_count = psutil.cpu_count() or 1
+        self.core_history = RingBuffer(points, shape=(self.core_count,))
+
     def build_ui(self):
         # Main container
         main_container = tk.Frame(self.root, bg=self.colors['bg'])
@@ -113,30 +258,62 @@ class SysIntelGUI:
         style.configure('TNotebook.Tab', background=self.colors['secondary'], foreground=self.colors['fg'])
         style.map('TNotebook.Tab', background=[('selected', self.colors['accent'])])
         
-        # Create tabs
-        self.create_cpu_tab()
-        self.create_memory_tab()
-        self.create_gpu_tab()
-        self.create_fan_tab()
-        self.create_network_tab()
-        self.create_disk_tab()  # Add disk tab
-        self.create_system_tab()
-        self.create_temp_tab()  # Add temperature tab
-        self.create_settings_tab()
+        # Create tabs; each one's content is built the first time it is selected
+        self.tab_builders = {}
+        tabs = [("CPU", self.create_cpu_tab),
+                ("Memory", self.create_memory_tab),
+                ("GPU", self.create_gpu_tab),
+                ("Fans", self.create_fan_tab),
+                ("Network", self.create_network_tab),
+                ("Disk", self.create_disk_tab),
+                ("System", self.create_system_tab),
+                ("Temperature", self.create_temp_tab),
+                ("Processes", self.create_processes_tab)]
+        if self.aggregator_port is not None:
+            tabs.append(("Hosts", self.create_hosts_tab))
+        tabs.append(("Settings", self.create_settings_tab))
+        self.hosts_frame = None
+        self.processes_frame = None
+        for text, builder in tabs:
+            frame = tk.Frame(self.notebook, bg=self.colors['bg'])
+            self.notebook.add(frame, text=text)
+            self.tab_builders[str(frame)] = builder
         
         # Create bottom panel for non-graphable data
         self.create_bottom_panel(main_container)
-        # Bind tab change to force redraw
-        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.update_graphs())
+        # Build (if needed) and draw the newly visible tab right away
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.on_tab_changed())
+        self.on_tab_changed()
+
+    def on_tab_changed(self):
+        builder = self.tab_builders.pop(self.notebook.select(), None)
+        if builder is not None:
+            builder(self.root.nametowidget(self.notebook.select()))
+            if self.latest_stats is not None:
+                # Fill the new tab's labels now rather than on the next sample
+                self.update_all_labels(self.latest_stats)
+        self.update_hosts_tab()
+        if self.process_sampler is not None:
+            # Only pay for the process table while it is on screen
+            if self.notebook.select() == str(self.processes_frame):
+                self.process_sampler.start()
+            else:
+                self.process_sampler.stop(timeout=0)  # Never block the Tk thread on a slow refresh
+        self.render_scheduler.show()
 
-    def create_cpu_tab(self):
+    def create_cpu_tab(self, cpu_frame):
         """Create CPU monitoring tab with graphs"""
-        cpu_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
-        self.notebook.add(cpu_frame, text="CPU")
+        from gui.heatmap import CoreHeatmap
         # CPU Usage graph
         graph = ScrollingGraph(cpu_frame, self.data_history['cpu_usage'], self.colors['accent'], 0, 100, seconds=self.history_seconds, bg=self.colors['chart_bg'], grid=self.colors['chart_grid'], label='CPU Usage (%)', label_color=self.colors['fg'], smoothing=self.smoothing_style)
         graph.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 0))
         self.graphs['cpu'] = graph
+        # Per-core heatmap: one image, so its cost doesn't grow with the core count
+        heatmap = CoreHeatmap(cpu_frame, self.core_history, bg=self.colors['chart_bg'],
+                              label=f'Per-core usage ({self.core_count} CPUs)', label_color=self.colors['fg'],
+                              height=max(60, min(240, self.core_count * 4)))
+        heatmap.pack(fill=tk.X, padx=10, pady=(4, 0))
+        self.graphs['cpu_cores'] = heatmap
         # CPU details panel
         details_frame = tk.Frame(cpu_frame, bg=self.colors['secondary'], relief=tk.RAISED, bd=1)
         details_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
@@ -150,10 +327,8 @@ class SysIntelGUI:
             ("Voltage", "cpu_voltage")
         ])
 
-    def create_memory_tab(self):
+    def create_memory_tab(self, memory_frame):
         """Create Memory monitoring tab with graphs"""
-        memory_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
-        self.notebook.add(memory_frame, text="Memory")
         
         # Create graph
         graph = ScrollingGraph(memory_frame, self.data_history['memory_usage'], self.colors['success'], 0, 100, seconds=self.history_seconds, bg=self.colors['chart_bg'], grid=self.colors['chart_grid'], label='Memory Usage (%)', label_color=self.colors['fg'], smoothing=self.smoothing_style)
@@ -173,10 +348,8 @@ class SysIntelGUI:
             ("Frequency", "mem_freq")
         ])
 
-    def create_gpu_tab(self):
+    def create_gpu_tab(self, gpu_frame):
         """Create GPU monitoring tab with graphs"""
-        gpu_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
-        self.notebook.add(gpu_frame, text="GPU")
         
         # Create graph
         graph = ScrollingGraph(gpu_frame, self.data_history['gpu_usage'], self.colors['warning'], 0, 100, seconds=self.history_seconds, bg=self.colors['chart_bg'], grid=self.colors['chart_grid'], label='GPU Usage (%)', label_color=self.colors['fg'], smoothing=self.smoothing_style)
@@ -198,14 +371,13 @@ class SysIntelGUI:
             ("Frequency", "gpu_freq"),
             ("Memory Frequency", "gpu_mem_freq"),
             ("Voltage", "gpu_voltage"),
+            ("Power Draw", "gpu_power"),
             ("Max TGP", "gpu_max_tgp"),
             ("Fan Speed", "gpu_fan")
         ])
 
-    def create_fan_tab(self):
+    def create_fan_tab(self, fan_frame):
         """Create Fan monitoring tab with graphs"""
-        fan_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
-        self.notebook.add(fan_frame, text="Fans")
         
         # Create graph
         graph = ScrollingGraph(fan_frame, self.data_history['fan_speeds'], self.colors['info'], 0, 5000, seconds=self.history_seconds, bg=self.colors['chart_bg'], grid=self.colors['chart_grid'], label='Fan Speed (RPM)', label_color=self.colors['fg'], smoothing=self.smoothing_style)
@@ -223,10 +395,8 @@ class SysIntelGUI:
             ("System Fans", "sys_fans")
         ])
 
-    def create_network_tab(self):
+    def create_network_tab(self, network_frame):
         """Create Network monitoring tab"""
-        network_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
-        self.notebook.add(network_frame, text="Network")
         
         # Network details panel (no graph for network)
         details_frame = tk.Frame(network_frame, bg=self.colors['secondary'], relief=tk.RAISED, bd=1)
@@ -240,10 +410,8 @@ class SysIntelGUI:
             ("Wi-Fi Adapters", "wifi_adapters")
         ])
 
-    def create_disk_tab(self):
+    def create_disk_tab(self, disk_frame):
         """Create Disk monitoring tab with I/O graphs"""
-        disk_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
-        self.notebook.add(disk_frame, text="Disk")
         
         # Create dual-line graph for read/write speeds
         graph = DualLineGraph(disk_frame, 
@@ -283,10 +451,8 @@ class SysIntelGUI:
             ("Active Disks", "disk_active_count")
         ])
 
-    def create_system_tab(self):
+    def create_system_tab(self, system_frame):
         """Create System information tab"""
-        system_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
-        self.notebook.add(system_frame, text="System")
         
         # System details panel (no graph for system info)
         details_frame = tk.Frame(system_frame, bg=self.colors['secondary'], relief=tk.RAISED, bd=1)
@@ -301,16 +467,9 @@ class SysIntelGUI:
             ("File Systems", "disk_types")
         ])
 
-    def create_temp_tab(self):
-        temp_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
-        self.notebook.add(temp_frame, text="Temperature")
+    def create_temp_tab(self, temp_frame):
         # Determine Y axis range and label
-        if self.temp_unit == 'F':
-            y_min, y_max = 32, 230
-            label = 'Temperature (°F)'
-        else:
-            y_min, y_max = 0, 110
-            label = 'Temperature (°C)'
+        y_min, y_max, label = self._temp_axis()
         self.graphs['temp_tab'] = DualLineGraph(temp_frame,
             [self.data_history['cpu_temp'], self.data_history['gpu_temp']],
             [self.colors['danger'], self.colors['warning']],
@@ -322,10 +481,106 @@ class SysIntelGUI:
         )
         self.graphs['temp_tab'].pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-    def create_settings_tab(self):
+    def create_processes_tab(self, processes_frame):
+        """Virtualized process list refreshed by a ProcessTable on a background thread"""
+        from monitor.processes import ProcessTable, PID, NAME, USER, CPU, MEMORY, READ_RATE, WRITE_RATE
+        from gui.process_view import VirtualTable
+        self.processes_frame = processes_frame
+        self.process_summary = tk.Label(processes_frame, text="Collecting processes...", font=("Segoe UI", 10),
+                                        bg=self.colors['bg'], fg=self.colors['fg'], anchor='w')
+        self.process_summary.pack(fill=tk.X, padx=10, pady=(10, 0))
+        columns = [("PID", PID, 80, 'e', str),
+                   ("Name", NAME, 260, 'w', str),
+                   ("User", USER, 160, 'w', str),
+                   ("CPU", CPU, 80, 'e', _percent),
+                   ("Memory", MEMORY, 110, 'e', format_bytes),
+                   ("Disk Read", READ_RATE, 110, 'e', _rate),
+                   ("Disk Write", WRITE_RATE, 110, 'e', _rate)]
+        self.process_view = VirtualTable(processes_frame, columns, self.colors, sort_column=CPU)
+        self.process_view.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.process_sampler = Sampler(PROCESS_REFRESH_MS, collect=ProcessTable().refresh, capacity=1)
+
+    def update_processes_tab(self):
+        """Show the newest process table, if the collector produced one"""
+        if self.process_sampler is None:
+            return
+        samples = self.process_sampler.drain()
+        if not samples:
+            return
+        table = samples[-1][1]
+        self.process_view.set_rows(table['rows'])
+        self.process_summary.config(text=f"{table['count']} processes · {table['refreshed']} refreshed in {table['cost']*1000:.1f} ms")
+
+    def create_hosts_tab(self, hosts_frame):
+        """Table of aggregated agents; the selected host's CPU history is graphed below"""
+        from monitor.remote import DEFAULT_HOST_POINTS
+        self.hosts_frame = hosts_frame
+        style = ttk.Style()
+        style.configure('Hosts.Treeview', background=self.colors['chart_bg'], fieldbackground=self.colors['chart_bg'],
+                        foreground=self.colors['fg'], rowheight=22)
+        style.configure('Hosts.Treeview.Heading', background=self.colors['secondary'], foreground=self.colors['fg'])
+        columns = (("host", "Host", 200), ("status", "Status", 90), ("cpu", "CPU", 80), ("mem", "Memory", 80),
+                   ("gpu", "GPU", 80), ("cpu_temp", "CPU Temp", 90), ("last_seen", "Last Seen", 110))
+        table_frame = tk.Frame(hosts_frame, bg=self.colors['bg'])
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 0))
+        self.hosts_table = ttk.Treeview(table_frame, columns=[c[0] for c in columns], show='headings',
+                                        selectmode='browse', style='Hosts.Treeview')
+        for key, heading, width in columns:
+            self.hosts_table.heading(key, text=heading)
+            self.hosts_table.column(key, width=width, anchor=tk.W if key == 'host' else tk.CENTER)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.hosts_table.yview)
+        self.hosts_table.configure(yscrollcommand=scrollbar.set)
+        self.hosts_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.hosts_table.bind('<<TreeviewSelect>>', lambda e: self.on_host_selected())
+        # Graph reads the selected host's ring directly; empty until a host is picked
+        graph = ScrollingGraph(hosts_frame, RingBuffer(DEFAULT_HOST_POINTS), self.colors['accent'], 0, 100,
+                               seconds=DEFAULT_HOST_POINTS, bg=self.colors['chart_bg'], grid=self.colors['chart_grid'],
+                               label='Select a host', label_color=self.colors['fg'], smoothing=self.smoothing_style, height=260)
+        graph.pack(fill=tk.X, padx=10, pady=10)
+        self.graphs['hosts'] = graph
+        self.host_rows = {}
+
+    def on_host_selected(self):
+        selection = self.hosts_table.selection()
+        if not selection or self.aggregator is None:
+            return
+        host = self.aggregator.hosts.get(selection[0])
+        if host is None:
+            return
+        self.selected_host = host.name
+        graph = self.graphs['hosts']
+        graph.data_source = host.history['cpu_usage']
+        graph.seconds = host.seconds
+        graph.set_range(0, 100, f'{host.name} CPU Usage (%)')
+        self.render_scheduler.show()
+
+    def update_hosts_tab(self):
+        """Refresh the Hosts table, touching only rows whose values changed"""
+        if self.hosts_frame is None or self.aggregator is None or self.notebook.select() != str(self.hosts_frame):
+            return
+        now = time.time()
+        for host in self.aggregator.host_list():
+            if host.metrics is None:
+                values = (host.name, "Connected" if host.connected else "Offline", "-", "-", "-", "-", "-")
+            else:
+                metrics = host.metrics
+                age = now - host.last_seen
+                values = (host.name,
+                          "Connected" if host.connected else "Offline",
+                          _percent(metrics['cpu_usage']),
+                          _percent(metrics['memory_usage']),
+                          _percent_or_na(metrics['gpu_usage']),
+                          _celsius(metrics['cpu_temp']),
+                          "now" if age < 2 else f"{age:.0f}s ago")
+            if host.name not in self.host_rows:
+                self.hosts_table.insert('', tk.END, iid=host.name, values=values)
+            elif self.host_rows[host.name] != values:
+                self.hosts_table.item(host.name, values=values)
+            self.host_rows[host.name] = values
+
+    def create_settings_tab(self, settings_frame):
         """Create Settings tab for configuration"""
-        settings_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
-        self.notebook.add(settings_frame, text="Settings")
         
         # Settings container
         settings_container = tk.Frame(settings_frame, bg=self.colors['secondary'], relief=tk.RAISED, bd=1)
@@ -451,6 +706,16 @@ class SysIntelGUI:
             rb = tk.Radiobutton(smoothing_frame, text=text, variable=self.smoothing_var, value=value, bg=self.colors['secondary'], fg=self.colors['fg'], selectcolor=self.colors['accent'], command=self.on_smoothing_change)
             rb.pack(side=tk.LEFT, padx=(0, 15))
 
+        # Graph frame rate option
+        fps_label = tk.Label(settings_container, text="Graph Frame Rate:", font=("Segoe UI", 12, "bold"), bg=self.colors['secondary'], fg=self.colors['fg'])
+        fps_label.pack(anchor="w", padx=30, pady=(10, 0))
+        fps_frame = tk.Frame(settings_container, bg=self.colors['secondary'])
+        fps_frame.pack(anchor="w", padx=30, pady=(0, 10))
+        self.max_fps_var = tk.IntVar(value=int(self.max_fps))
+        for text, value in [("2 fps", 2), ("5 fps", 5), ("10 fps", 10), ("30 fps", 30)]:
+            rb = tk.Radiobutton(fps_frame, text=text, variable=self.max_fps_var, value=value, bg=self.colors['secondary'], fg=self.colors['fg'], selectcolor=self.colors['accent'], command=self.on_max_fps_change)
+            rb.pack(side=tk.LEFT, padx=(0, 15))
+
         # Temperature unit option
         temp_unit_label = tk.Label(settings_container, text="Temperature Unit:", font=("Segoe UI", 12, "bold"), bg=self.colors['secondary'], fg=self.colors['fg'])
         temp_unit_label.pack(anchor="w", padx=30, pady=(10, 0))
@@ -489,7 +754,7 @@ class SysIntelGUI:
             label.pack(anchor="w")
             value_label = tk.Label(field_frame, text="Loading...", font=("Consolas", 9), bg=self.colors['secondary'], fg=self.colors['success'])
             value_label.pack(anchor="w")
-            self.labels[key] = value_label
+            self.labels.bind(key, value_label)
         for i in range(len(fields)):
             overview_frame.grid_columnconfigure(i, weight=1)
 
@@ -512,109 +777,55 @@ class SysIntelGUI:
                                  bg=self.colors['secondary'], fg=self.colors['success'])
             value_label.pack(anchor="w")
             
-            self.labels[key] = value_label
+            self.labels.bind(key, value_label)
         
         # Configure grid weights
         for i in range(3):
             parent.grid_columnconfigure(i, weight=1)
 
     def update_stats(self):
-        """Update all statistics and graphs"""
-        try:
-            stats = get_system_snapshot()
-            # Efficiently log the new data point as compact CSV
-            log_path = os.path.join(os.path.dirname(__file__), 'sysintel_log.csv')
-            log_fields = ['ts', 'cpu', 'mem', 'gpu', 'ct', 'gt', 'fan', 'disk_io']
-            # Use base36 for timestamp for compactness
-            ts = int(time.time())
-            ts_b36 = base36encode(ts)
-            # Get current disk utilization from graph data
-            current_disk_util = self.data_history['disk_io_utilization'][-1] if self.data_history['disk_io_utilization'] else 0
-            
-            row = {
-                'ts': ts_b36,
-                'cpu': int(round(stats['cpu']['usage'])),
-                'mem': int(round(stats['memory']['percent'])),
-                'gpu': int(round(stats['gpu']['usage'])),
-                'ct': int(round(stats['cpu']['temperature'])),
-                'gt': int(round(stats['gpu']['temperature'])),
-                'fan': int(round(stats['fans']['cpu'])),
-                'disk_io': int(round(current_disk_util))
-            }
-            write_header = not os.path.exists(log_path)
-            with open(log_path, 'a', newline='', encoding='utf-8') as logf:
-                writer = csv.DictWriter(logf, fieldnames=log_fields)
-                if write_header:
-                    writer.writeheader()
-                writer.writerow(row)
-            
-            # Update data history
-            self.data_history['cpu_usage'].append(stats['cpu']['usage'])
-            self.data_history['memory_usage'].append(stats['memory']['percent'])
-            self.data_history['gpu_usage'].append(stats['gpu']['usage'])
-            
-            # Convert temps if needed
-            if self.temp_unit == 'F':
-                cpu_temp = stats['cpu']['temperature'] * 9/5 + 32 if stats['cpu']['temperature'] else 0
-                gpu_temp = stats['gpu']['temperature'] * 9/5 + 32 if stats['gpu']['temperature'] else 0
-            else:
-                cpu_temp = stats['cpu']['temperature']
-                gpu_temp = stats['gpu']['temperature']
-            self.data_history['cpu_temp'].append(cpu_temp)
-            self.data_history['gpu_temp'].append(gpu_temp)
-            
-            # Update fan speeds (average of all fans)
-            fan_speeds = [stats['fans']['cpu'], stats['fans']['gpu']] + stats['fans']['system']
-            avg_fan_speed = sum(fan_speeds) / len(fan_speeds) if fan_speeds else 0
-            self.data_history['fan_speeds'].append(avg_fan_speed)
-            
-            # Update disk I/O data
-            disk_io = stats['disk_io']
-            
-            # Calculate speeds in MB/s based on difference from previous measurement
-            if self.prev_disk_io is not None:
-                time_diff = self.update_interval / 1000.0  # Convert to seconds
-                read_diff = disk_io['total_read_bytes'] - self.prev_disk_io['total_read_bytes']
-                write_diff = disk_io['total_write_bytes'] - self.prev_disk_io['total_write_bytes']
-                
-                read_speed = (read_diff / (1024 * 1024)) / time_diff if time_diff > 0 else 0
-                write_speed = (write_diff / (1024 * 1024)) / time_diff if time_diff > 0 else 0
-                
-                # Calculate disk utilization as percentage of time disk was busy
-                total_busy_time = sum(disk['read_time'] + disk['write_time'] for disk in disk_io['disks'])
-                if self.prev_disk_busy_time is not None:
-                    busy_time_diff = total_busy_time - self.prev_disk_busy_time
-                    # busy_time_diff is in milliseconds, time_diff is in seconds
-                    # Convert time_diff to milliseconds and calculate percentage
-                    time_diff_ms = time_diff * 1000
-                    utilization = min(100, (busy_time_diff / time_diff_ms) * 100) if time_diff_ms > 0 else 0
-                else:
-                    utilization = 0
-            else:
-                read_speed = 0
-                write_speed = 0
-                utilization = 0
-            
-            self.data_history['disk_read_speed'].append(read_speed)
-            self.data_history['disk_write_speed'].append(write_speed)
-            self.data_history['disk_io_utilization'].append(utilization)
-            
-            # Store current values for next calculation
-            self.prev_disk_io = disk_io.copy()
-            self.prev_disk_busy_time = sum(disk['read_time'] + disk['write_time'] for disk in disk_io['disks'])
-            
-            # Update graphs
-            self.update_graphs()
-            
-            # Update labels
-            self.update_all_labels(stats)
-            
-        except Exception as e:
-            print(f"Error updating stats: {e}")
-        # Schedule next update
+        """Drain new samples from the sampler and refresh graphs and labels"""
         if self.update_stats_after_id:
             self.root.after_cancel(self.update_stats_after_id)
-        self.update_stats_after_id = self.root.after(self.update_interval, self.update_stats)
+            self.update_stats_after_id = None
+        self.update_processes_tab()
+        samples = self.sampler.drain()
+        if samples:
+            try:
+                for ts, stats in samples:
+                    self.record_sample(ts, stats)
+                # Only the newest sample is rendered; older ones were still
+                # logged and appended to the history above
+                self.latest_stats = samples[-1][1]
+                self.update_graphs()
+                self.update_all_labels(self.latest_stats)
+                self.update_hosts_tab()
+            except Exception as e:
+                print(f"Error updating stats: {e}")
+            if 'first_data' not in self.startup_times:
+                self.startup_times['first_data'] = _process_uptime()
+                print(f"Startup: first paint {self.startup_times['first_paint']*1000:.0f} ms, first data {self.startup_times['first_data']*1000:.0f} ms after process start")
+        # Schedule next poll; polling is cheap, so don't wait a full interval
+        self.update_stats_after_id = self.root.after(min(self.update_interval, GUI_POLL_INTERVAL), self.update_stats)
+
+    def record_sample(self, ts, stats):
+        """Log one sample and append it to the data history"""
+        metrics = self.metrics_tracker.update(ts, stats)
+        # Efficiently log the new data point (compact CSV or binary record)
+        self.log_writer.write(make_log_row(ts, stats, metrics['disk_io_utilization']))
+        
+        # Convert temps if needed
+        if self.temp_unit == 'F':
+            metrics['cpu_temp'] = metrics['cpu_temp'] * 9/5 + 32 if metrics['cpu_temp'] else 0
+            metrics['gpu_temp'] = metrics['gpu_temp'] * 9/5 + 32 if metrics['gpu_temp'] else 0
+        
+        # Update data history
+        for key, value in metrics.items():
+            self.data_history[key].append(value, ts)
+        per_core = stats['cpu'].get('per_core') or []
+        if len(per_core) != self.core_count:
+            per_core = (list(per_core) + [0.0] * self.core_count)[:self.core_count]
+        self.core_history.append(per_core, ts)
 
     def on_update_interval_change(self, value):
         """Handle update interval slider change"""
@@ -627,40 +838,21 @@ class SysIntelGUI:
         self.update_value_label.config(text=f"{interval/1000:.1f}s")
 
     def apply_settings(self):
-        """Apply the current settings"""
+        """Apply the current settings live; collected history is kept"""
         new_interval = int(self.update_slider.get())
         new_smoothing = self.smoothing_var.get()
         new_temp_unit = self.temp_unit_var.get()
-        changed = False
+        self.set_max_fps(self.max_fps_var.get())
         if new_interval != self.update_interval:
-            self.update_interval = new_interval
-            self._set_data_history_length()  # Re-instantiate all deques with new maxlen
-            changed = True
-            # Immediately update stats to seed graphs and restart update loop
-            if self.update_stats_after_id:
-                self.root.after_cancel(self.update_stats_after_id)
-                self.update_stats_after_id = None
-            self.update_stats()
-            # Schedule a second update to ensure 2 data points for graphs
-            self.root.after(10, self.update_stats)
-            # Force all graphs to redraw immediately
-            for g in self.graphs.values():
-                g.redraw()
+            self.apply_update_interval(new_interval)
         if new_smoothing != self.smoothing_style:
             self.smoothing_style = new_smoothing
             for g in self.graphs.values():
                 g.smoothing = self.smoothing_style
-                g.redraw()
-            changed = True
-        if new_temp_unit != self.temp_unit:
-            self.temp_unit = new_temp_unit
-            self.update_temp_tab_graph()
-            changed = True
+            self.update_graphs()
+        self.set_temp_unit(new_temp_unit)
         # Save config
         self.save_config()
-        # Restart the app immediately (no confirmation)
-        python = sys.executable
-        os.execl(python, python, *sys.argv)
         # Optimize performance based on update speed
         self.optimize_for_speed(self.update_interval)
         # Update status message
@@ -669,179 +861,170 @@ class SysIntelGUI:
         self.status_label.config(fg=self.colors['success'])
         self.root.after(3000, lambda: self.status_label.config(fg=self.colors['fg']))
 
+    def apply_update_interval(self, interval):
+        """Switch the sampling interval, resampling the history to the new point spacing"""
+        self.update_interval = interval
+        points = self._history_points()
+        # Resample in place: graphs keep reading the same buffers
+        for history in self.data_history.values():
+            history.resample(points, interval / 1000.0)
+        self.core_history.resample(points, interval / 1000.0)
+        # Re-arm the sampler; the next tick follows the new interval
+        self.sampler.set_interval(self.update_interval)
+        self.update_graphs()
+
+    def set_temp_unit(self, unit):
+        """Switch temperature units, converting the temperature history in place"""
+        if unit == self.temp_unit:
+            return
+        import numpy as np
+        self.temp_unit = unit
+        for key in ('cpu_temp', 'gpu_temp'):
+            for segment in self.data_history[key].segments():
+                # 0 means "no reading" and stays 0, as in record_sample
+                if unit == 'F':
+                    np.copyto(segment, segment * 9/5 + 32, where=segment != 0)
+                else:
+                    np.copyto(segment, (segment - 32) * 5/9, where=segment != 0)
+        self.update_temp_tab_graph()
+
     def optimize_for_speed(self, interval):
         # No longer needed for history length, but keep for future optimizations
         pass
 
     def update_graphs(self):
-        """Update all graphs with new data - Task Manager style scrolling"""
-        if 'cpu' in self.graphs:
-            self.graphs['cpu'].redraw()
-        if 'memory' in self.graphs:
-            self.graphs['memory'].redraw()
-        if 'gpu' in self.graphs:
-            self.graphs['gpu'].redraw()
-        if 'fans' in self.graphs:
-            self.graphs['fans'].redraw()
-        if 'disk_io' in self.graphs:
-            self.graphs['disk_io'].redraw()
-        if 'disk_util' in self.graphs:
-            self.graphs['disk_util'].redraw()
-        if 'temp' in self.graphs:
-            self.graphs['temp'].redraw()
-        if 'temp_tab' in self.graphs:
-            self.graphs['temp_tab'].redraw()
+        """Mark all graphs stale; visible ones redraw on the next capped render"""
+        self.render_scheduler.request()
 
     def update_all_labels(self, stats):
         """Update all labels with current statistics"""
+        labels = self.labels
         # System Info
-        self.update_label("platform", f"{stats['system']['platform']} {stats['system']['release']}")
-        self.update_label("hostname", stats['system']['hostname'])
-        self.update_label("machine", stats['system']['machine'])
-        # CPU Info
-        self.update_label("cpu_name", stats['cpu']['name'])
-        self.update_label("cpu_usage", f"{stats['cpu']['usage']:.1f}%")
-        self.update_label("cpu_cores", str(stats['cpu']['cores']))
-        self.update_label("cpu_freq", f"{stats['cpu']['frequency']/1000:.1f} GHz" if stats['cpu']['frequency'] > 0 else "N/A")
-        self.update_label("cpu_temp", f"{stats['cpu']['temperature']:.1f}°C" if stats['cpu']['temperature'] > 0 else "N/A")
-        self.update_label("cpu_voltage", f"{stats['cpu']['voltage']:.3f}V" if stats['cpu']['voltage'] > 0 else "N/A")
+        system = stats['system']
+        labels.set("platform", (system['platform'], system['release']), " ".join)
+        labels.set("hostname", system['hostname'])
+        labels.set("machine", system['machine'])
+        # CPU Info (usage and temperature are color coded)
+        cpu = stats['cpu']
+        labels.set("cpu_name", cpu['name'])
+        labels.set("cpu_usage", cpu['usage'], _percent, level=cpu['usage'])
+        labels.set("cpu_cores", cpu['cores'])
+        labels.set("cpu_freq", cpu['frequency'], _ghz)
+        labels.set("cpu_temp", cpu['temperature'], _celsius, level=cpu['temperature'] if cpu['temperature'] > 0 else None)
+        labels.set("cpu_voltage", cpu['voltage'], _volts)
         # Memory Info
-        self.update_label("mem_total", format_bytes(stats['memory']['total']))
-        self.update_label("mem_used", format_bytes(stats['memory']['used']))
-        self.update_label("mem_available", format_bytes(stats['memory']['available']))
-        self.update_label("mem_usage", f"{stats['memory']['percent']:.1f}%")
-        self.update_label("mem_freq", f"{stats['memory']['frequency']} MHz" if stats['memory']['frequency'] > 0 else "N/A")
+        memory = stats['memory']
+        labels.set("mem_total", memory['total'], format_bytes)
+        labels.set("mem_used", memory['used'], format_bytes)
+        labels.set("mem_available", memory['available'], format_bytes)
+        labels.set("mem_usage", memory['percent'], _percent, level=memory['percent'])
+        labels.set("mem_freq", memory['frequency'], _mhz_int)
         # GPU Info
-        self.update_label("gpu_name", stats['gpu']['name'])
-        self.update_label("gpu_usage", f"{stats['gpu']['usage']:.1f}%" if stats['gpu']['usage'] > 0 else "N/A")
-        self.update_label("gpu_mem_used", format_bytes(stats['gpu']['memory_used']) if stats['gpu']['memory_used'] > 0 else "N/A")
-        self.update_label("gpu_mem_total", format_bytes(stats['gpu']['memory_total']) if stats['gpu']['memory_total'] > 0 else "N/A")
-        self.update_label("gpu_mem_usage", f"{stats['gpu']['memory_percent']:.1f}%" if stats['gpu']['memory_percent'] > 0 else "N/A")
-        self.update_label("gpu_temp", f"{stats['gpu']['temperature']:.1f}°C" if stats['gpu']['temperature'] > 0 else "N/A")
-        self.update_label("gpu_freq", f"{stats['gpu']['frequency']} MHz" if stats['gpu']['frequency'] > 0 else "N/A")
-        self.update_label("gpu_mem_freq", f"{stats['gpu']['memory_frequency']} MHz" if stats['gpu']['memory_frequency'] > 0 else "N/A")
-        self.update_label("gpu_voltage", f"{stats['gpu']['voltage']:.3f}V" if stats['gpu']['voltage'] > 0 else "N/A")
-        self.update_label("gpu_max_tgp", f"{stats['gpu']['max_tgp']}W" if stats['gpu']['max_tgp'] > 0 else "N/A")
-        self.update_label("gpu_fan", f"{stats['gpu']['fan_speed']:.0f} RPM" if stats['gpu']['fan_speed'] > 0 else "N/A")
+        gpu = stats['gpu']
+        labels.set("gpu_name", gpu['name'])
+        labels.set("gpu_usage", gpu['usage'], _percent_or_na, level=gpu['usage'] if gpu['usage'] > 0 else None)
+        labels.set("gpu_mem_used", gpu['memory_used'], _bytes_or_na)
+        labels.set("gpu_mem_total", gpu['memory_total'], _bytes_or_na)
+        labels.set("gpu_mem_usage", gpu['memory_percent'], _percent_or_na, level=gpu['memory_percent'] if gpu['memory_percent'] > 0 else None)
+        labels.set("gpu_temp", gpu['temperature'], _celsius, level=gpu['temperature'] if gpu['temperature'] > 0 else None)
+        labels.set("gpu_freq", gpu['frequency'], _mhz)
+        labels.set("gpu_mem_freq", gpu['memory_frequency'], _mhz)
+        labels.set("gpu_voltage", gpu['voltage'], _volts)
+        labels.set("gpu_power", gpu['power'], _power)
+        labels.set("gpu_max_tgp", gpu['max_tgp'], _power)
+        # nvidia-smi reports fan speed as a percentage of maximum
+        labels.set("gpu_fan", gpu['fan_speed'], _fan_percent)
         # Fan Info
-        self.update_label("cpu_fan", f"{stats['fans']['cpu']:.0f} RPM" if stats['fans']['cpu'] > 0 else "N/A")
-        self.update_label("gpu_fan_speed", f"{stats['fans']['gpu']:.0f} RPM" if stats['fans']['gpu'] > 0 else "N/A")
-        sys_fans_text = ", ".join([f"{fan:.0f}" for fan in stats['fans']['system']]) if stats['fans']['system'] else "N/A"
-        self.update_label("sys_fans", sys_fans_text)
+        fans = stats['fans']
+        labels.set("cpu_fan", fans['cpu'], _rpm)
+        labels.set("gpu_fan_speed", fans['gpu'], _rpm)
+        labels.set("sys_fans", tuple(fans['system']), _fan_list)
         # Network Info
-        self.update_label("net_sent", format_bytes(stats['network']['total_sent']))
-        self.update_label("net_recv", format_bytes(stats['network']['total_recv']))
-        eth_adapters = [adapter['name'] for adapter in stats['network']['adapters'] if adapter['type'] == 'Ethernet']
-        self.update_label("eth_adapters", ", ".join(eth_adapters) if eth_adapters else "None")
-        wifi_adapters = [adapter['name'] for adapter in stats['network']['adapters'] if adapter['type'] == 'Wi-Fi']
-        self.update_label("wifi_adapters", ", ".join(wifi_adapters) if wifi_adapters else "None")
+        network = stats['network']
+        labels.set("net_sent", network['total_sent'], format_bytes)
+        labels.set("net_recv", network['total_recv'], format_bytes)
+        labels.set("eth_adapters", tuple(adapter['name'] for adapter in network['adapters'] if adapter['type'] == 'Ethernet'), _name_list)
+        labels.set("wifi_adapters", tuple(adapter['name'] for adapter in network['adapters'] if adapter['type'] == 'Wi-Fi'), _name_list)
         # Disk Info
-        partitions_text = f"{len(stats['disk']['partitions'])} partitions"
-        self.update_label("disk_partitions", partitions_text)
-        types_text = ", ".join(set(stats['disk']['types'])) if stats['disk']['types'] else "None"
-        self.update_label("disk_types", types_text)
+        labels.set("disk_partitions", len(stats['disk']['partitions']), _partitions)
+        labels.set("disk_types", tuple(stats['disk']['types']), _type_list)
         
         # Disk I/O Info
         disk_io = stats['disk_io']
-        self.update_label("disk_total_read", format_bytes(disk_io['total_read_bytes']))
-        self.update_label("disk_total_written", format_bytes(disk_io['total_write_bytes']))
-        self.update_label("disk_read_ops", f"{disk_io['total_read_count']:,}")
-        self.update_label("disk_write_ops", f"{disk_io['total_write_count']:,}")
+        labels.set("disk_total_read", disk_io['total_read_bytes'], format_bytes)
+        labels.set("disk_total_written", disk_io['total_write_bytes'], format_bytes)
+        labels.set("disk_read_ops", disk_io['total_read_count'], _thousands)
+        labels.set("disk_write_ops", disk_io['total_write_count'], _thousands)
         
         # Use the calculated utilization from the graph data
         current_utilization = self.data_history['disk_io_utilization'][-1] if self.data_history['disk_io_utilization'] else 0
-        self.update_label("disk_io_util", f"{current_utilization:.1f}%")
-        self.update_label("disk_active_count", f"{len(disk_io['disks'])} disks")
-
-    def update_label(self, key, value):
-        """Update a specific label with color coding"""
-        if key in self.labels:
-            label = self.labels[key]
-            label.config(text=value)
-            
-            # Color coding based on values
-            if "usage" in key or "percent" in key:
-                try:
-                    val = float(value.replace('%', ''))
-                    if val > 80:
-                        label.config(fg=self.colors['danger'])
-                    elif val > 60:
-                        label.config(fg=self.colors['warning'])
-                    else:
-                        label.config(fg=self.colors['success'])
-                except:
-                    label.config(fg=self.colors['fg'])
-            elif "temp" in key:
-                try:
-                    val = float(value.replace('°C', ''))
-                    if val > 80:
-                        label.config(fg=self.colors['danger'])
-                    elif val > 60:
-                        label.config(fg=self.colors['warning'])
-                    else:
-                        label.config(fg=self.colors['success'])
-                except:
-                    label.config(fg=self.colors['fg'])
-            else:
-                label.config(fg=self.colors['fg'])
+        labels.set("disk_io_util", current_utilization, _percent)
+        labels.set("disk_active_count", len(disk_io['disks']), _disks)
 
     def on_smoothing_change(self):
         self.smoothing_style = self.smoothing_var.get()
         for g in self.graphs.values():
             g.smoothing = self.smoothing_style
-            g.redraw()
+        self.update_graphs()
+
+    def on_max_fps_change(self):
+        self.set_max_fps(self.max_fps_var.get())
+
+    def set_max_fps(self, max_fps):
+        """Change the graph redraw cap; takes effect from the next render"""
+        self.max_fps = max_fps
+        self.render_scheduler.set_max_fps(max_fps)
 
     def on_temp_unit_change(self):
-        self.temp_unit = self.temp_unit_var.get()
-        self.update_temp_tab_graph()
+        self.set_temp_unit(self.temp_unit_var.get())
 
-    def update_temp_tab_graph(self):
-        # Recreate the temp graph with the new unit
-        temp_frame = self.graphs['temp_tab'].master
-        self.graphs['temp_tab'].destroy()
+    def _temp_axis(self):
+        """Y axis range and label for the temperature graph in the current unit"""
         if self.temp_unit == 'F':
-            y_min, y_max = 32, 230
-            label = 'Temperature (°F)'
-        else:
-            y_min, y_max = 0, 110
-            label = 'Temperature (°C)'
-        self.graphs['temp_tab'] = DualLineGraph(temp_frame,
-            [self.data_history['cpu_temp'], self.data_history['gpu_temp']],
-            [self.colors['danger'], self.colors['warning']],
-            y_min=y_min, y_max=y_max, seconds=self.history_seconds,
-            bg=self.colors['chart_bg'], grid=self.colors['chart_grid'],
-            label=label, label_color=self.colors['fg'],
-            smoothing=self.smoothing_style,
-            legends=[('CPU Temp', self.colors['danger']), ('GPU Temp', self.colors['warning'])]
-        )
-        self.graphs['temp_tab'].pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            return 32, 230, 'Temperature (°F)'
+        return 0, 110, 'Temperature (°C)'
+
+    def update_temp_tab_graph(self):
+        if 'temp_tab' not in self.graphs:
+            return  # Not built yet; it will pick up the unit when first shown
+        y_min, y_max, label = self._temp_axis()
+        self.graphs['temp_tab'].set_range(y_min, y_max, label)
+        self.update_graphs()
+
+    def shutdown(self):
+        """Stop background sampling and flush the log"""
+        self.render_scheduler.cancel()
+        if self.http_server is not None:
+            self.http_server.stop()
+        if self.aggregator is not None:
+            self.aggregator.stop()
+        self.sampler.stop()
+        if self.process_sampler is not None:
+            self.process_sampler.stop()
+        try:
+            self.log_writer.close()
+        except Exception as e:
+            print(f"Error closing log: {e}")
+        if self.rollup is not None:
+            self.rollup.close()
+
+    def on_close(self):
+        """Shut down and close the window"""
+        self.shutdown()
+        self.root.destroy()
 
     def reset_log(self):
-        log_path = os.path.join(os.path.dirname(__file__), 'sysintel_log.csv')
         try:
-            if os.path.exists(log_path):
-                with open(log_path, 'w', encoding='utf-8') as f:
-                    f.write('ts,cpu,mem,gpu,ct,gt,fan,disk_io\n')
+            self.log_writer.reset()
             self.status_label.config(text="Log reset!", fg=self.colors['success'])
         except Exception as e:
             self.status_label.config(text=f"Error resetting log: {e}", fg=self.colors['danger'])
 
-def base36encode(number):
-    """Convert an integer to a base36 string."""
-    if not isinstance(number, int):
-        raise TypeError('number must be an integer')
-    if number < 0:
-        raise ValueError('number must be positive')
-    alphabet = '0123456789abcdefghijklmnopqrstuvwxyz'
-    if number == 0:
-        return '0'
-    base36 = ''
-    while number:
-        number, i = divmod(number, 36)
-        base36 = alphabet[i] + base36
-    return base36
-
 def run_gui():
     root = tk.Tk()
     app = SysIntelGUI(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        # Also covers Ctrl+C in the console; shutdown is safe to repeat
+        app.shutdown()
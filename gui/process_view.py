@@ -0,0 +1,126 @@
+import tkinter as tk
+from tkinter import ttk
+
+from monitor.processes import top_rows
+
+class VirtualTable(tk.Frame):
+    """Sortable table that only materializes the rows on screen.
+
+    The canvas holds one text item per visible cell, created when the size
+    changes; scrolling and new data only re-text those items (skipping
+    cells whose text is unchanged), so the cost of a refresh depends on
+    the window height, not on how many rows there are. Only the rows up to
+    the end of the visible window are ordered (a heap for the usual
+    descending sorts).
+    """
+
+    def __init__(self, parent, columns, colors, sort_column=0, descending=True, row_height=20, **kwargs):
+        super().__init__(parent, bg=colors['bg'], **kwargs)
+        self.columns = columns  # [(title, key index, width, anchor, formatter), ...]
+        self.colors = colors
+        self.sort_column = sort_column
+        self.descending = descending
+        self.row_height = row_height
+        self.rows = []
+        self.offset = 0
+        self._visible = 0
+        self._cells = []  # [[text item per column] per visible row]
+        self._texts = {}  # (row, column) -> text currently shown
+        self._headers = []
+        self.canvas = tk.Canvas(self, bg=colors['chart_bg'], highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind('<Configure>', lambda e: self._build())
+        self.canvas.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.scroll(-1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.scroll(1, 'units'))
+
+    def set_rows(self, rows):
+        """Show a new list of row tuples (kept by reference, never modified)"""
+        self.rows = rows
+        self.render()
+
+    def sort_by(self, column):
+        """Sort by a column; clicking the current one flips the direction"""
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = True
+        self._build_headers()
+        self.render()
+
+    def scroll(self, amount, what):
+        step = 3 if what == 'units' else max(1, self._visible - 1)
+        self._scroll_to(self.offset + int(amount) * step)
+
+    def _on_scrollbar(self, action, value, what=None):
+        if action == 'moveto':
+            self._scroll_to(int(float(value) * len(self.rows)))
+        else:
+            self.scroll(value, what)
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.rows) - self._visible))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def _x_positions(self):
+        x = 6
+        positions = []
+        for title, _, width, anchor, _ in self.columns:
+            positions.append(x + width - 12 if anchor == 'e' else x)
+            x += width
+        return positions
+
+    def _build_headers(self):
+        for item in self._headers:
+            self.canvas.delete(item)
+        self._headers = [self.canvas.create_rectangle(0, 0, 10000, self.row_height + 4, fill=self.colors['secondary'], outline='')]
+        for (title, key, width, anchor, _), x in zip(self.columns, self._x_positions()):
+            if key == self.sort_column:
+                title += ' ▼' if self.descending else ' ▲'
+            item = self.canvas.create_text(x, 2, anchor='ne' if anchor == 'e' else 'nw', text=title,
+                                           fill=self.colors['fg'], font=('Segoe UI', 10, 'bold'))
+            self.canvas.tag_bind(item, '<Button-1>', lambda e, key=key: self.sort_by(key))
+            self._headers.append(item)
+
+    def _build(self):
+        """(Re)create one text item per visible cell for the current height"""
+        h = self.canvas.winfo_height()
+        self.canvas.delete('all')
+        self._headers = []
+        self._build_headers()
+        top = self.row_height + 6
+        self._visible = max(0, (h - top) // self.row_height)
+        self._cells = []
+        self._texts = {}
+        positions = self._x_positions()
+        for r in range(self._visible):
+            y = top + r * self.row_height
+            if r % 2:
+                self.canvas.create_rectangle(0, y, 10000, y + self.row_height, fill=self.colors['secondary'], outline='')
+            self._cells.append([
+                self.canvas.create_text(x, y + 2, anchor='ne' if anchor == 'e' else 'nw', text='',
+                                        fill=self.colors['fg'], font=('Consolas', 10))
+                for (_, _, _, anchor, _), x in zip(self.columns, positions)
+            ])
+        self.render()
+
+    def render(self):
+        total = len(self.rows)
+        self.offset = max(0, min(self.offset, total - self._visible))
+        window = top_rows(self.rows, self.sort_column, self.offset + self._visible, self.descending)[self.offset:]
+        for r, items in enumerate(self._cells):
+            row = window[r] if r < len(window) else None
+            for c, item in enumerate(items):
+                text = '' if row is None else self.columns[c][4](row[self.columns[c][1]])
+                if self._texts.get((r, c)) != text:
+                    self._texts[(r, c)] = text
+                    self.canvas.itemconfig(item, text=text)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self._visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
@@ -0,0 +1,63 @@
+import time
+
+DEFAULT_MAX_FPS = 5
+
+class RenderScheduler:
+    """Coalesce graph redraws and skip the ones nobody can see.
+
+    ``request()`` marks every graph dirty and schedules a single render on
+    the Tk loop, no sooner than ``1 / max_fps`` after the previous one, so
+    the render rate is independent of the sampling rate. A render only
+    redraws graphs that are currently viewable (selected notebook tab,
+    window not minimized); the rest stay dirty and are drawn as soon as
+    they are shown.
+    """
+
+    def __init__(self, root, graphs, max_fps=DEFAULT_MAX_FPS):
+        self.root = root
+        self.graphs = graphs  # name -> graph widget; read live so replaced graphs are picked up
+        self.set_max_fps(max_fps)
+        self._dirty = set()
+        self._last_render = 0.0
+        self._pending = None
+        # Deiconify maps the toplevel again; catch up on whatever went stale
+        root.bind('<Map>', self._on_map, add='+')
+
+    def set_max_fps(self, max_fps):
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+
+    def request(self, names=None):
+        """Mark graphs (default: all) dirty and schedule a render"""
+        self._dirty.update(self.graphs if names is None else names)
+        if self._pending is not None:
+            return
+        delay = self._last_render + self.min_interval - time.monotonic()
+        self._pending = self.root.after(max(0, int(delay * 1000)), self._render)
+
+    def show(self):
+        """Render dirty graphs that became visible (tab switch, restore) right away"""
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+        self._render()
+
+    def cancel(self):
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+
+    def _on_map(self, event):
+        if event.widget is self.root and self._dirty:
+            self.show()
+
+    def _render(self):
+        self._pending = None
+        if self.root.state() == 'iconic':
+            return  # Everything stays dirty until the window is restored
+        self._last_render = time.monotonic()
+        for name in list(self._dirty):
+            graph = self.graphs.get(name)
+            if graph is None:
+                self._dirty.discard(name)
+            elif graph.winfo_viewable():
+                graph.redraw()
+                self._dirty.discard(name)
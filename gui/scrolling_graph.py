@@ -1,10 +1,19 @@
 import tkinter as tk
-import math
+import numpy as np
+
+from gui.graph_math import history_layout, history_trace, flat_coords
 
 class ScrollingGraph(tk.Canvas):
+    """Scrolling history graph drawn in retained mode.
+
+    Canvas items are created once per size (on <Configure>) and each redraw
+    only moves them with coords()/itemconfig(), so a tick never creates or
+    deletes Tk items.
+    """
+
     def __init__(self, parent, data_source, color, y_min, y_max, seconds=10, bg='#222', grid='#444', label='', label_color='#fff', smoothing='average', **kwargs):
         super().__init__(parent, bg=bg, highlightthickness=0, **kwargs)
-        self.data_source = data_source  # Should be a deque
+        self.data_source = data_source  # Should be a RingBuffer
         self.color = color
         self.y_min = y_min
         self.y_max = y_max
@@ -14,133 +23,146 @@ class ScrollingGraph(tk.Canvas):
         self.label = label
         self.label_color = label_color
         self.smoothing = smoothing  # 'none', 'average', 'round'
+        self._layout = None  # (w, h, y_min, y_max, seconds) the items were built for
+        self._axes_at = None  # left edge the grid/axes are placed at, or 'static'
+        self._hidden = set()
         self.bind('<Configure>', lambda e: self.redraw())
 
-    def redraw(self):
+    def set_range(self, y_min, y_max, label=None):
+        """Change the value range (and optionally the title) without recreating the widget"""
+        self.y_min = y_min
+        self.y_max = y_max
+        if label is not None:
+            self.label = label
+        self._layout = None  # Rebuild the items on the next redraw
+
+    def _build(self, w, h):
+        """(Re)create every item for the current size and range"""
         self.delete('all')
-        w = self.winfo_width()
-        h = self.winfo_height()
-        if w < 10 or h < 10:
-            return
-        # Draw scrolling grid (subtle)
-        data = list(self.data_source)
-        n = len(data)
-        valid_data = [v for v in data if v is not None and v != 0]
-        if n < 2 or not valid_data:
-            self._draw_static_grid(w, h)
-            if self.label:
-                self.create_text(10, 10, anchor='nw', text=self.label, fill=self.label_color, font=('Segoe UI', 12, 'bold'))
-            if n == 1 and valid_data:
-                # Draw a single point as a vertical line or dot at the right edge
-                v = data[-1]
-                x = w - 1
-                y = h - ((v - self.y_min) / (self.y_max - self.y_min)) * h
-                self.create_line(x, y-5, x, y+5, fill=self.color, width=2)
-            else:
-                self.create_text(w//2, h//2, text='N/A', fill=self.label_color, font=('Segoe UI', 24, 'bold'))
-            return
-        max_points = self.data_source.maxlen if hasattr(self.data_source, 'maxlen') and self.data_source.maxlen else n
-        time_per_point = self.seconds / (max_points - 1) if max_points > 1 else self.seconds
-        filled_seconds = time_per_point * (n - 1)
-        filled_width = w * (filled_seconds / self.seconds) if self.seconds > 0 else w
-        left_edge = w - filled_width
-        # Draw vertical grid lines (subtle)
+        self._layout = (w, h, self.y_min, self.y_max, self.seconds)
+        self._axes_at = None
+        self._hidden = set()
         grid_spacing = self.seconds / 10
+        self._vgrid = []
         for i in range(11):
-            t = i * grid_spacing
-            x = w - (t / self.seconds) * w
-            if x < left_edge:
-                continue
-            self.create_line(x, 0, x, h, fill=self.grid, width=1, stipple='gray25')
-        # Draw horizontal grid lines (subtle)
+            x = w - (i * grid_spacing / self.seconds) * w
+            self._vgrid.append((x, self.create_line(x, 0, x, h, fill=self.grid, width=1, stipple='gray25')))
+        self._hgrid = []
         for i in range(5):
             y = h * i // 4
-            self.create_line(left_edge, y, w, y, fill=self.grid, width=1, stipple='gray25')
-        # Draw label
+            self._hgrid.append((y, self.create_line(0, y, w, y, fill=self.grid, width=1, stipple='gray25')))
         if self.label:
             self.create_text(10, 10, anchor='nw', text=self.label, fill=self.label_color, font=('Segoe UI', 12, 'bold'))
-        # Interpolate data to one point per pixel (for smoothness)
-        interp_points = []
-        if w > 2:
-            if self.smoothing == 'average':
-                smooth_data = self._moving_average(data, window=3)
-            elif self.smoothing == 'round':
-                smooth_data = self._round_corners(data, window=3)
-            else:
-                smooth_data = data
-            for px in range(int(left_edge), w):
-                t = self.seconds * (w - px) / w
-                idx_float = (filled_seconds - t) / time_per_point if time_per_point > 0 else 0
-                idx0 = int(math.floor(idx_float))
-                idx1 = min(idx0 + 1, n - 1)
-                if idx0 < 0:
-                    v = smooth_data[0]
-                elif idx1 >= n:
-                    v = smooth_data[-1]
-                else:
-                    v0, v1 = smooth_data[idx0], smooth_data[idx1]
-                    frac = idx_float - idx0
-                    v = v0 + (v1 - v0) * frac
-                y = h - ((v - self.y_min) / (self.y_max - self.y_min)) * h
-                interp_points.append((px, y))
-        # Draw filled area under the line
-        if interp_points:
-            area = [(interp_points[0][0], h)] + interp_points + [(interp_points[-1][0], h)]
-            self.create_polygon(area, fill=self.color, outline='', stipple='gray50')
-            # Draw the line on top
-            for i in range(1, len(interp_points)):
-                self.create_line(interp_points[i-1][0], interp_points[i-1][1], interp_points[i][0], interp_points[i][1], fill=self.color, width=2)
-        # Draw y-axis labels
+        self._area = self.create_polygon(0, h, 0, h, 0, h, fill=self.color, outline='', stipple='gray50')
+        self._trace = self.create_line(0, h, 0, h, fill=self.color, width=2)
+        self._marker = self.create_line(0, 0, 0, 0, fill=self.color, width=2)
+        self._na = self.create_text(w//2, h//2, text='N/A', fill=self.label_color, font=('Segoe UI', 24, 'bold'))
+        for item in (self._area, self._trace, self._marker, self._na):
+            self._show(item, False)
+        self._ylabels = []
         for i in range(5):
             y_val = self.y_max - (self.y_max - self.y_min) * i / 4
             y = h * i // 4
-            self.create_text(left_edge + 5, y, anchor='nw', text=f'{y_val:.0f}', fill=self.label_color, font=('Consolas', 9))
-        # Draw x-axis labels
+            self._ylabels.append((y, self.create_text(5, y, anchor='nw', text=f'{y_val:.0f}', fill=self.label_color, font=('Consolas', 9))))
+        self._xlabels = []
         for i in range(6):
             t = self.seconds * i // 5
             x = w - (t / self.seconds) * w
-            if x < left_edge:
-                continue
             label = f'{self.seconds-t:.0f}s' if t > 0 else 'now'
-            self.create_text(x, h-2, anchor='sw', text=label, fill=self.label_color, font=('Consolas', 9))
+            self._xlabels.append((x, self.create_text(x, h-2, anchor='sw', text=label, fill=self.label_color, font=('Consolas', 9))))
 
-    def _moving_average(self, data, window=3):
-        n = len(data)
-        if n < 2:
-            return data
-        result = []
-        for i in range(n):
-            vals = [data[j] for j in range(max(0, i-window//2), min(n, i+window//2+1)) if data[j] is not None]
-            if vals:
-                result.append(sum(vals)/len(vals))
-            else:
-                result.append(0)
-        return result
+    def _show(self, item, visible):
+        """Show or hide an item, skipping the Tk call if nothing changes"""
+        if visible == (item not in self._hidden):
+            return
+        if visible:
+            self._hidden.discard(item)
+        else:
+            self._hidden.add(item)
+        self.itemconfig(item, state='normal' if visible else 'hidden')
 
-    def _round_corners(self, data, window=3):
-        # Simple corner rounding: replace sharp corners with average of neighbors if the difference is large
-        n = len(data)
-        if n < 3:
-            return data
-        result = list(data)
-        for i in range(1, n-1):
-            prev, curr, next_ = data[i-1], data[i], data[i+1]
-            if prev is not None and curr is not None and next_ is not None:
-                if abs(curr - prev) > abs(prev - next_) * 1.5 and abs(curr - next_) > abs(prev - next_) * 1.5:
-                    # If current is a sharp peak/valley, round it
-                    result[i] = (prev + next_) / 2
-        return result
+    def _place_axes(self, left_edge, w):
+        """Clip the grid and axis labels to the filled part of the graph"""
+        if self._axes_at == left_edge:
+            return
+        self._axes_at = left_edge
+        for x, item in self._vgrid:
+            self._show(item, x >= left_edge)
+        for y, item in self._hgrid:
+            self.coords(item, left_edge, y, w, y)
+        for y, item in self._ylabels:
+            self.coords(item, left_edge + 5, y)
+            self._show(item, True)
+        for x, item in self._xlabels:
+            self._show(item, x >= left_edge)
 
-    def _draw_static_grid(self, w, h):
-        for i in range(11):
-            x = w * i // 10
-            self.create_line(x, 0, x, h, fill=self.grid, width=1, stipple='gray25')
-        for i in range(5):
-            y = h * i // 4
-            self.create_line(0, y, w, y, fill=self.grid, width=1, stipple='gray25')
+    def _show_empty(self, w, h, value):
+        """Full static grid plus either a single-point marker or 'N/A'"""
+        if self._axes_at != 'static':
+            self._axes_at = 'static'
+            for i, (x, item) in enumerate(self._vgrid):
+                x = w * (10 - i) // 10
+                self.coords(item, x, 0, x, h)
+                self._show(item, True)
+            for y, item in self._hgrid:
+                self.coords(item, 0, y, w, y)
+            for _, item in self._ylabels + self._xlabels:
+                self._show(item, False)
+            self._show(self._area, False)
+            self._show(self._trace, False)
+        if value is not None:
+            # Draw a single point as a vertical line or dot at the right edge
+            x = w - 1
+            y = h - ((value - self.y_min) / (self.y_max - self.y_min)) * h
+            self.coords(self._marker, x, y-5, x, y+5)
+            self._show(self._marker, True)
+            self._show(self._na, False)
+        else:
+            self._show(self._marker, False)
+            self._show(self._na, True)
+
+    def redraw(self):
+        w = self.winfo_width()
+        h = self.winfo_height()
+        if w < 10 or h < 10:
+            return
+        if self._layout != (w, h, self.y_min, self.y_max, self.seconds):
+            self._build(w, h)
+        data = self.data_source.view()
+        n = len(data)
+        has_data = np.count_nonzero(data) > 0
+        if n < 2 or not has_data:
+            self._show_empty(w, h, float(data[-1]) if n == 1 and has_data else None)
+            return
+        if self._axes_at == 'static':
+            # Leaving the empty state: restore the vertical grid positions
+            for x, item in self._vgrid:
+                self.coords(item, x, 0, x, h)
+            self._show(self._marker, False)
+            self._show(self._na, False)
+        max_points = self.data_source.maxlen if hasattr(self.data_source, 'maxlen') and self.data_source.maxlen else n
+        time_per_point, filled_seconds, left_edge = history_layout(n, max_points, self.seconds, w)
+        self._place_axes(left_edge, w)
+        # One point per pixel column, or a min/max envelope for dense histories
+        xs = ()
+        if w > 2:
+            xs, ys = history_trace(data, self.seconds, time_per_point, filled_seconds, left_edge, w, h, self.y_min, self.y_max, self.smoothing)
+        if len(xs):
+            # Filled area under the line, with the line on top as one item
+            points = flat_coords(xs, ys)
+            self.coords(self._area, [points[0], h] + points + [points[-2], h])
+            self._show(self._area, True)
+            if len(xs) > 1:
+                self.coords(self._trace, points)
+                self._show(self._trace, True)
+            else:
+                self._show(self._trace, False)
+        else:
+            self._show(self._area, False)
+            self._show(self._trace, False)
 
     def start(self):
         self.redraw()
 
     def stop(self):
-        pass  # No-op for compatibility 
\ No newline at end of file
+        pass  # No-op for compatibility
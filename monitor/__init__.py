@@ -1 +1,20 @@
-from .system_stats import get_system_snapshot
+# Exports are imported on first use: importing monitor.sampler (or this
+# package) must not load the collectors and their asyncio machinery
+_EXPORTS = {
+    'get_system_snapshot': 'system_stats',
+    'CollectorScheduler': 'system_stats',
+    'AsyncCollectorScheduler': 'system_stats',
+    'enable_procfs_fast_path': 'system_stats',
+    'Sampler': 'sampler'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,174 @@
+"""Fixed-width binary log format.
+
+File layout (little-endian)::
+
+    magic       8s   b"SYSIBIN\\0"
+    version     u16
+    header_size u16  offset of the first record
+    record_size u16
+    ncols       u16
+    ncols x (name 8s, type 1s)   struct type code: I=u32, H=u16, B=u8
+    zero padding up to header_size
+
+followed by packed records. Readers take the column list from the header,
+so columns can be appended without breaking older files; the version is
+only bumped for incompatible changes.
+"""
+import csv
+import os
+import struct
+import sys
+
+from .log_writer import LogWriter, LOG_FIELDS, base36encode, base36decode
+
+MAGIC = b"SYSIBIN\0"
+VERSION = 1
+HEADER_ALIGN = 16
+
+# Column name -> struct type code, in record order
+BINARY_COLUMNS = [
+    ('ts', 'I'),
+    ('cpu', 'B'),
+    ('mem', 'B'),
+    ('gpu', 'B'),
+    ('ct', 'B'),
+    ('gt', 'B'),
+    ('fan', 'H'),
+    ('disk_io', 'B')
+]
+
+_PREAMBLE = struct.Struct('<8sHHHH')
+_COLUMN = struct.Struct('<8s1s')
+_LIMITS = {'B': 0xFF, 'H': 0xFFFF, 'I': 0xFFFFFFFF}
+_NUMPY_TYPES = {'B': 'u1', 'H': '<u2', 'I': '<u4'}
+
+def encode_header(columns=BINARY_COLUMNS):
+    body = b''.join(_COLUMN.pack(name.encode('ascii'), code.encode('ascii')) for name, code in columns)
+    size = _PREAMBLE.size + len(body)
+    header_size = (size + HEADER_ALIGN - 1) // HEADER_ALIGN * HEADER_ALIGN
+    record_size = struct.calcsize('<' + ''.join(code for _, code in columns))
+    preamble = _PREAMBLE.pack(MAGIC, VERSION, header_size, record_size, len(columns))
+    return (preamble + body).ljust(header_size, b'\0')
+
+def read_header(f):
+    """Return (version, columns, header_size, record_size) from an open binary log"""
+    preamble = f.read(_PREAMBLE.size)
+    if len(preamble) < _PREAMBLE.size:
+        raise ValueError("truncated binary log header")
+    magic, version, header_size, record_size, ncols = _PREAMBLE.unpack(preamble)
+    if magic != MAGIC:
+        raise ValueError("not a SysIntel binary log")
+    if version > VERSION:
+        raise ValueError(f"unsupported binary log version {version}")
+    columns = []
+    for _ in range(ncols):
+        name, code = _COLUMN.unpack(f.read(_COLUMN.size))
+        columns.append((name.rstrip(b'\0').decode('ascii'), code.decode('ascii')))
+    return version, columns, header_size, record_size
+
+def record_struct(columns):
+    return struct.Struct('<' + ''.join(code for _, code in columns))
+
+def numpy_dtype(columns):
+    """Packed NumPy structured dtype matching the record layout"""
+    import numpy as np
+    return np.dtype([(name, _NUMPY_TYPES[code]) for name, code in columns])
+
+class BinaryLogWriter(LogWriter):
+    """LogWriter that appends fixed-width binary records instead of CSV rows"""
+
+    def __init__(self, path, columns=BINARY_COLUMNS, **kwargs):
+        super().__init__(path, fields=[name for name, _ in columns], **kwargs)
+        self.columns = list(columns)
+        self._record = record_struct(self.columns)
+        self._limits = [_LIMITS[code] for _, code in self.columns]
+
+    def _open(self, truncate=False):
+        self._file = open(self.path, 'wb' if truncate else 'ab')
+        if self._file.tell() == 0:
+            self._file.write(encode_header(self.columns))
+            return
+        with open(self.path, 'rb') as f:
+            _, columns, header_size, record_size = read_header(f)
+        if columns != self.columns:
+            self._file.close()
+            self._file = None
+            raise ValueError(f"{self.path} has columns {columns}, expected {self.columns}")
+        # Drop a partial record left behind by a crash mid-write
+        excess = (self._file.tell() - header_size) % record_size
+        if excess:
+            self._file.truncate(self._file.tell() - excess)
+            self._file.seek(0, os.SEEK_END)
+
+    def _write_rows(self, rows):
+        pack = self._record.pack
+        limits = self._limits
+        fields = self.fields
+        self._file.write(b''.join(
+            pack(*[min(max(int(row[field]), 0), limit) for field, limit in zip(fields, limits)])
+            for row in rows))
+
+def open_binary_log(path):
+    """Memory-map a binary log as a NumPy structured array (no parsing)"""
+    import numpy as np
+    with open(path, 'rb') as f:
+        _, columns, header_size, record_size = read_header(f)
+        f.seek(0, os.SEEK_END)
+        count = (f.tell() - header_size) // record_size
+    dtype = numpy_dtype(columns)
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=header_size, shape=(count,))
+
+def iter_binary_log(path):
+    """Yield each record of a binary log as a dict (pure Python, no NumPy)"""
+    with open(path, 'rb') as f:
+        _, columns, header_size, record_size = read_header(f)
+        names = [name for name, _ in columns]
+        record = record_struct(columns)
+        f.seek(header_size)
+        while True:
+            chunk = f.read(record_size * 4096)
+            usable = len(chunk) - len(chunk) % record_size
+            for values in record.iter_unpack(chunk[:usable]):
+                yield dict(zip(names, values))
+            if len(chunk) < record_size * 4096:
+                break
+
+def csv_to_binary(csv_path, bin_path):
+    """Convert a CSV log to the binary format; returns the number of rows"""
+    writer = BinaryLogWriter(bin_path, flush_rows=4096)
+    writer.reset()
+    count = 0
+    with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if not row.get('ts'):
+                continue
+            row['ts'] = base36decode(row['ts'])
+            writer.write(row)
+            count += 1
+    writer.close()
+    return count
+
+def binary_to_csv(bin_path, csv_path, fields=LOG_FIELDS):
+    """Convert a binary log back to the CSV layout; returns the number of rows"""
+    count = 0
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        out = csv.writer(f)
+        out.writerow(fields)
+        for row in iter_binary_log(bin_path):
+            out.writerow([base36encode(row['ts'])] + [row.get(field, 0) for field in fields[1:]])
+            count += 1
+    return count
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 3 or argv[0] not in ('to-bin', 'to-csv'):
+        print("usage: python -m monitor.binlog to-bin|to-csv SOURCE DEST")
+        return 2
+    convert = csv_to_binary if argv[0] == 'to-bin' else binary_to_csv
+    print(f"Converted {convert(argv[1], argv[2])} rows")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Headless recording: collectors and logger without any GUI.
+
+Run with ``python -m sysintel --headless`` (or ``run.py --headless``).
+Nothing here imports tkinter or NumPy, so it is cheap enough to leave
+running permanently on a server.
+"""
+import argparse
+import signal
+import threading
+import time
+
+from .log_writer import create_log_writer, make_log_row, DEFAULT_LOG_BASE, LOG_FORMATS, FSYNC_MODES
+from .metrics import MetricsTracker
+from .sampler import Sampler
+
+class LogRecorder:
+    """Sampler listener that writes every sample to a log writer"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.tracker = MetricsTracker()
+        self.rows = 0
+        self.flush_requested = False
+
+    def __call__(self, ts, snapshot):
+        metrics = self.tracker.update(ts, snapshot)
+        self.writer.write(make_log_row(ts, snapshot, metrics['disk_io_utilization']))
+        self.rows += 1
+        if self.flush_requested:
+            # Flush on the sampler thread; the writer isn't shared across threads
+            self.flush_requested = False
+            self.writer.flush()
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog='sysintel', description="SysIntel system monitor")
+    parser.add_argument('--headless', action='store_true', help="record stats to the log without opening a window")
+    headless = parser.add_argument_group("headless options")
+    headless.add_argument('--interval', type=int, default=1000, help="sampling interval in milliseconds (default 1000)")
+    headless.add_argument('--log-path', default=DEFAULT_LOG_BASE, help="log path; the extension for --format is added if missing")
+    headless.add_argument('--format', choices=tuple(LOG_FORMATS), default='csv', help="log format (default csv)")
+    headless.add_argument('--rotation', choices=('none', 'hourly', 'daily'), default='none', help="split the log into time-bounded segments")
+    headless.add_argument('--fsync', choices=FSYNC_MODES, default='none', help="log durability (default none)")
+    headless.add_argument('--duration', type=float, default=0, help="stop after this many seconds (default: run until signalled)")
+    headless.add_argument('--proc-fast-path', action='store_true', help="read hot Linux counters directly from /proc")
+    headless.add_argument('--http-port', type=int, default=None, help="serve /metrics (Prometheus) and /json on this port")
+    headless.add_argument('--http-host', default='127.0.0.1', help="address for --http-port (default 127.0.0.1)")
+    headless.add_argument('--agent', metavar='HOST[:PORT]', help="also stream samples to a SysIntel aggregator")
+    headless.add_argument('--agent-name', help="name to report to the aggregator (default: this machine's hostname)")
+    return parser
+
+def _log_base(path):
+    for extension in LOG_FORMATS.values():
+        if path.endswith(extension):
+            return path[:-len(extension)]
+    return path
+
+def run_headless(args):
+    """Sample and log until ``args.duration`` elapses or SIGINT/SIGTERM arrives"""
+    if args.interval <= 0:
+        raise ValueError("interval must be positive")
+    if args.proc_fast_path:
+        from .system_stats import enable_procfs_fast_path
+        if not enable_procfs_fast_path():
+            print("/proc fast path unavailable; using psutil collectors")
+    writer = create_log_writer(_log_base(args.log_path), args.format, rotation=args.rotation, fsync=args.fsync)
+    recorder = LogRecorder(writer)
+    sampler = Sampler(args.interval, capacity=1)
+    sampler.add_listener(recorder)
+    http_server = None
+    if args.http_port is not None:
+        from .http_server import start_http_server
+        http_server = start_http_server(sampler, args.http_host, args.http_port)
+        host, port = http_server.address
+        print(f"Serving metrics on http://{host}:{port}/metrics")
+    agent = None
+    if args.agent:
+        from .remote import Agent, parse_address
+        address, port = parse_address(args.agent)
+        agent = Agent(address, port, name=args.agent_name, interval_ms=args.interval)
+        agent.start()
+        sampler.add_listener(agent)
+        print(f"Streaming to aggregator at {address}:{port} as {agent.name}")
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, request_stop)
+    if hasattr(signal, 'SIGHUP'):
+        # Flush buffered rows without stopping (e.g. before log shipping)
+        signal.signal(signal.SIGHUP, lambda signum, frame: setattr(recorder, 'flush_requested', True))
+    started = time.monotonic()
+    print(f"Recording every {args.interval} ms to {args.log_path} ({args.format}); Ctrl+C to stop")
+    sampler.start()
+    try:
+        while not stop.is_set():
+            if args.duration:
+                remaining = args.duration - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                # Short waits keep the main thread responsive to signals on every platform
+                stop.wait(min(remaining, 1.0))
+            else:
+                stop.wait(1.0)
+    finally:
+        if http_server is not None:
+            http_server.stop()
+        sampler.stop()
+        if agent is not None:
+            agent.stop()
+        writer.close()
+    print(f"Stopped after {time.monotonic() - started:.1f}s, {recorder.rows} rows logged")
+    return 0
@@ -0,0 +1,166 @@
+"""Serve the latest snapshot over HTTP (Prometheus text and JSON).
+
+The exporter is a sampler listener: it renders both response bodies once
+per sample, on the sampler thread, and swaps them in with a single
+assignment. Request handlers only send the cached bytes, so a scrape never
+runs a collector and costs the same however many scrapers there are.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .metrics import MetricsTracker
+
+DEFAULT_HTTP_HOST = '127.0.0.1'
+DEFAULT_HTTP_PORT = 9464
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+JSON_CONTENT_TYPE = 'application/json'
+
+# (name, type, help, getter) for the unlabelled samples
+_GAUGES = [
+    ('cpu_usage_percent', 'gauge', "CPU usage", lambda s, m: s['cpu']['usage']),
+    ('cpu_frequency_mhz', 'gauge', "CPU frequency", lambda s, m: s['cpu']['frequency']),
+    ('cpu_temperature_celsius', 'gauge', "CPU temperature", lambda s, m: s['cpu']['temperature']),
+    ('memory_usage_percent', 'gauge', "Memory usage", lambda s, m: s['memory']['percent']),
+    ('memory_used_bytes', 'gauge', "Memory in use", lambda s, m: s['memory']['used']),
+    ('memory_total_bytes', 'gauge', "Installed memory", lambda s, m: s['memory']['total']),
+    ('gpu_usage_percent', 'gauge', "GPU usage", lambda s, m: s['gpu']['usage']),
+    ('gpu_temperature_celsius', 'gauge', "GPU temperature", lambda s, m: s['gpu']['temperature']),
+    ('gpu_power_watts', 'gauge', "GPU power draw", lambda s, m: s['gpu']['power']),
+    ('gpu_memory_used_bytes', 'gauge', "GPU memory in use", lambda s, m: s['gpu']['memory_used'] * 1024 * 1024),
+    ('disk_read_bytes_per_second', 'gauge', "Disk read rate", lambda s, m: m['disk_read_speed'] * 1024 * 1024),
+    ('disk_write_bytes_per_second', 'gauge', "Disk write rate", lambda s, m: m['disk_write_speed'] * 1024 * 1024),
+    ('disk_io_utilization_percent', 'gauge', "Share of time the disks were busy", lambda s, m: m['disk_io_utilization']),
+    ('disk_read_bytes_total', 'counter', "Bytes read from disk", lambda s, m: s['disk_io']['total_read_bytes']),
+    ('disk_written_bytes_total', 'counter', "Bytes written to disk", lambda s, m: s['disk_io']['total_write_bytes']),
+    ('network_received_bytes_total', 'counter', "Bytes received on all adapters", lambda s, m: s['network']['total_recv']),
+    ('network_sent_bytes_total', 'counter', "Bytes sent on all adapters", lambda s, m: s['network']['total_sent']),
+]
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _number(value):
+    try:
+        return repr(float(value))
+    except (TypeError, ValueError):
+        return 'NaN'
+
+def _family(lines, name, kind, help_text, samples):
+    """Append one metric family; ``samples`` is a list of (labels, value)"""
+    name = 'sysintel_' + name
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples:
+        if labels:
+            label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {_number(value)}")
+        else:
+            lines.append(f"{name} {_number(value)}")
+
+def render_prometheus(ts, snapshot, metrics):
+    """Prometheus text exposition of one snapshot"""
+    lines = []
+    _family(lines, 'sample_timestamp_seconds', 'gauge', "Unix time the snapshot was taken", [({}, ts)])
+    for name, kind, help_text, getter in _GAUGES:
+        try:
+            value = getter(snapshot, metrics)
+        except (KeyError, TypeError):
+            continue  # Collector fell back to a shape without this field
+        _family(lines, name, kind, help_text, [({}, value)])
+    per_core = snapshot.get('cpu', {}).get('per_core', [])
+    if per_core:
+        _family(lines, 'cpu_core_usage_percent', 'gauge', "Usage per logical CPU",
+                [({'core': str(core)}, usage) for core, usage in enumerate(per_core)])
+    fans = snapshot.get('fans', {})
+    fan_samples = [({'fan': 'cpu'}, fans.get('cpu', 0)), ({'fan': 'gpu'}, fans.get('gpu', 0))]
+    fan_samples += [({'fan': f'system{i}'}, speed) for i, speed in enumerate(fans.get('system', []))]
+    _family(lines, 'fan_speed_rpm', 'gauge', "Fan speed", fan_samples)
+    partitions = snapshot.get('disk', {}).get('partitions', [])
+    _family(lines, 'filesystem_used_bytes', 'gauge', "Space in use per mounted partition",
+            [({'mountpoint': p['mountpoint'], 'device': p['device']}, p['used']) for p in partitions])
+    _family(lines, 'filesystem_size_bytes', 'gauge', "Size of each mounted partition",
+            [({'mountpoint': p['mountpoint'], 'device': p['device']}, p['total']) for p in partitions])
+    _family(lines, 'collector_stale', 'gauge', "1 while a collector is past its deadline and serving its last good value",
+            [({'collector': name}, 1) for name in snapshot.get('stale', [])])
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+def render_json(ts, snapshot, metrics):
+    return json.dumps({'ts': ts, 'metrics': metrics, 'snapshot': snapshot}, default=str).encode('utf-8')
+
+class MetricsExporter:
+    """Sampler listener that keeps pre-serialized responses for the latest sample"""
+
+    def __init__(self):
+        self.tracker = MetricsTracker()
+        self.bodies = None  # (prometheus bytes, json bytes); replaced, never mutated
+
+    def __call__(self, ts, snapshot):
+        metrics = self.tracker.update(ts, snapshot)
+        self.bodies = (render_prometheus(ts, snapshot, metrics), render_json(ts, snapshot, metrics))
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'SysIntel'
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path not in ('/metrics', '/json'):
+            self._send(404, 'text/plain; charset=utf-8', b"Not found; try /metrics or /json\n")
+            return
+        bodies = self.server.exporter.bodies
+        if bodies is None:
+            self._send(503, 'text/plain; charset=utf-8', b"No sample collected yet\n")
+        elif path == '/metrics':
+            self._send(200, PROMETHEUS_CONTENT_TYPE, bodies[0])
+        else:
+            self._send(200, JSON_CONTENT_TYPE, bodies[1])
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # One line per scrape would drown out everything else
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent scrapers,
+    # which then stall for a full SYN retransmit
+    request_queue_size = 128
+
+class MetricsHTTPServer:
+    """Background HTTP server for a MetricsExporter (localhost by default)"""
+
+    def __init__(self, exporter, host=DEFAULT_HTTP_HOST, port=DEFAULT_HTTP_PORT):
+        self.exporter = exporter
+        self._server = _Server((host, port), _Handler)
+        self._server.exporter = exporter
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address[:2]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="SysIntelHTTP", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+def start_http_server(sampler, host=DEFAULT_HTTP_HOST, port=DEFAULT_HTTP_PORT):
+    """Export ``sampler``'s samples over HTTP and return the running server"""
+    exporter = MetricsExporter()
+    server = MetricsHTTPServer(exporter, host, port)
+    sampler.add_listener(exporter)
+    server.start()
+    return server
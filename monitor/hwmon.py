@@ -0,0 +1,154 @@
+import glob
+import os
+import platform
+import re
+import threading
+
+HWMON_ROOT = "/sys/class/hwmon"
+
+# hwmon chip names that report CPU package/die and GPU temperatures
+CPU_CHIPS = ("coretemp", "k10temp", "k8temp", "zenpower", "cpu_thermal", "soc_thermal")
+GPU_CHIPS = ("amdgpu", "radeon", "nouveau")
+# Preferred CPU temperature labels, best first
+CPU_TEMP_LABELS = ("Package id 0", "Tctl", "Tdie")
+
+def _read_text(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+def _channel_number(path):
+    match = re.search(r'(\d+)_input$', path)
+    return int(match.group(1)) if match else 0
+
+def _channel_key(path):
+    match = re.search(r'(\d+)$', path)
+    return int(match.group(1)) if match else 0
+
+def _classify(kind, chip, label):
+    lowered = label.lower()
+    if kind == 'temp':
+        if chip in CPU_CHIPS:
+            return 'cpu'
+        if chip in GPU_CHIPS:
+            return 'gpu'
+        return None
+    if 'cpu' in lowered:
+        return 'cpu'
+    if 'gpu' in lowered or chip in GPU_CHIPS:
+        return 'gpu'
+    return 'system'
+
+class HwmonSensors:
+    """Read temperatures and fan speeds from Linux hwmon sysfs.
+
+    Sensor files are discovered once and kept open; every read is a single
+    ``os.pread`` per sensor instead of a glob plus open/read/close.
+    """
+
+    def __init__(self, root=HWMON_ROOT):
+        self.root = root
+        self.temps = []
+        self.fans = []
+        self.discover()
+
+    def discover(self):
+        """(Re)scan the hwmon tree and open every temp/fan input file"""
+        self.close()
+        for chip_dir in sorted(glob.glob(os.path.join(self.root, 'hwmon*')), key=_channel_key):
+            chip = _read_text(os.path.join(chip_dir, 'name'))
+            for kind, sensors in (('temp', self.temps), ('fan', self.fans)):
+                paths = sorted(glob.glob(os.path.join(chip_dir, f'{kind}*_input')), key=_channel_number)
+                for path in paths:
+                    label = _read_text(path[:-len('_input')] + '_label') or f'{kind}{_channel_number(path)}'
+                    try:
+                        fd = os.open(path, os.O_RDONLY)
+                    except OSError:
+                        continue
+                    sensors.append({
+                        "chip": chip,
+                        "label": label,
+                        "role": _classify(kind, chip, label),
+                        "fd": fd
+                    })
+
+    def close(self):
+        """Close all open sensor file descriptors"""
+        for sensor in self.temps + self.fans:
+            try:
+                os.close(sensor["fd"])
+            except OSError:
+                pass
+        self.temps = []
+        self.fans = []
+
+    def _read(self, sensor):
+        try:
+            return int(os.pread(sensor["fd"], 32, 0))
+        except (OSError, ValueError):
+            # Sensor went away or is not ready; treat as missing this tick
+            return None
+
+    def temperatures(self):
+        """Return (chip, label, role, celsius) for every readable temperature"""
+        readings = []
+        for sensor in self.temps:
+            value = self._read(sensor)
+            if value is not None:
+                readings.append((sensor["chip"], sensor["label"], sensor["role"], value / 1000.0))
+        return readings
+
+    def cpu_temperature(self):
+        """Return the CPU package temperature in °C, or 0 if unavailable"""
+        return self._role_temperature('cpu', CPU_TEMP_LABELS)
+
+    def gpu_temperature(self):
+        """Return the GPU temperature in °C, or 0 if unavailable"""
+        return self._role_temperature('gpu', ("edge", "junction"))
+
+    def _role_temperature(self, role, preferred_labels):
+        values = {}
+        for sensor in self.temps:
+            if sensor["role"] != role:
+                continue
+            value = self._read(sensor)
+            if value is not None:
+                values[sensor["label"]] = value / 1000.0
+        for label in preferred_labels:
+            if label in values:
+                return values[label]
+        return max(values.values()) if values else 0
+
+    def fan_speeds(self):
+        """Return fan speeds in RPM grouped like get_fan_speeds()"""
+        fans = {
+            "cpu": 0,
+            "gpu": 0,
+            "system": []
+        }
+        for sensor in self.fans:
+            value = self._read(sensor)
+            if value is None:
+                continue
+            if sensor["role"] == 'system':
+                fans["system"].append(value)
+            elif not fans[sensor["role"]]:
+                fans[sensor["role"]] = value
+        return fans
+
+_sensors = None
+_probed = False
+_probe_lock = threading.Lock()  # Collectors may probe concurrently from pipeline workers
+
+def get_hwmon_sensors():
+    """Return the shared HwmonSensors, or None when hwmon is not available"""
+    global _sensors, _probed
+    if not _probed:
+        with _probe_lock:
+            if not _probed:
+                if platform.system() == "Linux" and os.path.isdir(HWMON_ROOT):
+                    _sensors = HwmonSensors()
+                _probed = True
+    return _sensors
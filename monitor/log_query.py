@@ -0,0 +1,264 @@
+"""Time-range queries over recorded logs.
+
+``query()`` reads CSV logs, binary logs and segmented logs (via their
+``.index.json``), streaming matching rows in batches instead of loading
+the whole file. CSV logs get a sparse ``<log>.tsidx`` sidecar mapping
+timestamps to byte offsets so a query seeks close to ``t_start`` instead
+of scanning from the top. Timestamps are assumed non-decreasing, which
+holds unless the system clock is stepped backwards while logging.
+"""
+import bisect
+import gzip
+import os
+import struct
+
+from .log_writer import LOG_FIELDS, DEFAULT_LOG_BASE
+
+# Bytes of CSV between sparse index entries
+INDEX_STRIDE = 64 * 1024
+_INDEX_MAGIC = b"SYSITSX1"
+_INDEX_HEADER = struct.Struct('<8sQ')
+_INDEX_ENTRY = struct.Struct('<QQ')
+_READ_SIZE = 1024 * 1024
+
+class SparseIndex:
+    """Sparse timestamp -> byte offset index for a CSV log.
+
+    One entry is kept per ``stride`` bytes of log, found by seeking to each
+    stride boundary and reading the next full row, so building it never
+    parses the whole file. New entries are appended as the log grows.
+    """
+
+    def __init__(self, csv_path, stride=INDEX_STRIDE):
+        self.csv_path = csv_path
+        self.path = csv_path + '.tsidx'
+        self.stride = stride
+        self.timestamps = []
+        self.offsets = []
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                magic, stride = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+                if magic != _INDEX_MAGIC or stride != self.stride:
+                    return
+                for ts, offset in _INDEX_ENTRY.iter_unpack(f.read()):
+                    self.timestamps.append(ts)
+                    self.offsets.append(offset)
+        except (OSError, struct.error):
+            self.timestamps, self.offsets = [], []
+
+    def refresh(self):
+        """Index any part of the log written since the last refresh"""
+        size = os.path.getsize(self.csv_path)
+        with open(self.csv_path, 'rb') as f:
+            if self.offsets and not self._still_valid(f, size):
+                # Log was reset or replaced; start over
+                self.timestamps, self.offsets = [], []
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+            new_entries = []
+            position = self.offsets[-1] + self.stride if self.offsets else 0
+            while position < size:
+                f.seek(position)
+                # Skip the header, or the partial row we landed in
+                f.readline()
+                row_offset = f.tell()
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    ts = int(line.split(b',', 1)[0], 36)
+                except ValueError:
+                    position += self.stride
+                    continue
+                new_entries.append((ts, row_offset))
+                position = max(position + self.stride, row_offset + 1)
+        if new_entries:
+            write_header = not os.path.exists(self.path)
+            with open(self.path, 'ab') as out:
+                if write_header:
+                    out.write(_INDEX_HEADER.pack(_INDEX_MAGIC, self.stride))
+                out.write(b''.join(_INDEX_ENTRY.pack(ts, offset) for ts, offset in new_entries))
+            for ts, offset in new_entries:
+                self.timestamps.append(ts)
+                self.offsets.append(offset)
+
+    def _still_valid(self, f, size):
+        offset = self.offsets[-1]
+        if offset >= size:
+            return False
+        f.seek(offset)
+        try:
+            return int(f.readline().split(b',', 1)[0], 36) == self.timestamps[-1]
+        except ValueError:
+            return False
+
+    def seek_offset(self, t_start):
+        """Byte offset at or before the first row with ts >= t_start"""
+        i = bisect.bisect_left(self.timestamps, t_start) - 1
+        return self.offsets[i] if i >= 0 else 0
+
+def _column_indexes(header, metrics):
+    names = header.decode('utf-8').strip().split(',')
+    return [names.index(metric) for metric in metrics]
+
+def _scan_csv(f, metrics, t_start, t_end, batch_rows, start_offset=0):
+    header = f.readline()
+    columns = _column_indexes(header, metrics)
+    if start_offset:
+        f.seek(start_offset)
+    batch = []
+    remainder = b''
+    while True:
+        chunk = f.read(_READ_SIZE)
+        if not chunk:
+            break
+        lines = (remainder + chunk).split(b'\n')
+        remainder = lines.pop()
+        for line in lines:
+            fields = line.split(b',')
+            try:
+                ts = int(fields[0], 36)
+            except ValueError:
+                continue
+            if ts < t_start:
+                continue
+            if ts > t_end:
+                if batch:
+                    yield batch
+                return
+            batch.append((ts,) + tuple(int(fields[i]) for i in columns))
+            if len(batch) >= batch_rows:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def _query_csv(path, metrics, t_start, t_end, batch_rows):
+    index = SparseIndex(path)
+    index.refresh()
+    with open(path, 'rb') as f:
+        yield from _scan_csv(f, metrics, t_start, t_end, batch_rows, index.seek_offset(t_start))
+
+def _query_gzip_csv(path, metrics, t_start, t_end, batch_rows):
+    # Compressed segments cannot seek; they are small enough to stream
+    with gzip.open(path, 'rb') as f:
+        yield from _scan_csv(f, metrics, t_start, t_end, batch_rows)
+
+def _query_binary(path, metrics, t_start, t_end, batch_rows):
+    from .binlog import open_binary_log
+    yield from _query_records(open_binary_log(path), metrics, t_start, t_end, batch_rows)
+
+def _query_binary_gzip(path, metrics, t_start, t_end, batch_rows):
+    # Decompressed in memory: a live temporary file can't be reopened by name on Windows
+    import io
+    import numpy as np
+    from .binlog import read_header, numpy_dtype
+    with gzip.open(path, 'rb') as f:
+        data = f.read()
+    _, columns, header_size, record_size = read_header(io.BytesIO(data))
+    count = (len(data) - header_size) // record_size
+    records = np.frombuffer(data, dtype=numpy_dtype(columns), count=count, offset=header_size)
+    yield from _query_records(records, metrics, t_start, t_end, batch_rows)
+
+def _query_records(records, metrics, t_start, t_end, batch_rows):
+    import numpy as np
+    lo = int(np.searchsorted(records['ts'], t_start, side='left'))
+    hi = int(np.searchsorted(records['ts'], t_end, side='right'))
+    for start in range(lo, hi, batch_rows):
+        chunk = records[start:min(start + batch_rows, hi)]
+        yield list(zip(*([chunk['ts'].tolist()] + [chunk[metric].tolist() for metric in metrics])))
+
+def _query_segments(index_path, metrics, t_start, t_end, batch_rows):
+    from .log_segments import load_segment_index
+    directory = os.path.dirname(index_path)
+    prefix = os.path.basename(index_path)[:-len('.index.json')]
+    for entry in load_segment_index(directory, prefix):
+        # A segment with no recorded range (still open, or left by a crashed
+        # run) is scanned; its own rows decide what matches
+        if entry['first_ts'] is not None and entry['first_ts'] > t_end:
+            continue
+        # An open segment's last_ts is only as fresh as the last index save
+        if not entry['open'] and entry['last_ts'] is not None and entry['last_ts'] < t_start:
+            continue
+        yield from _query_file(os.path.join(directory, entry['file']), metrics, t_start, t_end, batch_rows)
+
+def _query_file(path, metrics, t_start, t_end, batch_rows):
+    if path.endswith('.index.json'):
+        return _query_segments(path, metrics, t_start, t_end, batch_rows)
+    if path.endswith('.bin'):
+        return _query_binary(path, metrics, t_start, t_end, batch_rows)
+    if path.endswith('.bin.gz'):
+        return _query_binary_gzip(path, metrics, t_start, t_end, batch_rows)
+    if path.endswith('.gz'):
+        return _query_gzip_csv(path, metrics, t_start, t_end, batch_rows)
+    return _query_csv(path, metrics, t_start, t_end, batch_rows)
+
+def _downsample(batches, t_start, step, nmetrics):
+    """Fold raw rows into (bucket_start, min, max, mean, ...) per ``step`` seconds"""
+    bucket = None
+    out = []
+    for batch in batches:
+        for row in batch:
+            key = (row[0] - t_start) // step
+            if key != bucket:
+                if bucket is not None:
+                    out.append(_finish_bucket(t_start + bucket * step, mins, maxs, sums, count))
+                bucket = key
+                mins = list(row[1:])
+                maxs = list(row[1:])
+                sums = list(row[1:])
+                count = 1
+                continue
+            for i in range(nmetrics):
+                value = row[i + 1]
+                if value < mins[i]:
+                    mins[i] = value
+                if value > maxs[i]:
+                    maxs[i] = value
+                sums[i] += value
+            count += 1
+        if out:
+            yield out
+            out = []
+    if bucket is not None:
+        yield [_finish_bucket(t_start + bucket * step, mins, maxs, sums, count)]
+
+def _finish_bucket(ts, mins, maxs, sums, count):
+    row = [ts]
+    for low, high, total in zip(mins, maxs, sums):
+        row.extend((low, high, total / count))
+    return tuple(row)
+
+def _to_numpy(batches, names):
+    import numpy as np
+    dtype = np.dtype([(name, 'i8' if name == 'ts' else 'f8') for name in names])
+    for batch in batches:
+        yield np.array(batch, dtype=dtype)
+
+def query(metrics, t_start, t_end, step=None, path=None, as_numpy=False, batch_rows=65536):
+    """Stream log rows with ``t_start <= ts <= t_end`` in batches.
+
+    ``metrics`` is a column name or list of names from LOG_FIELDS; ``path``
+    is a .csv/.bin log (optionally .gz) or a segment ``.index.json`` and
+    defaults to the GUI's CSV log. Each batch is a list of
+    ``(ts, metric, ...)`` tuples, or a NumPy structured array when
+    ``as_numpy`` is set. With ``step`` (seconds) rows are downsampled to
+    ``(bucket_start, m_min, m_max, m_mean, ...)`` per bucket.
+    """
+    if isinstance(metrics, str):
+        metrics = [metrics]
+    for metric in metrics:
+        if metric not in LOG_FIELDS[1:]:
+            raise ValueError(f"unknown metric {metric!r}")
+    path = path or DEFAULT_LOG_BASE + '.csv'
+    batches = _query_file(path, metrics, int(t_start), int(t_end), batch_rows)
+    names = ['ts'] + list(metrics)
+    if step:
+        batches = _downsample(batches, int(t_start), int(step), len(metrics))
+        names = ['ts'] + [f'{metric}_{agg}' for metric in metrics for agg in ('min', 'max', 'mean')]
+    if as_numpy:
+        batches = _to_numpy(batches, names)
+    return batches
@@ -0,0 +1,256 @@
+import gzip
+import json
+import os
+import shutil
+import struct
+import threading
+import time
+
+from .log_writer import LOG_FORMATS, LogWriter, base36decode
+
+# Rotation period name -> seconds per segment (periods are aligned to UTC)
+ROTATIONS = {
+    'hourly': 3600,
+    'daily': 86400
+}
+
+class SegmentedLogWriter:
+    """Write the log as a series of time-bounded segments.
+
+    A new segment starts at every rotation boundary or once the current one
+    reaches ``max_segment_bytes``. ``<prefix>.index.json`` records each
+    segment's file, first/last timestamp and row count so old data stays
+    addressable. Closed segments can be gzipped, and retention by age and
+    total size deletes the oldest ones. Same write/flush/close/reset
+    interface as LogWriter.
+    """
+
+    def __init__(self, directory, prefix='sysintel_log', log_format='csv', rotation='daily', max_segment_bytes=64 * 1024 * 1024, compress=False, max_age_days=None, max_total_bytes=None, **writer_kwargs):
+        if rotation not in ROTATIONS:
+            raise ValueError(f"rotation must be one of {tuple(ROTATIONS)}")
+        self.directory = directory
+        self.prefix = prefix
+        self.log_format = log_format
+        self.period = ROTATIONS[rotation]
+        self.max_segment_bytes = max_segment_bytes
+        self.compress = compress
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        self.writer_kwargs = writer_kwargs
+        self.index_path = os.path.join(directory, f'{prefix}.index.json')
+        self._lock = threading.Lock()
+        self._writer = None
+        self._entry = None
+        self._period_start = None
+        self._compressing = set()  # Files being gzipped; retention leaves them alone
+        os.makedirs(directory, exist_ok=True)
+        self.segments = self._load_index()
+        self._resume()
+
+    def write(self, row):
+        ts = int(row['ts'])
+        if self._writer is None or ts - ts % self.period != self._period_start or self._writer.tell() >= self.max_segment_bytes:
+            self._roll(ts)
+        written = self._writer.tell()
+        self._writer.write(row)
+        entry = self._entry
+        if entry['first_ts'] is None:
+            entry['first_ts'] = ts
+        entry['last_ts'] = ts
+        entry['rows'] += 1
+        if self._writer.tell() != written:
+            # The writer just flushed its batch: keep the index in step with
+            # the file so queries and retention see the live segment
+            entry['bytes'] = self._writer.tell()
+            self._save_index()
+
+    def flush(self):
+        if self._writer is not None:
+            self._writer.flush()
+            self._entry['bytes'] = self._writer.tell()
+        self._save_index()
+
+    def close(self):
+        if self._writer is not None:
+            # Compress inline: a background thread could be cut off at exit
+            self._close_segment(background=False)
+        self._save_index()
+
+    def reset(self):
+        """Delete every segment and start over with an empty index"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._entry = None
+        with self._lock:
+            for entry in self.segments:
+                self._remove(entry)
+            self.segments = []
+        self._save_index()
+
+    def segment_path(self, entry):
+        return os.path.join(self.directory, entry['file'])
+
+    def _new_writer(self, path):
+        if self.log_format == 'binary':
+            from .binlog import BinaryLogWriter
+            return BinaryLogWriter(path, **self.writer_kwargs)
+        return LogWriter(path, **self.writer_kwargs)
+
+    def _roll(self, ts):
+        if self._writer is not None:
+            self._close_segment()
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.gmtime(ts))
+        name = f'{self.prefix}-{stamp}{LOG_FORMATS[self.log_format]}'
+        suffix = 1
+        while any(os.path.exists(os.path.join(self.directory, candidate)) for candidate in (name, name + '.gz')):
+            name = f'{self.prefix}-{stamp}-{suffix}{LOG_FORMATS[self.log_format]}'
+            suffix += 1
+        self._entry = {'file': name, 'first_ts': None, 'last_ts': None, 'rows': 0, 'bytes': 0, 'compressed': False, 'open': True}
+        with self._lock:
+            self.segments.append(self._entry)
+        self._writer = self._new_writer(self.segment_path(self._entry))
+        self._period_start = ts - ts % self.period
+        self._apply_retention()
+        self._save_index()
+
+    def _close_segment(self, background=True):
+        self._writer.close()
+        entry = self._entry
+        entry['bytes'] = os.path.getsize(self.segment_path(entry))
+        entry['open'] = False
+        self._writer = None
+        self._entry = None
+        if self.compress and background:
+            # Compress off the caller's thread; the index is updated when done
+            with self._lock:
+                self._compressing.add(entry['file'])
+            threading.Thread(target=self._compress, args=(entry,), daemon=True).start()
+        elif self.compress:
+            self._compress(entry)
+
+    def _compress(self, entry):
+        source = self.segment_path(entry)
+        target = source + '.gz'
+        try:
+            with open(source, 'rb') as src, gzip.open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(source)
+        except Exception as e:
+            print(f"Error compressing log segment {source}: {e}")
+            # Don't leave a partial .gz outside the index
+            try:
+                os.remove(target)
+            except OSError:
+                pass
+            with self._lock:
+                self._compressing.discard(entry['file'])
+            return
+        with self._lock:
+            self._compressing.discard(entry['file'])
+            if entry not in self.segments:
+                # Retention dropped the segment while it was being compressed
+                os.remove(target)
+                return
+            entry['file'] += '.gz'
+            entry['bytes'] = os.path.getsize(target)
+            entry['compressed'] = True
+        # Retention skipped this segment while it was in flight
+        self._apply_retention()
+        self._save_index()
+
+    def _apply_retention(self):
+        with self._lock:
+            # A segment being compressed is deleted once its .gz is in the index
+            closed = [entry for entry in self.segments if not entry['open'] and entry['file'] not in self._compressing]
+            expired = []
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                expired = [entry for entry in closed if entry['last_ts'] is not None and entry['last_ts'] < cutoff]
+            if self.max_total_bytes is not None:
+                total = sum(entry['bytes'] for entry in self.segments if entry not in expired)
+                for entry in closed:
+                    if total <= self.max_total_bytes:
+                        break
+                    if entry not in expired:
+                        expired.append(entry)
+                        total -= entry['bytes']
+            for entry in expired:
+                self._remove(entry)
+                self.segments.remove(entry)
+
+    def _remove(self, entry):
+        try:
+            os.remove(self.segment_path(entry))
+        except FileNotFoundError:
+            pass
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)['segments']
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Error loading log index: {e}")
+            return []
+
+    def _save_index(self):
+        with self._lock:
+            data = json.dumps({'version': 1, 'segments': self.segments}, indent=1)
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+            os.replace(tmp_path, self.index_path)
+
+    def _resume(self):
+        """Close out a segment left open by a previous run"""
+        for entry in self.segments:
+            if entry['open'] or (entry['first_ts'] is None and not entry['compressed']):
+                entry['open'] = False
+                path = self.segment_path(entry)
+                if os.path.exists(path):
+                    entry['bytes'] = os.path.getsize(path)
+                    # The index may predate the last rows the crashed run wrote
+                    try:
+                        entry['first_ts'], entry['last_ts'], entry['rows'] = _scan_segment(path)
+                    except (OSError, ValueError) as e:
+                        print(f"Error reading log segment {path}: {e}")
+                    if self.compress:
+                        self._compress(entry)
+        self._save_index()
+
+def _scan_segment(path):
+    """(first_ts, last_ts, rows) of an uncompressed segment, read from the file itself"""
+    if path.endswith(LOG_FORMATS['binary']):
+        from .binlog import read_header
+        with open(path, 'rb') as f:
+            _, columns, header_size, record_size = read_header(f)
+            if columns[0][0] != 'ts':
+                raise ValueError("first column is not ts")
+            ts_format = '<' + columns[0][1]
+            rows = (os.fstat(f.fileno()).st_size - header_size) // record_size
+            if rows == 0:
+                return None, None, 0
+            f.seek(header_size)
+            (first_ts,) = struct.unpack_from(ts_format, f.read(record_size))
+            f.seek(header_size + (rows - 1) * record_size)
+            (last_ts,) = struct.unpack_from(ts_format, f.read(record_size))
+        return first_ts, last_ts, rows
+    with open(path, 'rb') as f:
+        f.readline()  # Header
+        first = f.readline()
+        if not first.endswith(b'\n'):
+            return None, None, 0
+        rows = 1 + sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+        # The last complete row: a crash can leave a partial line after it
+        f.seek(max(0, f.tell() - 4096))
+        last = f.read().split(b'\n')[-2]
+    first_ts = base36decode(first.split(b',', 1)[0].decode('ascii'))
+    last_ts = base36decode(last.split(b',', 1)[0].decode('ascii'))
+    return first_ts, last_ts, rows
+
+def load_segment_index(directory, prefix='sysintel_log'):
+    """Return the segment list recorded in ``<prefix>.index.json``"""
+    with open(os.path.join(directory, f'{prefix}.index.json'), 'r') as f:
+        return json.load(f)['segments']
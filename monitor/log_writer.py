@@ -0,0 +1,146 @@
+import csv
+import os
+import time
+
+# Default log location (extension added per format); historically next to the GUI
+DEFAULT_LOG_BASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gui', 'sysintel_log')
+
+# Compact log columns: base36 timestamp plus rounded integer metrics
+LOG_FIELDS = ['ts', 'cpu', 'mem', 'gpu', 'ct', 'gt', 'fan', 'disk_io']
+
+# Durability modes: 'none' leaves syncing to the OS, 'periodic' fsyncs
+# at most every fsync_interval seconds (and on close)
+FSYNC_MODES = ('none', 'periodic')
+
+def base36encode(number):
+    """Convert an integer to a base36 string."""
+    if not isinstance(number, int):
+        raise TypeError('number must be an integer')
+    if number < 0:
+        raise ValueError('number must be positive')
+    alphabet = '0123456789abcdefghijklmnopqrstuvwxyz'
+    if number == 0:
+        return '0'
+    base36 = ''
+    while number:
+        number, i = divmod(number, 36)
+        base36 = alphabet[i] + base36
+    return base36
+
+def base36decode(text):
+    """Convert a base36 string back to an integer."""
+    return int(text, 36)
+
+def make_log_row(ts, stats, disk_util):
+    """Build one log row (integer values, unix timestamp) from a snapshot"""
+    return {
+        'ts': int(ts),
+        'cpu': int(round(stats['cpu']['usage'])),
+        'mem': int(round(stats['memory']['percent'])),
+        'gpu': int(round(stats['gpu']['usage'])),
+        'ct': int(round(stats['cpu']['temperature'])),
+        'gt': int(round(stats['gpu']['temperature'])),
+        'fan': int(round(stats['fans']['cpu'])),
+        'disk_io': int(round(disk_util))
+    }
+
+class LogWriter:
+    """Append log rows to a file that stays open, batching writes in memory.
+
+    Rows are buffered and written out when ``flush_rows`` are pending or
+    ``flush_interval`` seconds have passed since the last flush, and always
+    on ``flush()``/``close()``.
+    """
+
+    def __init__(self, path, fields=LOG_FIELDS, flush_rows=50, flush_interval=5.0, fsync='none', fsync_interval=30.0):
+        if fsync not in FSYNC_MODES:
+            raise ValueError(f"fsync must be one of {FSYNC_MODES}")
+        self.path = path
+        self.fields = list(fields)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._pending = []
+        self._file = None
+        self._last_flush = time.monotonic()
+        self._last_fsync = self._last_flush
+
+    def write(self, row):
+        """Queue one row dict; flushes when a size or time threshold is hit"""
+        self._pending.append(row)
+        if len(self._pending) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write all pending rows to the file"""
+        now = time.monotonic()
+        self._last_flush = now
+        if not self._pending:
+            return
+        if self._file is None:
+            self._open()
+        rows, self._pending = self._pending, []
+        self._write_rows(rows)
+        self._file.flush()
+        if self.fsync == 'periodic' and now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def close(self):
+        """Flush pending rows and close the file"""
+        self.flush()
+        if self._file is not None:
+            if self.fsync == 'periodic':
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def tell(self):
+        """Bytes written to the file so far (pending rows not included)"""
+        if self._file is not None:
+            return self._file.tell()
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def reset(self):
+        """Discard pending rows and truncate the log back to its header"""
+        self._pending = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._open(truncate=True)
+        self._file.flush()
+
+    def _open(self, truncate=False):
+        self._file = open(self.path, 'w' if truncate else 'a', newline='', encoding='utf-8')
+        self._csv = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._csv.writerow(self.fields)
+
+    def _write_rows(self, rows):
+        self._csv.writerows([base36encode(row['ts'])] + [row[field] for field in self.fields[1:]] for row in rows)
+
+# Supported log formats and their file extensions
+LOG_FORMATS = {
+    'csv': '.csv',
+    'binary': '.bin'
+}
+
+def create_log_writer(base_path, log_format='csv', rotation='none', **kwargs):
+    """Open a log writer for ``base_path`` plus the extension of ``log_format``.
+
+    With ``rotation`` set to 'hourly' or 'daily' the log is split into
+    segments next to ``base_path`` (see SegmentedLogWriter); segment options
+    such as ``compress`` or ``max_age_days`` are passed through ``kwargs``.
+    """
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"log_format must be one of {tuple(LOG_FORMATS)}")
+    if rotation != 'none':
+        from .log_segments import SegmentedLogWriter
+        directory, prefix = os.path.split(base_path)
+        return SegmentedLogWriter(directory or '.', prefix, log_format, rotation, **kwargs)
+    path = base_path + LOG_FORMATS[log_format]
+    if log_format == 'binary':
+        from .binlog import BinaryLogWriter
+        return BinaryLogWriter(path, **kwargs)
+    return LogWriter(path, **kwargs)
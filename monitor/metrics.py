@@ -0,0 +1,72 @@
+# Per-sample values kept as history (graphs, rollups); temperatures in °C
+HISTORY_METRICS = [
+    'cpu_usage',
+    'memory_usage',
+    'gpu_usage',
+    'gpu_temp',
+    'cpu_temp',
+    'fan_speeds',
+    'disk_read_speed',
+    'disk_write_speed',
+    'disk_io_utilization'
+]
+
+class MetricsTracker:
+    """Turn successive snapshots into the per-sample history metrics.
+
+    Disk speeds and utilization are rates, so the tracker keeps the
+    previous sample's counters and timestamp.
+    """
+
+    def __init__(self):
+        self.prev_ts = None
+        self.prev_disk_io = None  # Track previous disk I/O for speed calculation
+        self.prev_disk_busy_time = None  # Track previous disk busy time for utilization calculation
+
+    def reset(self):
+        self.__init__()
+
+    def update(self, ts, stats):
+        """Return a dict of HISTORY_METRICS values for the snapshot taken at ``ts``"""
+        # Average of all fans
+        fan_speeds = [stats['fans']['cpu'], stats['fans']['gpu']] + stats['fans']['system']
+        avg_fan_speed = sum(fan_speeds) / len(fan_speeds) if fan_speeds else 0
+
+        disk_io = stats['disk_io']
+        total_busy_time = sum(disk['read_time'] + disk['write_time'] for disk in disk_io['disks'])
+        # Calculate speeds in MB/s based on difference from previous measurement
+        if self.prev_disk_io is not None:
+            # Use the real time between samples; the sampler may drift
+            time_diff = ts - self.prev_ts
+            read_diff = disk_io['total_read_bytes'] - self.prev_disk_io['total_read_bytes']
+            write_diff = disk_io['total_write_bytes'] - self.prev_disk_io['total_write_bytes']
+
+            read_speed = (read_diff / (1024 * 1024)) / time_diff if time_diff > 0 else 0
+            write_speed = (write_diff / (1024 * 1024)) / time_diff if time_diff > 0 else 0
+
+            # Disk utilization: percentage of time the disks were busy
+            # (busy time is in milliseconds, time_diff in seconds)
+            busy_time_diff = total_busy_time - self.prev_disk_busy_time
+            time_diff_ms = time_diff * 1000
+            utilization = min(100, (busy_time_diff / time_diff_ms) * 100) if time_diff_ms > 0 else 0
+        else:
+            read_speed = 0
+            write_speed = 0
+            utilization = 0
+
+        # Store current values for next calculation
+        self.prev_ts = ts
+        self.prev_disk_io = disk_io
+        self.prev_disk_busy_time = total_busy_time
+
+        return {
+            'cpu_usage': stats['cpu']['usage'],
+            'memory_usage': stats['memory']['percent'],
+            'gpu_usage': stats['gpu']['usage'],
+            'gpu_temp': stats['gpu']['temperature'],
+            'cpu_temp': stats['cpu']['temperature'],
+            'fan_speeds': avg_fan_speed,
+            'disk_read_speed': read_speed,
+            'disk_write_speed': write_speed,
+            'disk_io_utilization': utilization
+        }
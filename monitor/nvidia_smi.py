@@ -0,0 +1,130 @@
+import atexit
+import shutil
+import subprocess
+import threading
+import time
+
+# nvidia-smi query fields, in output order, and the gpu_info key each fills
+QUERY_FIELDS = [
+    ("index", "index"),
+    ("name", "name"),
+    ("utilization.gpu", "usage"),
+    ("memory.used", "memory_used"),
+    ("memory.total", "memory_total"),
+    ("temperature.gpu", "temperature"),
+    ("clocks.gr", "frequency"),
+    ("clocks.mem", "memory_frequency"),
+    ("fan.speed", "fan_speed"),
+    ("power.draw", "power"),
+    ("power.limit", "max_tgp")
+]
+
+# Seconds to wait before trying to (re)start a missing or crashed nvidia-smi
+RESTART_DELAY = 30
+
+def parse_query_line(line):
+    """Parse one ``--format=csv,noheader,nounits`` line into a GPU record"""
+    values = [v.strip() for v in line.split(",")]
+    if len(values) != len(QUERY_FIELDS):
+        return None
+    record = {}
+    for (field, key), value in zip(QUERY_FIELDS, values):
+        if key == "name":
+            record[key] = value
+            continue
+        try:
+            record[key] = int(value) if key == "index" else float(value)
+        except ValueError:
+            # "[N/A]" / "[Not Supported]" for sensors the board lacks
+            if key == "index":
+                return None
+            record[key] = 0
+    return record
+
+class NvidiaSmiStream:
+    """Keep one long-lived ``nvidia-smi -lms`` child and parse its output.
+
+    A reader thread consumes the CSV stream line by line and keeps the
+    latest record per GPU, so collectors read cached values instead of
+    spawning a new nvidia-smi process every tick.
+    """
+
+    def __init__(self, interval_ms=500, executable="nvidia-smi"):
+        self.interval_ms = interval_ms
+        self.executable = executable
+        self._records = {}
+        self._lock = threading.Lock()
+        self._process = None
+        self._thread = None
+
+    def command(self, path):
+        query = ",".join(field for field, _ in QUERY_FIELDS)
+        return [path, f"--query-gpu={query}", "--format=csv,noheader,nounits", "-lms", str(self.interval_ms)]
+
+    def start(self):
+        """Spawn nvidia-smi; return False if it is not installed"""
+        path = shutil.which(self.executable)
+        if not path:
+            return False
+        try:
+            self._process = subprocess.Popen(self.command(path), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL, text=True, bufsize=1)
+        except OSError as e:
+            print(f"Error starting nvidia-smi: {e}")
+            return False
+        with self._lock:
+            # A restarted child may see different GPUs (or number them differently)
+            self._records = {}
+        self._thread = threading.Thread(target=self._read, args=(self._process,), name="SysIntelNvidiaSmi", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Terminate the nvidia-smi child"""
+        process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def is_running(self):
+        return self._process is not None and self._process.poll() is None
+
+    def gpus(self):
+        """Return the latest record for each GPU, ordered by index"""
+        with self._lock:
+            return [self._records[i] for i in sorted(self._records)]
+
+    def _read(self, process):
+        for line in process.stdout:
+            record = parse_query_line(line)
+            if record is None:
+                continue
+            with self._lock:
+                if process is not self._process:
+                    break  # Replaced by a restart; don't mix in old readings
+                self._records[record["index"]] = record
+        process.stdout.close()
+
+_stream = None
+_next_start = 0
+
+def get_nvidia_stream(interval_ms=500):
+    """Return the shared running NvidiaSmiStream, or None if unavailable"""
+    global _stream, _next_start
+    if _stream is not None and _stream.is_running():
+        return _stream
+    now = time.monotonic()
+    if now < _next_start:
+        return None
+    _next_start = now + RESTART_DELAY
+    if _stream is None:
+        _stream = NvidiaSmiStream(interval_ms)
+        atexit.register(stop_nvidia_stream)
+    return _stream if _stream.start() else None
+
+def stop_nvidia_stream():
+    """Stop the shared NvidiaSmiStream, if one was started"""
+    if _stream is not None:
+        _stream.stop()
@@ -0,0 +1,181 @@
+"""Per-process table that stays cheap with thousands of processes.
+
+``psutil.Process`` objects are cached across ticks, so a tick reads only
+the counters it needs (CPU times, RSS, I/O) inside ``oneshot()``; names
+and users are read once per process. Busy processes and the current top
+N are refreshed every tick, idle ones in a rotating 1/``cold_every``
+slice, so their rates are averaged over a few ticks instead of being
+re-read every time. A process is identified by (pid, create time): when a
+sampled PID turns out to belong to a newer process, its entry is replaced.
+"""
+import heapq
+import time
+from operator import itemgetter
+
+import psutil
+
+# Row layout: one tuple per process
+PID, NAME, USER, CPU, MEMORY, READ_RATE, WRITE_RATE = range(7)
+COLUMN_NAMES = ('pid', 'name', 'user', 'cpu', 'memory', 'read_rate', 'write_rate')
+
+DEFAULT_TOP_N = 10
+DEFAULT_COLD_EVERY = 4
+
+class _Entry:
+    __slots__ = ('process', 'create_time', 'name', 'user', 'cpu_time', 'io', 'sampled', 'row', 'hot', 'io_denied')
+
+    def __init__(self, process):
+        self.process = process
+        try:
+            self.create_time = process.create_time()  # Read when the handle was made, then cached
+        except psutil.AccessDenied:
+            self.create_time = None
+        self.name = ''
+        self.user = ''
+        self.cpu_time = None
+        self.io = None  # (read_bytes, write_bytes) at ``sampled``
+        self.sampled = None
+        self.row = None
+        self.hot = True
+        self.io_denied = False
+
+def top_rows(rows, column, n, descending=True):
+    """The first ``n`` rows ordered by ``column``; a heap when n is small"""
+    key = itemgetter(column)
+    if descending and n < len(rows) // 8:
+        return heapq.nlargest(n, rows, key=key)
+    return sorted(rows, key=key, reverse=descending)[:n]
+
+def _create_time(pid):
+    process = psutil.Process(pid)
+    try:
+        return process.create_time()
+    except psutil.AccessDenied:
+        return None
+
+class ProcessTable:
+    """Incrementally refreshed rows for every running process"""
+
+    def __init__(self, top_n=DEFAULT_TOP_N, cold_every=DEFAULT_COLD_EVERY):
+        self.top_n = top_n
+        self.cold_every = max(1, cold_every)
+        self.cpu_count = psutil.cpu_count() or 1
+        self._entries = {}  # pid -> _Entry of the process with that pid and entry.create_time
+        self._tick = 0
+        self.last_cost = 0.0
+
+    def refresh(self):
+        """Update the table; returns a dict usable as a Sampler snapshot.
+
+        ``rows`` is a new list every call, so readers on other threads can
+        keep it; ``top`` maps cpu/memory/io to the top-N rows and ``cost``
+        is the time this refresh took in seconds.
+        """
+        start = time.perf_counter()
+        now = time.monotonic()
+        self._tick += 1
+        pids = psutil.pids()
+        live = set(pids)
+        for pid in [pid for pid in self._entries if pid not in live]:
+            del self._entries[pid]
+        rows = []
+        refreshed = 0
+        for pid in pids:
+            entry = self._entries.get(pid)
+            new = entry is None
+            if new:
+                try:
+                    entry = self._entries[pid] = self._new_entry(pid)
+                except psutil.Error:
+                    continue  # Exited before we got to it
+            elif not entry.hot and (pid + self._tick) % self.cold_every:
+                rows.append(entry.row)
+                continue
+            sampled = self._sample(entry, now, check_identity=not new)
+            if sampled is None:
+                # PID reused: nothing carries over to the new process
+                try:
+                    entry = self._entries[pid] = self._new_entry(pid)
+                except psutil.Error:
+                    del self._entries[pid]
+                    continue
+                sampled = self._sample(entry, now, check_identity=False)
+            if not sampled:
+                del self._entries[pid]
+                continue
+            refreshed += 1
+            rows.append(entry.row)
+        top = {
+            'cpu': heapq.nlargest(self.top_n, rows, key=itemgetter(CPU)),
+            'memory': heapq.nlargest(self.top_n, rows, key=itemgetter(MEMORY)),
+            'io': heapq.nlargest(self.top_n, rows, key=lambda row: row[READ_RATE] + row[WRITE_RATE])
+        }
+        # The top N stay on the every-tick path even when they go quiet
+        for group in top.values():
+            for row in group:
+                entry = self._entries.get(row[PID])
+                if entry is not None:
+                    entry.hot = True
+        self.last_cost = time.perf_counter() - start
+        return {'rows': rows, 'top': top, 'count': len(rows), 'refreshed': refreshed, 'cost': self.last_cost}
+
+    def _new_entry(self, pid):
+        process = psutil.Process(pid)
+        entry = _Entry(process)
+        self._read_identity(entry)
+        return entry
+
+    @staticmethod
+    def _read_identity(entry):
+        with entry.process.oneshot():
+            try:
+                entry.name = entry.process.name()
+            except psutil.AccessDenied:
+                entry.name = ''
+            try:
+                entry.user = entry.process.username()
+            except (psutil.AccessDenied, KeyError):
+                entry.user = ''  # Unknown uid or protected process
+
+    def _sample(self, entry, now, check_identity=True):
+        """Read one process's counters; False once it has exited, None if
+        its PID now belongs to a different process"""
+        process = entry.process
+        io = None
+        try:
+            # psutil caches create_time per handle, so check with a fresh one
+            if check_identity and _create_time(process.pid) != entry.create_time:
+                return None
+            with process.oneshot():
+                times = process.cpu_times()
+                rss = process.memory_info().rss
+                if not entry.io_denied:
+                    try:
+                        counters = process.io_counters()
+                        io = (counters.read_bytes, counters.write_bytes)
+                    except (psutil.AccessDenied, AttributeError):
+                        entry.io_denied = True  # Don't ask again every tick
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return False
+        except psutil.AccessDenied:
+            if entry.row is None:
+                entry.row = (process.pid, entry.name, entry.user, 0.0, 0, 0.0, 0.0)
+            entry.hot = False
+            return True
+        cpu_time = times.user + times.system
+        cpu = read_rate = write_rate = 0.0
+        has_baseline = entry.sampled is not None and entry.cpu_time is not None
+        if has_baseline:
+            elapsed = now - entry.sampled
+            if elapsed > 0:
+                cpu = (cpu_time - entry.cpu_time) / elapsed * 100 / self.cpu_count
+                if io is not None and entry.io is not None:
+                    read_rate = max(0, io[0] - entry.io[0]) / elapsed
+                    write_rate = max(0, io[1] - entry.io[1]) / elapsed
+        entry.cpu_time = cpu_time
+        entry.io = io
+        entry.sampled = now
+        entry.row = (process.pid, entry.name, entry.user, cpu, rss, read_rate, write_rate)
+        # Without a baseline there is no rate yet; sample again next tick
+        entry.hot = not has_baseline or cpu > 0 or read_rate > 0 or write_rate > 0
+        return True
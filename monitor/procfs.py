@@ -0,0 +1,175 @@
+import os
+
+PROC_ROOT = "/proc"
+DISK_SECTOR_SIZE = 512
+
+class ProcFile:
+    """A /proc file kept open and re-read with preadv into a reused buffer"""
+
+    def __init__(self, path, size=4096):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.buffer = bytearray(size)
+
+    def read(self):
+        """Re-read the whole file; returns the number of valid bytes in ``buffer``"""
+        while True:
+            n = os.preadv(self.fd, [self.buffer], 0)
+            if n < len(self.buffer):
+                return n
+            # File outgrew the buffer (more disks/interfaces); grow and retry
+            self.buffer = bytearray(len(self.buffer) * 2)
+
+    def close(self):
+        os.close(self.fd)
+
+def _meminfo_value(buffer, n, key):
+    start = buffer.find(key, 0, n)
+    if start < 0:
+        return None
+    end = buffer.find(b'\n', start, n)
+    return int(buffer[start + len(key):end].split()[0]) * 1024
+
+def _busy_idle(times):
+    """(total, idle) jiffies from one /proc/stat cpu line's fields"""
+    # user nice system idle iowait irq softirq steal guest guest_nice;
+    # guest time is already counted in user/nice
+    total = sum(times) - sum(times[8:10])
+    idle = times[3] + (times[4] if len(times) > 4 else 0)
+    return total, idle
+
+def _usage(last, total, idle):
+    if last is None:
+        return 0.0
+    total_delta = total - last[0]
+    if total_delta <= 0:
+        return 0.0
+    busy_delta = total_delta - (idle - last[1])
+    return round(min(100.0, max(0.0, busy_delta / total_delta * 100)), 1)
+
+class ProcfsCollector:
+    """Linux fast path for the hot per-tick metrics, read straight from /proc.
+
+    Produces the same dicts as the psutil-based collectors in
+    system_stats.py, without building psutil namedtuples every tick.
+    """
+
+    def __init__(self, proc_root=PROC_ROOT):
+        self.stat = ProcFile(os.path.join(proc_root, 'stat'))
+        self.meminfo = ProcFile(os.path.join(proc_root, 'meminfo'))
+        self.diskstats = ProcFile(os.path.join(proc_root, 'diskstats'))
+        self.net_dev = ProcFile(os.path.join(proc_root, 'net', 'dev'))
+        self._last_cpu_times = None
+        self._last_core_times = {}  # core line index -> (total, idle)
+
+    def close(self):
+        for proc_file in (self.stat, self.meminfo, self.diskstats, self.net_dev):
+            proc_file.close()
+
+    def cpu_percent(self):
+        """System-wide CPU usage since the previous call, like psutil.cpu_percent()"""
+        n = self.stat.read()
+        buffer = self.stat.buffer
+        times = [int(v) for v in buffer[:buffer.find(b'\n', 0, n)].split()[1:]]
+        total, idle = _busy_idle(times)
+        last, self._last_cpu_times = self._last_cpu_times, (total, idle)
+        return _usage(last, total, idle)
+
+    def cpu_percents(self):
+        """(system-wide usage, [usage per logical CPU]) from one read of /proc/stat"""
+        usage = self.cpu_percent()
+        buffer = self.stat.buffer
+        per_core = []
+        start = buffer.find(b'\n') + 1
+        # The cpuN lines follow the aggregate "cpu" line
+        while buffer.startswith(b'cpu', start):
+            end = buffer.find(b'\n', start)
+            total, idle = _busy_idle([int(v) for v in buffer[start:end].split()[1:]])
+            core = len(per_core)
+            per_core.append(_usage(self._last_core_times.get(core), total, idle))
+            self._last_core_times[core] = (total, idle)
+            start = end + 1
+        return usage, per_core
+
+    def memory(self):
+        """Same layout as get_memory_detailed_info()"""
+        n = self.meminfo.read()
+        buffer = self.meminfo.buffer
+        total = _meminfo_value(buffer, n, b'MemTotal:')
+        available = _meminfo_value(buffer, n, b'MemAvailable:')
+        if available is None:
+            # Pre-3.14 kernels: approximate like free(1) did
+            available = sum(_meminfo_value(buffer, n, key) or 0 for key in (b'MemFree:', b'Buffers:', b'Cached:'))
+        used = total - available
+        return {
+            "total": total,
+            "used": used,
+            "available": available,
+            "percent": round(used / total * 100, 1) if total else 0,
+            "frequency": 0
+        }
+
+    def disk_io(self):
+        """Same layout as get_disk_io_stats()"""
+        disk_io = {
+            "total_read_bytes": 0,
+            "total_write_bytes": 0,
+            "total_read_count": 0,
+            "total_write_count": 0,
+            "read_speed_mbps": 0,
+            "write_speed_mbps": 0,
+            "io_utilization": 0,
+            "disks": []
+        }
+        n = self.diskstats.read()
+        for line in self.diskstats.buffer[:n].splitlines():
+            fields = line.split()
+            flen = len(fields)
+            # Same field layouts psutil accepts; see Documentation/iostats.txt
+            if flen == 15:
+                name = fields[3]
+                reads = int(fields[2])
+                read_sectors, read_time, writes = int(fields[5]), int(fields[6]), int(fields[7])
+                write_sectors, write_time = int(fields[9]), int(fields[10])
+            elif flen == 14 or flen >= 18:
+                name = fields[2]
+                reads, read_sectors, read_time = int(fields[3]), int(fields[5]), int(fields[6])
+                writes, write_sectors, write_time = int(fields[7]), int(fields[9]), int(fields[10])
+            elif flen == 7:
+                name = fields[2]
+                reads, read_sectors, writes, write_sectors = (int(v) for v in fields[3:7])
+                read_time = write_time = 0
+            else:
+                continue
+            disk = {
+                "name": name.decode(),
+                "read_bytes": read_sectors * DISK_SECTOR_SIZE,
+                "write_bytes": write_sectors * DISK_SECTOR_SIZE,
+                "read_count": reads,
+                "write_count": writes,
+                "read_time": read_time,
+                "write_time": write_time
+            }
+            disk_io["disks"].append(disk)
+            disk_io["total_read_bytes"] += disk["read_bytes"]
+            disk_io["total_write_bytes"] += disk["write_bytes"]
+            disk_io["total_read_count"] += reads
+            disk_io["total_write_count"] += writes
+        return disk_io
+
+    def network_io(self):
+        """Same layout as get_network_io_info()"""
+        n = self.net_dev.read()
+        sent = recv = 0
+        # Skip the two header lines
+        for line in self.net_dev.buffer[:n].splitlines()[2:]:
+            fields = line.split(b':', 1)[1].split()
+            recv += int(fields[0])
+            sent += int(fields[8])
+        return {
+            "total_sent": sent,
+            "total_recv": recv
+        }
+
+def procfs_available(proc_root=PROC_ROOT):
+    return all(os.path.exists(os.path.join(proc_root, name)) for name in ('stat', 'meminfo', 'diskstats', 'net/dev'))
@@ -0,0 +1,282 @@
+"""Stream snapshots from many hosts to one aggregator over TCP.
+
+An agent (``run.py --headless --agent HOST[:PORT]``) sends a JSON hello
+frame followed by one frame per sample, delta-encoded with monitor.wire;
+frames are length-prefixed and written back to back without waiting for
+replies. The aggregator accepts any
+number of agents on one asyncio loop and keeps each host's latest
+snapshot plus a ring of HISTORY_METRICS, which the GUI's Hosts tab reads.
+"""
+import asyncio
+import json
+import platform
+import struct
+import threading
+import time
+
+from .metrics import HISTORY_METRICS, MetricsTracker
+from .wire import SnapshotEncoder, SnapshotDecoder
+
+DEFAULT_AGENT_PORT = 9465
+DEFAULT_HOST_POINTS = 600  # 10 minutes at 1 Hz
+MAX_FRAME_BYTES = 1 << 20
+MAX_RECONNECT_DELAY = 30.0
+PROTOCOL_VERSION = 2  # 1 sent every sample as a JSON message
+
+_FRAME_HEADER = struct.Struct('>I')
+
+def encode_frame(payload):
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+async def read_frame(reader):
+    """Read one length-prefixed frame; raises IncompleteReadError at EOF"""
+    (length,) = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"frame of {length} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+    return await reader.readexactly(length)
+
+def encode_message(message):
+    return json.dumps(message, separators=(',', ':'), default=str).encode('utf-8')
+
+def decode_message(payload):
+    return json.loads(payload)
+
+def parse_address(text, default_port=DEFAULT_AGENT_PORT):
+    """'host', 'host:port' or '[v6 address]:port' -> (host, port)"""
+    if text.startswith('['):
+        host, _, rest = text[1:].partition(']')
+        return host, int(rest[1:]) if rest.startswith(':') else default_port
+    if text.count(':') == 1:
+        host, port = text.split(':')
+        return host, int(port)
+    return text, default_port
+
+class _LoopThread:
+    """Run one coroutine on a private event loop in a daemon thread"""
+
+    def __init__(self, name):
+        self.name = name
+        self.loop = None
+        self._thread = None
+        self._task = None
+
+    def start(self, coro_factory):
+        started = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            self._task = self.loop.create_task(coro_factory())
+            started.set()
+            try:
+                self.loop.run_until_complete(self._task)
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                print(f"Error in {self.name}: {e}")
+            finally:
+                self.loop.close()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop(self, timeout=2.0):
+        if self._thread is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._task.cancel)
+        except RuntimeError:
+            pass  # Loop already finished
+        self._thread.join(timeout)
+        self._thread = None
+
+class Agent:
+    """Stream samples to an aggregator.
+
+    Use it as a sampler listener: samples are handed to the agent's loop
+    and written without waiting for replies, so a slow link never stalls
+    sampling. A full queue drops its oldest sample; a lost connection is
+    retried with exponential backoff.
+    """
+
+    def __init__(self, address, port=DEFAULT_AGENT_PORT, name=None, interval_ms=1000, queue_size=64):
+        self.address = address
+        self.port = port
+        self.name = name or platform.node()
+        self.interval_ms = interval_ms
+        self.queue_size = queue_size
+        self.connected = False
+        self.sent = 0
+        self.dropped = 0
+        self._loop = None
+        self._queue = None
+        self._runner = None
+
+    def __call__(self, ts, snapshot):
+        # Sampler thread: hand the sample over to the agent's loop
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self.submit, ts, snapshot)
+
+    def submit(self, ts, snapshot):
+        """Queue a sample (call on the agent's loop)"""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait((ts, snapshot))
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self.queue_size)
+        delay = 1.0
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.address, self.port)
+            except OSError as e:
+                print(f"Agent cannot reach {self.address}:{self.port} ({e}); retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                continue
+            delay = 1.0
+            self.connected = True
+            try:
+                await self._stream(writer)
+            except (OSError, ConnectionError) as e:
+                print(f"Agent lost connection to {self.address}:{self.port}: {e}")
+            finally:
+                self.connected = False
+                writer.close()
+
+    async def _stream(self, writer):
+        # Each connection starts from a keyframe
+        encoder = SnapshotEncoder()
+        writer.write(encode_frame(encode_message({
+            'type': 'hello', 'host': self.name, 'interval_ms': self.interval_ms,
+            'version': PROTOCOL_VERSION, 'codec': 'delta'
+        })))
+        while True:
+            samples = [await self._queue.get()]
+            while not self._queue.empty():
+                samples.append(self._queue.get_nowait())
+            # Pipelined: write every queued sample, then wait for the buffer once
+            for ts, snapshot in samples:
+                writer.write(encode_frame(encoder.encode(ts, snapshot)))
+            await writer.drain()
+            self.sent += len(samples)
+
+    def start(self):
+        self._runner = _LoopThread("SysIntelAgent")
+        self._runner.start(self.run)
+
+    def stop(self):
+        self._loop = None  # Stop accepting samples before the loop closes
+        if self._runner is not None:
+            self._runner.stop()
+            self._runner = None
+
+class HostHistory:
+    """Latest snapshot and metric history for one agent.
+
+    Written only on the aggregator loop; readers on other threads see the
+    newest sample at worst one tick late.
+    """
+
+    def __init__(self, name, points=DEFAULT_HOST_POINTS):
+        from utils import RingBuffer  # NumPy; agents never build a HostHistory
+        self.name = name
+        self.history = {key: RingBuffer(points) for key in HISTORY_METRICS}
+        self.tracker = MetricsTracker()
+        self.interval_ms = 1000
+        self.latest = None  # (ts, snapshot)
+        self.metrics = None
+        self.connected = False
+        self.last_seen = None  # time.time() of the last frame
+        self.samples = 0
+
+    @property
+    def seconds(self):
+        """Time span the history rings cover at this host's interval"""
+        return self.history['cpu_usage'].maxlen * self.interval_ms / 1000
+
+    def add(self, ts, snapshot):
+        self.metrics = self.tracker.update(ts, snapshot)
+        for key, value in self.metrics.items():
+            self.history[key].append(value, ts)
+        self.latest = (ts, snapshot)
+        self.last_seen = time.time()
+        self.samples += 1
+
+class Aggregator:
+    """Accept agent connections and keep per-host history"""
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_AGENT_PORT, points=DEFAULT_HOST_POINTS):
+        self.host = host
+        self.port = port
+        self.points = points
+        self.hosts = {}  # name -> HostHistory; entries are added, never removed
+        self.address = None
+        self._error = None
+        self._ready = threading.Event()
+        self._runner = None
+
+    async def serve(self):
+        try:
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            return
+        self.address = server.sockets[0].getsockname()[:2]
+        self._ready.set()
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        host = None
+        try:
+            hello = decode_message(await read_frame(reader))
+            if hello.get('type') != 'hello' or not hello.get('host'):
+                raise ValueError("expected a hello frame")
+            name = str(hello['host'])
+            host = self.hosts.get(name)
+            if host is None:
+                host = self.hosts[name] = HostHistory(name, self.points)
+            host.interval_ms = hello.get('interval_ms') or host.interval_ms
+            host.connected = True
+            if hello.get('codec') == 'delta':
+                decoder = SnapshotDecoder()
+                while True:
+                    host.add(*decoder.decode(await read_frame(reader)))
+            # Version 1 agents send JSON messages
+            while True:
+                message = decode_message(await read_frame(reader))
+                if message.get('type') == 'sample':
+                    host.add(message['ts'], message['snapshot'])
+        except asyncio.IncompleteReadError:
+            pass  # Agent disconnected
+        except (OSError, ValueError, KeyError) as e:
+            peer = writer.get_extra_info('peername')
+            print(f"Dropping agent {host.name if host else peer}: {e}")
+        finally:
+            if host is not None:
+                host.connected = False
+            writer.close()
+
+    def host_list(self):
+        """Known hosts sorted by name (safe to call from any thread)"""
+        return [self.hosts[name] for name in sorted(list(self.hosts))]
+
+    def start(self, timeout=5.0):
+        """Serve on a background thread; returns once the port is bound"""
+        self._runner = _LoopThread("SysIntelAggregator")
+        self._runner.start(self.serve)
+        if not self._ready.wait(timeout):
+            raise OSError(f"aggregator could not listen on {self.host}:{self.port}")
+        if self._error is not None:
+            self._runner = None
+            raise self._error
+
+    def stop(self):
+        if self._runner is not None:
+            self._runner.stop()
+            self._runner = None
@@ -0,0 +1,183 @@
+"""Multi-resolution rollup store for long-term history (RRD style).
+
+Every tier is a fixed-size ring of buckets in a preallocated file, so disk
+usage never grows. Each bucket keeps min/max/avg/last per metric plus the
+bucket start time and sample count. A sample updates exactly one bucket
+per tier (O(1)), and a read for a window touches only the buckets of the
+finest tier that still covers it.
+"""
+import json
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+from .metrics import HISTORY_METRICS, MetricsTracker
+from .log_writer import DEFAULT_LOG_BASE
+
+DEFAULT_ROLLUP_DIR = os.path.join(os.path.dirname(DEFAULT_LOG_BASE), 'sysintel_rollup')
+
+# (bucket seconds, retention seconds) per tier; a step of None means the
+# raw tier, whose step is the sampling interval
+DEFAULT_TIERS = [
+    (None, 3600),
+    (10, 86400),
+    (60, 30 * 86400),
+    (3600, 365 * 86400)
+]
+
+def bucket_dtype(nmetrics):
+    return np.dtype([
+        ('ts', '<f8'),
+        ('count', '<u4'),
+        ('min', '<f4', (nmetrics,)),
+        ('max', '<f4', (nmetrics,)),
+        ('avg', '<f4', (nmetrics,)),
+        ('last', '<f4', (nmetrics,))
+    ])
+
+def _preallocate(f, size):
+    """Reserve ``size`` bytes of real disk blocks for an empty file.
+
+    truncate() alone makes a sparse file whose blocks are only allocated
+    as buckets are written; fall back to writing zeros where
+    posix_fallocate is missing or unsupported by the filesystem.
+    """
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+            return
+        except OSError:
+            pass
+    chunk = bytes(min(size, 1 << 20))
+    written = 0
+    while written < size:
+        written += f.write(chunk[:size - written])
+
+class RollupTier:
+    """One ring of consolidated buckets backed by a memory-mapped file"""
+
+    def __init__(self, path, step, capacity, nmetrics):
+        self.path = path
+        self.step = step
+        self.capacity = capacity
+        dtype = bucket_dtype(nmetrics)
+        size = dtype.itemsize * capacity
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            # Preallocate the whole ring up front; it never grows after this
+            with open(path, 'wb') as f:
+                _preallocate(f, size)
+        self.buckets = np.memmap(path, dtype=dtype, mode='r+', shape=(capacity,))
+
+    @property
+    def retention(self):
+        return self.step * self.capacity
+
+    def add(self, ts, values):
+        index = math.floor(ts / self.step)
+        bucket_ts = index * self.step
+        bucket = self.buckets[index % self.capacity]
+        if bucket['ts'] != bucket_ts or bucket['count'] == 0:
+            # Slot holds an older lap of the ring (or nothing); start over
+            bucket['ts'] = bucket_ts
+            bucket['count'] = 1
+            bucket['min'] = values
+            bucket['max'] = values
+            bucket['avg'] = values
+            bucket['last'] = values
+            return
+        count = int(bucket['count']) + 1
+        bucket['count'] = count
+        bucket['min'] = np.fmin(bucket['min'], values)
+        bucket['max'] = np.fmax(bucket['max'], values)
+        bucket['avg'] += (values - bucket['avg']) / count
+        bucket['last'] = values
+
+    def fetch(self, t_start, t_end):
+        """Buckets whose start lies in [t_start, t_end], oldest first"""
+        first = math.floor(t_start / self.step)
+        last = math.floor(t_end / self.step)
+        first = max(first, last - self.capacity + 1)
+        indexes = np.arange(first, last + 1)
+        buckets = self.buckets[indexes % self.capacity]
+        # Keep only slots that were written during this lap of the ring
+        valid = (buckets['count'] > 0) & (buckets['ts'] == indexes * self.step) & (buckets['ts'] >= t_start)
+        return buckets[valid]
+
+    def flush(self):
+        self.buckets.flush()
+
+class RollupStore:
+    """Consolidated history for every HISTORY_METRICS value across tiers"""
+
+    def __init__(self, directory, raw_step=0.5, tiers=DEFAULT_TIERS, metrics=HISTORY_METRICS, flush_interval=30.0):
+        self.directory = directory
+        self.metrics = list(metrics)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, 'rollup.json')
+        layout = [(step or raw_step, int(math.ceil(retention / (step or raw_step)))) for step, retention in tiers]
+        meta = {'version': 1, 'metrics': self.metrics, 'tiers': layout}
+        try:
+            with open(meta_path, 'r') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = None
+        if previous != meta:
+            # Different metrics or tier geometry: tiers whose layout changed are rebuilt
+            if previous and previous.get('metrics') != self.metrics:
+                for name in os.listdir(directory):
+                    if name.endswith('.rrd'):
+                        os.remove(os.path.join(directory, name))
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+        self.tiers = [RollupTier(os.path.join(directory, f'tier{i}.rrd'), step, capacity, len(self.metrics))
+                      for i, (step, capacity) in enumerate(layout)]
+
+    def add(self, ts, metrics):
+        """Record one sample (a dict of metric values) in every tier"""
+        values = np.array([metrics.get(name, np.nan) for name in self.metrics], dtype=np.float32)
+        with self._lock:
+            for tier in self.tiers:
+                tier.add(ts, values)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def tier_for(self, t_start, now=None):
+        """Finest tier whose retention still covers ``t_start``"""
+        now = time.time() if now is None else now
+        for tier in self.tiers:
+            if now - tier.retention <= t_start:
+                return tier
+        return self.tiers[-1]
+
+    def fetch(self, metric, t_start, t_end, now=None):
+        """Return (ts, min, max, avg, last) arrays for one metric over a window"""
+        column = self.metrics.index(metric)
+        with self._lock:
+            buckets = self.tier_for(t_start, now).fetch(t_start, t_end)
+        return (buckets['ts'].copy(), buckets['min'][:, column].copy(), buckets['max'][:, column].copy(),
+                buckets['avg'][:, column].copy(), buckets['last'][:, column].copy())
+
+    def flush(self):
+        for tier in self.tiers:
+            tier.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self.flush()
+
+class RollupFeeder:
+    """Sampler listener that derives history metrics and feeds a RollupStore"""
+
+    def __init__(self, store):
+        self.store = store
+        self.tracker = MetricsTracker()
+
+    def __call__(self, ts, snapshot):
+        self.store.add(ts, self.tracker.update(ts, snapshot))
@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import deque
+
+class Sampler:
+    """Collect system snapshots on a background thread.
+
+    Each sample is published as a ``(timestamp, snapshot)`` tuple into a
+    bounded ring so the GUI can drain new results without ever calling a
+    collector on the Tk main thread.
+    """
+
+    def __init__(self, interval_ms=500, collect=None, capacity=64):
+        self.interval = interval_ms / 1000.0
+        self.collect = collect  # None: the system collectors, imported on the sampler thread
+        self._ring = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()  # Orders start() against the thread deciding to exit
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Call ``callback(ts, snapshot)`` on the sampler thread for every sample"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def start(self):
+        """Start the sampling thread (no-op if already running)"""
+        with self._state_lock:
+            if self._thread is not None:
+                # Running, or stopped but still finishing a tick: keep using it
+                # rather than starting a second thread next to it
+                self._stopped.clear()
+                return
+            self._stopped.clear()
+            self._wakeup.clear()
+            self._thread = threading.Thread(target=self._run, name="SysIntelSampler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Ask the sampling thread to exit, waiting up to ``timeout`` seconds.
+
+        With a timeout of 0 this only signals the thread, so it is safe to
+        call from a UI thread while a slow collection is in progress.
+        """
+        with self._state_lock:
+            thread = self._thread
+            self._stopped.set()
+            self._wakeup.set()
+        if thread is not None and timeout:
+            thread.join(timeout)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_interval(self, interval_ms):
+        """Change the sampling interval; takes effect on the next tick"""
+        self.interval = interval_ms / 1000.0
+        self._wakeup.set()
+
+    def drain(self):
+        """Return all samples published since the last drain, oldest first"""
+        with self._lock:
+            samples = list(self._ring)
+            self._ring.clear()
+        return samples
+
+    def latest(self):
+        """Return the most recent sample without consuming it, or None"""
+        with self._lock:
+            return self._ring[-1] if self._ring else None
+
+    def _publish(self, ts, snapshot):
+        with self._lock:
+            self._ring.append((ts, snapshot))
+        for callback in list(self._listeners):
+            try:
+                callback(ts, snapshot)
+            except Exception as e:
+                print(f"Error in sampler listener: {e}")
+
+    def _exiting(self):
+        """True once stop() was requested; the thread then gives up its slot"""
+        with self._state_lock:
+            if not self._stopped.is_set():
+                return False
+            if self._thread is threading.current_thread():
+                self._thread = None
+            return True
+
+    def _run(self):
+        if self.collect is None:
+            from .system_stats import get_system_snapshot
+            self.collect = get_system_snapshot
+        next_tick = time.monotonic()
+        while not self._exiting():
+            ts = time.time()
+            try:
+                snapshot = self.collect()
+            except Exception as e:
+                print(f"Error collecting snapshot: {e}")
+            else:
+                self._publish(ts, snapshot)
+            # Schedule against a fixed cadence; if a collector overran the
+            # interval, start the next tick immediately instead of bunching up
+            next_tick += self.interval
+            now = time.monotonic()
+            if next_tick < now:
+                next_tick = now
+            self._wakeup.wait(next_tick - now)
+            if self._wakeup.is_set():
+                self._wakeup.clear()
+                next_tick = time.monotonic()
@@ -3,13 +3,43 @@ import platform
 import subprocess
 import re
 import os
+import queue
+import threading
+import time
+import asyncio
+import atexit
+from concurrent.futures import Future
 
-def get_cpu_detailed_info():
+from .nvidia_smi import get_nvidia_stream
+from .hwmon import get_hwmon_sensors
+from .procfs import ProcfsCollector, procfs_available
+
+_wmi_local = threading.local()
+
+def _wmi(namespace=None):
+    """This thread's WMI connection for ``namespace``.
+
+    COM objects belong to the thread that created them, so connections are
+    cached per thread; connecting is slow (often over a second the first
+    time), which is why they are kept at all.
+    """
+    connections = getattr(_wmi_local, 'connections', None)
+    if connections is None:
+        connections = _wmi_local.connections = {}
+    connection = connections.get(namespace)
+    if connection is None:
+        import wmi
+        connection = connections[namespace] = wmi.WMI(namespace=namespace) if namespace else wmi.WMI()
+    return connection
+
+def get_cpu_detailed_info(usage=None, per_core=None):
     """Get detailed CPU information including frequency, temp, voltage"""
     cpu_info = {
         "name": platform.processor(),
         "cores": psutil.cpu_count(),
-        "usage": psutil.cpu_percent(),
+        "usage": psutil.cpu_percent() if usage is None else usage,
+        # Usage per logical CPU; psutil tracks it separately from the total
+        "per_core": psutil.cpu_percent(percpu=True) if per_core is None else per_core,
         "frequency": 0,
         "temperature": 0,
         "voltage": 0
@@ -26,8 +56,7 @@ def get_cpu_detailed_info():
     # Get CPU temperature (Windows)
     if platform.system() == "Windows":
         try:
-            import wmi
-            c = wmi.WMI(namespace="root\\OpenHardwareMonitor")
+            c = _wmi("root\\OpenHardwareMonitor")
             cpu_temp = c.Sensor()
             for sensor in cpu_temp:
                 if sensor.SensorType == 'Temperature' and 'CPU' in sensor.Name:
@@ -35,6 +64,11 @@ def get_cpu_detailed_info():
                     break
         except:
             pass
+    else:
+        # Linux: read the already-open hwmon sensor files
+        sensors = get_hwmon_sensors()
+        if sensors:
+            cpu_info["temperature"] = sensors.cpu_temperature()
     
     return cpu_info
 
@@ -49,6 +83,14 @@ def get_memory_detailed_info():
         "frequency": 0  # Will be filled by hardware-specific methods
     }
 
+def _pick_dedicated_gpu(gpus, name_of, memory_of):
+    """Prefer a dedicated GPU: highest memory and name contains NVIDIA/RTX/AMD/GPU"""
+    def is_dedicated(gpu):
+        name = name_of(gpu).upper()
+        return any(x in name for x in ["NVIDIA", "RTX", "AMD", "GPU"])
+    dedicated_gpus = [gpu for gpu in gpus if is_dedicated(gpu)]
+    return max(dedicated_gpus or gpus, key=memory_of)
+
 def get_gpu_detailed_info():
     """Get comprehensive GPU information"""
     gpu_info = {
@@ -61,39 +103,44 @@ def get_gpu_detailed_info():
         "frequency": 0,
         "memory_frequency": 0,
         "voltage": 0,
+        "power": 0,
         "max_tgp": 0,
         "fan_speed": 0
     }
-    # Try NVIDIA/AMD GPUs first
-    try:
-        import GPUtil
-        gpus = GPUtil.getGPUs()
+    # NVIDIA: read the persistent nvidia-smi stream instead of forking per tick
+    stream = get_nvidia_stream()
+    if stream is not None:
+        gpus = stream.gpus()
         if gpus:
-            # Prefer dedicated GPU: highest memory and name contains NVIDIA/RTX/AMD/GPU
-            def is_dedicated(gpu):
-                name = gpu.name.upper()
-                return any(x in name for x in ["NVIDIA", "RTX", "AMD", "GPU"])
-            # Filter for dedicated
-            dedicated_gpus = [gpu for gpu in gpus if is_dedicated(gpu)]
-            if dedicated_gpus:
-                gpu = max(dedicated_gpus, key=lambda g: g.memoryTotal)
-            else:
-                gpu = max(gpus, key=lambda g: g.memoryTotal)
-            gpu_info.update({
-                "name": gpu.name,
-                "usage": gpu.load * 100,
-                "memory_used": gpu.memoryUsed,
-                "memory_total": gpu.memoryTotal,
-                "memory_percent": (gpu.memoryUsed / gpu.memoryTotal) * 100 if gpu.memoryTotal else 0,
-                "temperature": gpu.temperature
-            })
-    except ImportError:
-        pass
+            gpu = _pick_dedicated_gpu(gpus, lambda g: g["name"], lambda g: g["memory_total"])
+            gpu_info.update({key: value for key, value in gpu.items() if key != "index"})
+            gpu_info["memory_percent"] = (gpu["memory_used"] / gpu["memory_total"]) * 100 if gpu["memory_total"] else 0
+    else:
+        # Fall back to GPUtil when nvidia-smi is not on PATH
+        try:
+            import GPUtil
+            gpus = GPUtil.getGPUs()
+            if gpus:
+                gpu = _pick_dedicated_gpu(gpus, lambda g: g.name, lambda g: g.memoryTotal)
+                gpu_info.update({
+                    "name": gpu.name,
+                    "usage": gpu.load * 100,
+                    "memory_used": gpu.memoryUsed,
+                    "memory_total": gpu.memoryTotal,
+                    "memory_percent": (gpu.memoryUsed / gpu.memoryTotal) * 100 if gpu.memoryTotal else 0,
+                    "temperature": gpu.temperature
+                })
+        except ImportError:
+            pass
+    # AMD/nouveau GPUs on Linux expose their temperature through hwmon
+    if not gpu_info["temperature"]:
+        sensors = get_hwmon_sensors()
+        if sensors:
+            gpu_info["temperature"] = sensors.gpu_temperature()
     # Try AMD GPUs (Windows)
     if platform.system() == "Windows":
         try:
-            import wmi
-            c = wmi.WMI()
+            c = _wmi()
             gpu_controllers = c.Win32_VideoController()
             if gpu_controllers:
                 # Prefer dedicated GPU by name
@@ -119,8 +166,7 @@ def get_fan_speeds():
     
     if platform.system() == "Windows":
         try:
-            import wmi
-            c = wmi.WMI(namespace="root\\OpenHardwareMonitor")
+            c = _wmi("root\\OpenHardwareMonitor")
             sensors = c.Sensor()
             for sensor in sensors:
                 if sensor.SensorType == 'Fan':
@@ -132,17 +178,19 @@ def get_fan_speeds():
                         fans["system"].append(sensor.Value)
         except:
             pass
+    else:
+        sensors = get_hwmon_sensors()
+        if sensors:
+            fans = sensors.fan_speeds()
     
     return fans
 
-def get_network_detailed_info():
-    """Get detailed network information"""
+def get_network_adapter_info():
+    """Get network adapter names, types, status and link speed"""
     net_info = {
         "adapters": [],
         "ethernet": {},
-        "wifi": {},
-        "total_sent": 0,
-        "total_recv": 0
+        "wifi": {}
     }
     
     # Get network interfaces
@@ -171,11 +219,20 @@ def get_network_detailed_info():
         
         net_info["adapters"].append(adapter_info)
     
-    # Get network usage
+    return net_info
+
+def get_network_io_info():
+    """Get total bytes sent and received over all interfaces"""
     net_io = psutil.net_io_counters()
-    net_info["total_sent"] = net_io.bytes_sent
-    net_info["total_recv"] = net_io.bytes_recv
-    
+    return {
+        "total_sent": net_io.bytes_sent,
+        "total_recv": net_io.bytes_recv
+    }
+
+def get_network_detailed_info():
+    """Get detailed network information"""
+    net_info = get_network_adapter_info()
+    net_info.update(get_network_io_info())
     return net_info
 
 def get_disk_detailed_info():
@@ -259,15 +316,303 @@ def get_system_detailed_info():
         "hostname": platform.node()
     }
 
-def get_system_snapshot():
-    """Get a comprehensive system snapshot"""
-    return {
-        "cpu": get_cpu_detailed_info(),
-        "memory": get_memory_detailed_info(),
-        "gpu": get_gpu_detailed_info(),
-        "fans": get_fan_speeds(),
-        "network": get_network_detailed_info(),
-        "disk": get_disk_detailed_info(),
-        "disk_io": get_disk_io_stats(),
-        "system": get_system_detailed_info()
-    }
+# Collector table: name -> (function, refresh interval in seconds).
+# An interval of 0 runs the collector every tick, None runs it only once.
+COLLECTORS = {
+    "cpu": (get_cpu_detailed_info, 0),
+    "memory": (get_memory_detailed_info, 0),
+    "gpu": (get_gpu_detailed_info, 0),
+    "fans": (get_fan_speeds, 0),
+    "network_adapters": (get_network_adapter_info, 10),
+    "network_io": (get_network_io_info, 0),
+    "disk": (get_disk_detailed_info, 30),
+    "disk_io": (get_disk_io_stats, 0),
+    "system": (get_system_detailed_info, None)
+}
+
+# Snapshot sections assembled from more than one collector
+MERGED_SECTIONS = {
+    "network": ("network_adapters", "network_io")
+}
+
+# Zeroed results with each collector's shape, used until its first call completes
+COLLECTOR_PLACEHOLDERS = {
+    "cpu": lambda: {"name": "", "cores": 0, "usage": 0, "per_core": [], "frequency": 0, "temperature": 0, "voltage": 0},
+    "memory": lambda: {"total": 0, "used": 0, "available": 0, "percent": 0, "frequency": 0},
+    "gpu": lambda: {"name": "Unknown", "usage": 0, "memory_used": 0, "memory_total": 0, "memory_percent": 0,
+                    "temperature": 0, "frequency": 0, "memory_frequency": 0, "voltage": 0, "power": 0,
+                    "max_tgp": 0, "fan_speed": 0},
+    "fans": lambda: {"cpu": 0, "gpu": 0, "system": []},
+    "network_adapters": lambda: {"adapters": [], "ethernet": {}, "wifi": {}},
+    "network_io": lambda: {"total_sent": 0, "total_recv": 0},
+    "disk": lambda: {"partitions": [], "types": []},
+    "disk_io": lambda: {"total_read_bytes": 0, "total_write_bytes": 0, "total_read_count": 0,
+                        "total_write_count": 0, "read_speed_mbps": 0, "write_speed_mbps": 0,
+                        "io_utilization": 0, "disks": []},
+    "system": lambda: {"platform": platform.system(), "release": "", "version": "", "machine": "",
+                       "processor": "", "hostname": ""}
+}
+
+class CollectorScheduler:
+    """Run each collector on its own cadence and merge cached results.
+
+    Slow-changing data (platform info, partitions, adapters) is refreshed
+    on a long interval while counters are collected every tick; each
+    snapshot combines fresh values with the cached ones.
+    """
+
+    def __init__(self, collectors=None, intervals=None):
+        self.collectors = dict(collectors or COLLECTORS)
+        if intervals:
+            for name, interval in intervals.items():
+                func, _ = self.collectors[name]
+                self.collectors[name] = (func, interval)
+        self._cache = {}
+        self._last_run = {}
+        self._lock = threading.Lock()
+
+    def due(self, name, now):
+        """Return True if the named collector should run at time ``now``"""
+        if name not in self._last_run:
+            return True
+        interval = self.collectors[name][1]
+        if interval is None:
+            return False
+        return now - self._last_run[name] >= interval
+
+    def set_collector(self, name, func):
+        """Replace the function behind a collector, keeping its interval"""
+        with self._lock:
+            self.collectors[name] = (func, self.collectors[name][1])
+            self._last_run.pop(name, None)
+
+    def invalidate(self, name=None):
+        """Force one collector (or all of them) to run on the next snapshot"""
+        with self._lock:
+            if name is None:
+                self._last_run.clear()
+            else:
+                self._last_run.pop(name, None)
+
+    def snapshot(self, force=False):
+        """Run due collectors and return a snapshot of fresh and cached results"""
+        with self._lock:
+            now = time.monotonic()
+            for name, (func, _) in self.collectors.items():
+                if force or self.due(name, now):
+                    self._cache[name] = func()
+                    self._last_run[name] = now
+            return self._assemble()
+
+    def _assemble(self):
+        snapshot = {}
+        for name in self.collectors:
+            section = self._section_of(name)
+            if section == name:
+                snapshot[name] = self._cache.get(name)
+            elif section not in snapshot:
+                combined = {}
+                for part in MERGED_SECTIONS[section]:
+                    combined.update(self._cache.get(part, {}))
+                snapshot[section] = combined
+        return snapshot
+
+    @staticmethod
+    def _section_of(name):
+        for section, parts in MERGED_SECTIONS.items():
+            if name in parts:
+                return section
+        return name
+
+# Per-collector deadline in seconds; a tick never waits longer than this
+DEFAULT_COLLECTOR_DEADLINE = 0.5
+DEFAULT_COLLECTOR_WORKERS = 4
+# A failed collector is retried after this delay, doubling up to the maximum,
+# even if its interval would not run it again (or ever, for run-once ones)
+COLLECTOR_RETRY_DELAY = 1.0
+MAX_COLLECTOR_RETRY_DELAY = 60.0
+# WMI queries (and the first connection on each worker) routinely take longer
+WMI_COLLECTOR_DEADLINE = 2.0
+WMI_COLLECTORS = ("cpu", "gpu", "fans")
+
+def _default_deadlines():
+    if platform.system() == "Windows":
+        return {name: WMI_COLLECTOR_DEADLINE for name in WMI_COLLECTORS}
+    return {}
+
+def _com_initialize():
+    """Initialize COM on this thread where WMI needs it; returns the matching cleanup or None"""
+    if platform.system() != "Windows":
+        return None
+    try:
+        import pythoncom
+    except ImportError:
+        return None
+    pythoncom.CoInitialize()
+    return pythoncom.CoUninitialize
+
+class _DaemonPool:
+    """Bounded pool of daemon worker threads.
+
+    ThreadPoolExecutor joins its workers at interpreter exit, so one
+    collector stuck on a dead NFS mount would keep the process alive.
+    Idle workers are still asked to exit then, so they can release COM.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._queue = queue.SimpleQueue()
+        self._threads = []
+        atexit.register(self.shutdown)
+
+    def shutdown(self, timeout=0.5):
+        """Stop idle workers, waiting at most ``timeout`` for the busy ones"""
+        for _ in self._threads:
+            self._queue.put((None, None))
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+
+    def submit(self, func):
+        future = Future()
+        self._queue.put((func, future))
+        if len(self._threads) < self.max_workers:
+            thread = threading.Thread(target=self._work, name="SysIntelCollector", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return future
+
+    def _work(self):
+        # Only the thread that first imports pythoncom gets COM for free;
+        # without this every WMI call on a worker fails
+        uninitialize = _com_initialize()
+        try:
+            while True:
+                func, future = self._queue.get()
+                if func is None:
+                    return
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(func())
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            if uninitialize is not None:
+                uninitialize()
+
+class AsyncCollectorScheduler(CollectorScheduler):
+    """CollectorScheduler that runs due collectors concurrently under a deadline.
+
+    Due collectors are awaited together on a private asyncio loop, each
+    offloaded to a bounded pool of worker threads, so independent collectors
+    overlap and a tick takes at most the longest deadline. A call that
+    misses its deadline is left to finish in the background and is not
+    started again meanwhile; until it completes, snapshots carry the last
+    good value (or a zeroed placeholder) and name the collector in
+    ``snapshot['stale']``.
+    """
+
+    def __init__(self, collectors=None, intervals=None, deadline=DEFAULT_COLLECTOR_DEADLINE,
+                 deadlines=None, max_workers=DEFAULT_COLLECTOR_WORKERS):
+        super().__init__(collectors, intervals)
+        self.deadline = deadline
+        self.deadlines = _default_deadlines()  # name -> seconds, overriding ``deadline``
+        self.deadlines.update(deadlines or {})
+        self._pool = _DaemonPool(max_workers)
+        self._loop = asyncio.new_event_loop()
+        self._running = {}  # name -> Future of a call that overran its deadline
+        self._retries = {}  # name -> (monotonic time of the next attempt, delay) after a failure
+        self.stale = set()
+
+    def set_collector(self, name, func):
+        super().set_collector(name, func)
+        with self._lock:
+            self._running.pop(name, None)
+            self._retries.pop(name, None)
+
+    def snapshot(self, force=False):
+        """Run due collectors for at most their deadline and return a snapshot"""
+        with self._lock:
+            now = time.monotonic()
+            names = [name for name in self.collectors
+                     if force or name in self._running or self.due(name, now)
+                     or (name in self._retries and self._retries[name][0] <= now)]
+            self._loop.run_until_complete(self._collect_all(names))
+            snapshot = self._assemble()
+            snapshot["stale"] = sorted(self.stale)
+            return snapshot
+
+    async def _collect_all(self, names):
+        await asyncio.gather(*(self._collect(name) for name in names))
+
+    async def _collect(self, name):
+        future = self._running.pop(name, None)
+        if future is None:
+            future = self._pool.submit(self.collectors[name][0])
+        elif not future.done():
+            # Still stuck from an earlier tick; don't queue another call behind it
+            self._running[name] = future
+            return
+        try:
+            value = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)),
+                                           self.deadlines.get(name, self.deadline))
+        except asyncio.TimeoutError:
+            self._running[name] = future
+            self._mark_stale(name)
+            return
+        except Exception as e:
+            print(f"Error in {name} collector: {e}")
+            now = time.monotonic()
+            self._last_run[name] = now
+            _, delay = self._retries.get(name, (None, COLLECTOR_RETRY_DELAY / 2))
+            delay = min(delay * 2, MAX_COLLECTOR_RETRY_DELAY)
+            self._retries[name] = (now + delay, delay)
+            self._mark_stale(name)
+            return
+        self._cache[name] = value
+        self._last_run[name] = time.monotonic()
+        self._retries.pop(name, None)
+        self.stale.discard(name)
+
+    def _mark_stale(self, name):
+        self.stale.add(name)
+        if name not in self._cache:
+            # Collectors added without a placeholder get an empty section
+            self._cache[name] = COLLECTOR_PLACEHOLDERS.get(name, dict)()
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+def default_scheduler():
+    """The shared scheduler behind get_system_snapshot, created on first use"""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = AsyncCollectorScheduler()
+        return _default_scheduler
+
+_procfs = None
+
+def enable_procfs_fast_path(scheduler=None):
+    """Serve CPU, memory, disk and network counters straight from /proc.
+
+    Opt-in Linux alternative to the psutil collectors; returns False (and
+    changes nothing) where /proc is not available.
+    """
+    global _procfs
+    if platform.system() != "Linux" or not procfs_available():
+        return False
+    if _procfs is None:
+        _procfs = ProcfsCollector()
+    scheduler = scheduler or default_scheduler()
+    scheduler.set_collector("cpu", lambda: get_cpu_detailed_info(*_procfs.cpu_percents()))
+    scheduler.set_collector("memory", _procfs.memory)
+    scheduler.set_collector("network_io", _procfs.network_io)
+    scheduler.set_collector("disk_io", _procfs.disk_io)
+    return True
+
+def get_system_snapshot(force=False):
+    """Get a comprehensive system snapshot, reusing cached slow-changing data"""
+    return default_scheduler().snapshot(force=force)
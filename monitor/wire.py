@@ -0,0 +1,355 @@
+"""Compact binary codec for streaming successive snapshots.
+
+A snapshot is flattened into leaf fields keyed by their path
+(``('disk_io', 'disks', 3, 'read_bytes')``). A keyframe carries every path
+and value; the frames after it carry only the fields that changed, by
+index into the keyframe's field table. Integers are sent as zigzag
+varints, as the difference from the previous value when it was an int
+too, so monotonic counters like ``total_read_bytes`` cost a byte or two
+per tick. A keyframe is sent every ``keyframe_interval`` frames and
+whenever the set of paths changes (a disk appears, an adapter goes away).
+
+Frame layout: kind byte, float64 timestamp, varint field count, fields.
+Keyframe fields are ``path value``, delta fields ``varint index value``;
+every value starts with a one-byte type tag.
+"""
+import struct
+
+KEYFRAME = 1
+DELTA = 2
+DEFAULT_KEYFRAME_INTERVAL = 60
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _INT_DELTA, _FLOAT, _STR, _EMPTY_LIST, _EMPTY_DICT = range(9)
+# Path component tags
+_KEY, _INDEX = range(2)
+
+_DOUBLE = struct.Struct('<d')
+
+def zigzag(n):
+    """Map signed to unsigned so small negative numbers stay small"""
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+def unzigzag(z):
+    return (z >> 1) ^ -(z & 1)
+
+def write_varint(out, n):
+    """Append unsigned ``n`` to bytearray ``out`` as a LEB128 varint"""
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _write_str(out, text):
+    data = text.encode('utf-8')
+    write_varint(out, len(data))
+    out += data
+
+def flatten(snapshot):
+    """Return (paths, values) for every leaf, in document order"""
+    paths = []
+    values = []
+
+    def walk(value, path):
+        if isinstance(value, dict) and value:
+            for key, item in value.items():
+                walk(item, path + (key,))
+        elif isinstance(value, list) and value:
+            for index, item in enumerate(value):
+                walk(item, path + (index,))
+        else:
+            paths.append(path)
+            values.append(value)
+
+    walk(snapshot, ())
+    return paths, values
+
+def unflatten(paths, values):
+    """Rebuild the nested dicts and lists that ``flatten`` walked"""
+    root = {}
+    for path, value in zip(paths, values):
+        if value.__class__ in (list, dict):
+            value = value.__class__()  # Fresh empty container per snapshot
+        node = root
+        last = len(path) - 1
+        for depth, key in enumerate(path):
+            if depth == last:
+                if isinstance(node, list):
+                    node.append(value)
+                else:
+                    node[key] = value
+                break
+            if isinstance(node, list):
+                if key == len(node):
+                    node.append([] if isinstance(path[depth + 1], int) else {})
+                node = node[key]
+            else:
+                child = node.get(key)
+                if child is None:
+                    child = node[key] = [] if isinstance(path[depth + 1], int) else {}
+                node = child
+        else:
+            return value  # Empty path: the snapshot itself was a leaf
+    return root
+
+def _compile(paths):
+    """Shape tree for a field table: (is_list, keys, children, start, stop).
+
+    ``keys`` is a dict's key tuple or a list's length. ``children`` holds
+    leaf indices and nested nodes, or is None when every child is a leaf,
+    in which case the leaves are ``values[start:stop]``. Returns None when
+    the snapshot is not a non-empty container.
+    """
+    tree = unflatten(paths, list(range(len(paths))))
+    if tree.__class__ not in (dict, list) or not tree:
+        return None
+
+    def shape(node):
+        is_list = node.__class__ is list
+        items = node if is_list else list(node.values())
+        children = [item if item.__class__ is int else shape(item) for item in items]
+        keys = len(items) if is_list else tuple(node)
+        if all(child.__class__ is int for child in children):
+            return (is_list, keys, None, children[0], children[-1] + 1)
+        return (is_list, keys, children, None, None)
+
+    return shape(tree)
+
+def _extract(node, value, out):
+    """Append the leaves of ``value`` to ``out``; False if its shape differs from ``node``"""
+    is_list, keys, children, _, _ = node
+    if is_list:
+        if value.__class__ is not list or len(value) != keys:
+            return False
+        items = value
+    else:
+        if value.__class__ is not dict or tuple(value) != keys:
+            return False
+        items = value.values()
+    if children is None:
+        out.extend(items)
+        return True
+    for child, item in zip(children, items):
+        if child.__class__ is int:
+            out.append(item)
+        elif not _extract(child, item, out):
+            return False
+    return True
+
+def _build(node, values):
+    is_list, keys, children, start, stop = node
+    if children is None:
+        items = values[start:stop]
+    else:
+        items = [values[child] if child.__class__ is int else _build(child, values) for child in children]
+    return items if is_list else dict(zip(keys, items))
+
+class SnapshotEncoder:
+    """Encode successive snapshots as keyframes and deltas"""
+
+    def __init__(self, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.reset()
+
+    def reset(self):
+        """Start over with a keyframe (e.g. for a new connection)"""
+        self._tree = None
+        self._values = None
+        self._since_keyframe = 0
+
+    def encode(self, ts, snapshot):
+        if self._tree is not None and self._since_keyframe < self.keyframe_interval:
+            values = []
+            # Same shape as the keyframe: walk it instead of rebuilding every path
+            if _extract(self._tree, snapshot, values):
+                frame = self._encode_delta(ts, values)
+                if frame is not None:
+                    return frame
+        return self._encode_keyframe(ts, snapshot)
+
+    def _encode_keyframe(self, ts, snapshot):
+        paths, values = flatten(snapshot)
+        out = bytearray()
+        out.append(KEYFRAME)
+        out += _DOUBLE.pack(ts)
+        write_varint(out, len(paths))
+        for path, value in zip(paths, values):
+            write_varint(out, len(path))
+            for key in path:
+                if isinstance(key, int):
+                    out.append(_INDEX)
+                    write_varint(out, key)
+                else:
+                    out.append(_KEY)
+                    _write_str(out, key)
+            self._write_value(out, value, None)
+        self._tree = _compile(paths)
+        self._values = values
+        self._since_keyframe = 1
+        return bytes(out)
+
+    def _encode_delta(self, ts, values):
+        previous = self._values
+        changed = [i for i, (new, old) in enumerate(zip(values, previous))
+                   if new != old or new.__class__ is not old.__class__]
+        out = bytearray()
+        out.append(DELTA)
+        out += _DOUBLE.pack(ts)
+        write_varint(out, len(changed))
+        for i in changed:
+            value = values[i]
+            if value.__class__ in (dict, list) and value:
+                return None  # A leaf grew children: the shape changed
+            write_varint(out, i)
+            self._write_value(out, value, previous[i])
+        self._values = values
+        self._since_keyframe += 1
+        return bytes(out)
+
+    @staticmethod
+    def _write_value(out, value, previous):
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            if previous.__class__ is int and value.__class__ is int:
+                out.append(_INT_DELTA)
+                write_varint(out, zigzag(value - previous))
+            else:
+                out.append(_INT)
+                write_varint(out, zigzag(int(value)))
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, list):
+            out.append(_EMPTY_LIST)
+        elif isinstance(value, dict):
+            out.append(_EMPTY_DICT)
+        else:
+            # Strings, plus anything JSON would have stringified
+            out.append(_STR)
+            _write_str(out, value if isinstance(value, str) else str(value))
+
+class _Reader:
+    def __init__(self, payload):
+        self.data = payload
+        self.pos = 0
+
+    def byte(self):
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def varint(self):
+        result = 0
+        shift = 0
+        while True:
+            byte = self.data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def double(self):
+        (value,) = _DOUBLE.unpack_from(self.data, self.pos)
+        self.pos += 8
+        return value
+
+    def text(self):
+        length = self.varint()
+        value = self.data[self.pos:self.pos + length].decode('utf-8')
+        self.pos += length
+        return value
+
+class SnapshotDecoder:
+    """Rebuild snapshots from the frames of one SnapshotEncoder"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._paths = None
+        self._tree = None
+        self._values = None
+        self._empties = set()  # Indices holding [] or {}; copied fresh per snapshot
+
+    def decode(self, payload):
+        """Return ``(ts, snapshot)``; raises ValueError on a malformed frame"""
+        try:
+            return self._decode(_Reader(payload))
+        except (IndexError, KeyError, TypeError, struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"truncated or corrupt frame: {e}") from None
+
+    def _decode(self, reader):
+        kind = reader.byte()
+        ts = reader.double()
+        count = reader.varint()
+        if kind == KEYFRAME:
+            paths = []
+            values = []
+            for _ in range(count):
+                path = []
+                for _ in range(reader.varint()):
+                    path.append(reader.varint() if reader.byte() == _INDEX else reader.text())
+                paths.append(tuple(path))
+                values.append(self._read_value(reader, None))
+            changed = range(count)
+            empties = set()
+        elif kind == DELTA:
+            if self._values is None:
+                raise ValueError("delta frame before the first keyframe")
+            values = list(self._values)
+            changed = []
+            for _ in range(count):
+                i = reader.varint()
+                values[i] = self._read_value(reader, values[i])
+                changed.append(i)
+            empties = set(self._empties)
+        else:
+            raise ValueError(f"unknown frame kind {kind}")
+        if reader.pos != len(reader.data):
+            raise ValueError("trailing bytes after frame")
+        for i in changed:
+            if values[i].__class__ in (list, dict):
+                empties.add(i)
+            else:
+                empties.discard(i)
+        if kind == KEYFRAME:
+            self._paths = paths
+            self._tree = _compile(paths)
+        self._values = values
+        self._empties = empties
+        if self._tree is None:
+            return ts, unflatten(self._paths, values)
+        if empties:
+            values = list(values)
+            for i in empties:
+                values[i] = values[i].__class__()
+        return ts, _build(self._tree, values)
+
+    @staticmethod
+    def _read_value(reader, previous):
+        tag = reader.byte()
+        if tag == _INT_DELTA:
+            return previous + unzigzag(reader.varint())
+        if tag == _INT:
+            return unzigzag(reader.varint())
+        if tag == _FLOAT:
+            return reader.double()
+        if tag == _STR:
+            return reader.text()
+        if tag == _NONE:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _EMPTY_LIST:
+            return []
+        if tag == _EMPTY_DICT:
+            return {}
+        raise ValueError(f"unknown value tag {tag}")
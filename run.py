@@ -5,7 +5,12 @@ import os
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from gui.main_window import run_gui
+from monitor.headless import build_arg_parser
 
 if __name__ == "__main__":
-    run_gui() 
\ No newline at end of file
+    args = build_arg_parser().parse_args()
+    if args.headless:
+        from monitor.headless import run_headless
+        sys.exit(run_headless(args))
+    from gui.main_window import run_gui
+    run_gui()
@@ -6,3 +6,4 @@ from .formatters import (
     format_power, 
     format_speed
 )
+from .ring_buffer import RingBuffer
@@ -0,0 +1,103 @@
+import numpy as np
+
+class RingBuffer:
+    """Fixed-capacity history of float32 values with paired timestamps.
+
+    Storage is two preallocated arrays, so appends are O(1) and cost 4 bytes
+    per value (plus 8 per timestamp) no matter how long the history is.
+    ``segments()`` returns the contents oldest first as at most two
+    zero-copy slices; ``view()`` joins them into one ordered array.
+    With a ``shape`` (e.g. ``(cores,)``) each entry is a fixed-size row and
+    the arrays are time x shape.
+    """
+
+    def __init__(self, maxlen, dtype=np.float32, shape=()):
+        if maxlen < 1:
+            raise ValueError("maxlen must be at least 1")
+        self.maxlen = int(maxlen)
+        self.shape = tuple(shape)
+        self._values = np.zeros((self.maxlen,) + self.shape, dtype=dtype)
+        self._timestamps = np.zeros(self.maxlen, dtype=np.float64)
+        self._head = 0  # Slot the next value is written to
+        self._size = 0
+
+    def append(self, value, ts=0.0):
+        self._values[self._head] = value
+        self._timestamps[self._head] = ts
+        self._head += 1
+        if self._head == self.maxlen:
+            self._head = 0
+        if self._size < self.maxlen:
+            self._size += 1
+
+    def resample(self, maxlen, step):
+        """Change capacity in place, resampling the contents to one value per ``step`` seconds.
+
+        Retained values are linearly interpolated onto a grid ending at the
+        newest timestamp, so history survives an interval change. Without
+        usable timestamps the newest ``maxlen`` values are kept as they are.
+        """
+        values = self.view().astype(np.float64)
+        timestamps = self.timestamps()
+        if len(values) >= 2 and np.all(np.diff(timestamps) > 0):
+            count = min(int(maxlen), int((timestamps[-1] - timestamps[0]) // step) + 1)
+            grid = timestamps[-1] - step * np.arange(count - 1, -1, -1)
+            if self.shape:
+                # One interpolation per column of the row shape
+                flat = values.reshape(len(values), -1)
+                values = np.column_stack([np.interp(grid, timestamps, column) for column in flat.T]).reshape((count,) + self.shape)
+            else:
+                values = np.interp(grid, timestamps, values)
+            timestamps = grid
+        else:
+            values = values[-maxlen:]
+            timestamps = timestamps[-maxlen:]
+        self.maxlen = int(maxlen)
+        self._values = np.zeros((self.maxlen,) + self.shape, dtype=self._values.dtype)
+        self._timestamps = np.zeros(self.maxlen, dtype=np.float64)
+        self._size = len(values)
+        self._values[:self._size] = values
+        self._timestamps[:self._size] = timestamps
+        self._head = self._size % self.maxlen
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ring buffer index out of range")
+        value = self._values[(self._head - self._size + index) % self.maxlen]
+        return value.copy() if self.shape else float(value)
+
+    def __iter__(self):
+        for segment in self.segments():
+            yield from (segment.tolist() if not self.shape else segment.copy())
+
+    def _segments(self, array):
+        if self._size < self.maxlen:
+            return (array[:self._size],)
+        if self._head == 0:
+            return (array,)
+        return (array[self._head:], array[:self._head])
+
+    def segments(self):
+        """Values oldest first as one or two zero-copy slices"""
+        return self._segments(self._values)
+
+    def timestamp_segments(self):
+        return self._segments(self._timestamps)
+
+    def view(self):
+        """Values oldest first; zero-copy unless the ring has wrapped"""
+        segments = self.segments()
+        return segments[0] if len(segments) == 1 else np.concatenate(segments)
+
+    def timestamps(self):
+        segments = self.timestamp_segments()
+        return segments[0] if len(segments) == 1 else np.concatenate(segments)